@@ -0,0 +1,112 @@
+import hashlib
+import os
+import struct
+
+import pygame as pg
+
+import settings
+from log import get_logger
+from settings import ASSET_CACHE_FOLDER, ASSET_FOLDER
+
+logger = get_logger(__name__)
+
+# Bump when the procedural drawing code changes so stale caches are ignored
+SPRITE_CACHE_VERSION = 2
+
+# A sprite set file is a surface count, then for each surface its width and
+# height followed by its RGBA pixels
+SET_HEADER = struct.Struct("<I")
+SURFACE_HEADER = struct.Struct("<HH")
+
+
+def to_display_format(surface):
+    """Convert a surface to the display pixel format so blits skip conversion"""
+    # Converting needs a display mode, headless tools keep the original
+    if pg.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pg.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def settings_hash():
+    """Short hash of every setting, so a settings change invalidates the cache"""
+    # Window-derived values only exist once asked for, and no sprite depends on them
+    values = sorted(
+        (name, repr(getattr(settings, name)))
+        for name in dir(settings)
+        if name.isupper() and name not in settings.DISPLAY_VALUES
+    )
+    text = repr((SPRITE_CACHE_VERSION, values))
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class AssetManager:
+    """Loads image files and caches procedurally drawn sprite sets on disk.
+
+    Sprite sets are lists of surfaces built by a callback. The first launch
+    builds and saves them under ASSET_CACHE_FOLDER in a directory named after
+    settings_hash(); later launches with the same settings load them instead.
+    Everything handed out is converted to the display format.
+    """
+
+    def __init__(self, root):
+        self.img_folder = os.path.join(root, ASSET_FOLDER, "img")
+        self.cache_folder = os.path.join(root, ASSET_CACHE_FOLDER, settings_hash())
+        self.images = {}
+
+    def load_images(self):
+        """Load every PNG in the image folder, converted, keyed by file name without extension"""
+        for filename in sorted(os.listdir(self.img_folder)):
+            name, extension = os.path.splitext(filename)
+            if extension.lower() == ".png":
+                image = pg.image.load(os.path.join(self.img_folder, filename))
+                self.images[name] = to_display_format(image)
+
+    def sprite_set(self, name, build):
+        """Return the named sprite set, from the disk cache or by calling build()"""
+        path = os.path.join(self.cache_folder, name + ".rgba")
+        surfaces = self.load_sprite_set(path)
+        if surfaces is None:
+            surfaces = build()
+            self.save_sprite_set(path, surfaces)
+        return [to_display_format(surface) for surface in surfaces]
+
+    def load_sprite_set(self, path):
+        """Read a sprite set file, None when it is missing or damaged"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            (count,) = SET_HEADER.unpack_from(data)
+            offset = SET_HEADER.size
+            surfaces = []
+            for _ in range(count):
+                size = SURFACE_HEADER.unpack_from(data, offset)
+                offset += SURFACE_HEADER.size
+                end = offset + size[0] * size[1] * 4
+                # frombytes() raises ValueError when the file was cut short
+                surfaces.append(pg.image.frombytes(data[offset:end], size, "RGBA"))
+                offset = end
+            if offset != len(data):
+                raise ValueError(f"{len(data) - offset} bytes past the last surface")
+        except FileNotFoundError:
+            return None
+        except (OSError, struct.error, ValueError) as e:
+            # Rebuilt and written again like any other cache miss
+            logger.warning("Ignoring damaged sprite cache %s: %s", path, e)
+            return None
+        return surfaces
+
+    def save_sprite_set(self, path, surfaces):
+        data = [SET_HEADER.pack(len(surfaces))]
+        for surface in surfaces:
+            data.append(SURFACE_HEADER.pack(*surface.get_size()))
+            data.append(pg.image.tobytes(surface, "RGBA"))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so an interrupted save never leaves a truncated file
+            with open(path + ".tmp", "wb") as f:
+                f.write(b"".join(data))
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning("Could not write sprite cache %s: %s", path, e)
@@ -0,0 +1,100 @@
+import math
+import random
+
+import numpy as np
+import pygame as pg
+
+from assets import to_display_format
+from settings import (
+    ASTEROID_ATLAS_SEED,
+    ASTEROID_ATLAS_SIZE_STEP,
+    ASTEROID_ATLAS_VARIANTS,
+    ASTEROID_SIZE_MAX,
+    ASTEROID_SIZE_MIN_SPLIT,
+    WHITE,
+)
+from sprites import SRCALPHA
+
+
+def make_asteroid_image(size, has_powerup, rng=random):
+    """Draw a circular asteroid with a few random craters"""
+    image = pg.Surface((size, size), flags=SRCALPHA)
+    pg.draw.circle(image, (150, 150, 150), (size // 2, size // 2), size // 2)
+
+    # Add some details to make it look more like an asteroid
+    # Only add details if the asteroid is large enough
+    if size >= 15:
+        detail_count = min(4, max(1, size // 10))  # Scale details with size
+        for _ in range(detail_count):
+            # Ensure we don't get a division by zero or empty range
+            max_offset = max(3, size // 4)
+            offset = rng.randint(2, max_offset)
+            angle = rng.randint(0, 360)
+            x = size // 2 + offset * math.cos(math.radians(angle))
+            y = size // 2 + offset * math.sin(math.radians(angle))
+            radius = max(1, rng.randint(1, size // 5))
+            pg.draw.circle(image, (100, 100, 100), (int(x), int(y)), radius)
+
+    # If it's a powerup asteroid, add a pink center
+    if has_powerup:
+        pg.draw.circle(
+            image,
+            (255, 105, 180),  # Hot pink
+            (size // 2, size // 2),
+            size // 4,  # Center is 1/4 the size of the asteroid
+        )
+
+    # Add a white outline to make the asteroid more visible
+    pg.draw.circle(image, WHITE, (size // 2, size // 2), size // 2, 1)
+    return image
+
+
+class AsteroidAtlas:
+    """Bounded set of shared asteroid images, indexed by size bucket and variant.
+
+    Asteroid sizes are rounded to ASTEROID_ATLAS_SIZE_STEP and each bucket has
+    ASTEROID_ATLAS_VARIANTS crater layouts, drawn with and without the powerup
+    core. Asteroids store an index into images, so memory does not grow with
+    the number of asteroids.
+    """
+
+    def __init__(self, step=ASTEROID_ATLAS_SIZE_STEP, variants=ASTEROID_ATLAS_VARIANTS):
+        self.step = step
+        self.variants = variants
+        self.sizes = list(range(ASTEROID_SIZE_MIN_SPLIT, ASTEROID_SIZE_MAX + step, step))
+        self.images = []
+        # Half the image size for every index, used to find blit positions
+        self.half_sizes = np.zeros(0)
+
+    def __len__(self):
+        return len(self.images)
+
+    def index(self, size, has_powerup, variant):
+        """Return the image index for an asteroid of the given size"""
+        bucket = round((size - self.sizes[0]) / self.step)
+        bucket = min(max(bucket, 0), len(self.sizes) - 1)
+        return (bucket * self.variants + variant) * 2 + int(has_powerup)
+
+    def render(self):
+        """Draw every variant in index order"""
+        # A fixed seed keeps the look stable and leaves the game's RNG untouched
+        rng = random.Random(ASTEROID_ATLAS_SEED)
+        images = []
+        for size in self.sizes:
+            for _ in range(self.variants):
+                craters = rng.getstate()
+                for has_powerup in (False, True):
+                    # Cored and plain versions of a variant share the same craters
+                    rng.setstate(craters)
+                    images.append(make_asteroid_image(size, has_powerup, rng))
+        return images
+
+    def prewarm(self, assets=None):
+        """Draw every variant up front, through the asset disk cache if given"""
+        if self.images:
+            return
+        if assets is not None:
+            self.images = assets.sprite_set("asteroid_atlas", self.render)
+        else:
+            self.images = [to_display_format(image) for image in self.render()]
+        self.half_sizes = np.array([image.get_width() / 2 for image in self.images])
@@ -0,0 +1,196 @@
+import math
+
+import numpy as np
+import pygame as pg
+
+from interpolation import lerp_positions
+from log import get_logger
+from settings import (
+    ASTEROID_FIELD_CAPACITY,
+    ASTEROID_SIZE_MIN_SPLIT,
+    POWERUP_TYPES,
+)
+from sprites import PowerUp
+
+logger = get_logger(__name__)
+
+vec = pg.math.Vector2
+
+
+class AsteroidField:
+    """All asteroids, stored as parallel NumPy arrays instead of sprites.
+
+    Slots 0..count-1 hold live asteroids. Removal swaps the last asteroid into
+    the freed slot, so indices are only stable until remove_dead() runs.
+    Images are shared from the game's AsteroidAtlas and referenced by index.
+    """
+
+    # Per-asteroid arrays, kept in step by grow() and remove_dead()
+    ARRAYS = (
+        "pos", "prev_pos", "vel", "radius", "has_powerup", "powerup_type", "alive", "image_index", "ids"
+    )
+
+    def __init__(self, game, capacity=ASTEROID_FIELD_CAPACITY):
+        self.game = game
+        self.atlas = game.asteroid_atlas
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))  # Position before the last sim step
+        self.vel = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.has_powerup = np.zeros(capacity, dtype=bool)
+        self.powerup_type = np.full(capacity, -1, dtype=np.int8)  # Index into POWERUP_TYPES
+        # Cleared by kill(), the slot is reclaimed by remove_dead()
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.image_index = np.zeros(capacity, dtype=np.int16)  # Into atlas.images
+        self.ids = np.zeros(capacity, dtype=np.uint32)  # See Game.new_entity_id
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        """Double the capacity of every array"""
+        capacity = len(self.pos) * 2
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def spawn(self, pos=None, size=None):
+        """Add an asteroid and return its slot index"""
+        if self.count == len(self.pos):
+            self.grow()
+        i = self.count
+        self.count += 1
+
+        rng = self.game.rng
+
+        # Set size - either provided or random
+        if size is None:
+            size = rng.randint(20, 50)
+
+        # Determine if this is a powerup asteroid (30% chance for new asteroids)
+        has_powerup = False
+        powerup_type = -1
+        if pos is None:  # Only for newly spawned asteroids, not splits
+            has_powerup = rng.random() < 0.3  # 30% chance
+            if has_powerup:
+                powerup_type = POWERUP_TYPES.index(rng.choice(POWERUP_TYPES))
+
+        # Set position and velocity
+        if pos is None:
+            # Spawn within the visible area instead of the whole world
+            pos = (rng.randint(50, self.game.width - 50), rng.randint(50, self.game.height - 50))
+            logger.debug("Asteroid created at position [%d, %d]", pos[0], pos[1])
+
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(30, 100)
+
+        self.pos[i] = pos
+        self.prev_pos[i] = pos
+        self.vel[i] = (speed * math.cos(angle), speed * math.sin(angle))
+        self.radius[i] = size / 2
+        self.has_powerup[i] = has_powerup
+        self.powerup_type[i] = powerup_type
+        self.alive[i] = True
+        self.image_index[i] = self.atlas.index(
+            size, has_powerup, rng.randrange(self.atlas.variants)
+        )
+        self.ids[i] = self.game.new_entity_id()
+        return i
+
+    def save_previous(self):
+        """Remember positions before a sim step, for interpolated drawing"""
+        self.prev_pos[: self.count] = self.pos[: self.count]
+
+    def update(self, dt):
+        """Move every asteroid and wrap it around the screen edges"""
+        n = self.count
+        pos = self.pos[:n]
+        pos += self.vel[:n] * dt
+
+        # Asteroids wrap once they are a full diameter past an edge
+        size = self.radius[:n] * 2
+        for axis, limit in ((0, self.game.width), (1, self.game.height)):
+            coord = pos[:, axis]
+            coord[:] = np.where(coord < -size, limit + size, coord)
+            coord[:] = np.where(coord > limit + size, -size, coord)
+
+    def position(self, i):
+        return vec(self.pos[i, 0], self.pos[i, 1])
+
+    def size(self, i):
+        return int(self.radius[i] * 2)
+
+    def kill(self, i):
+        """Mark an asteroid as destroyed, its slot is freed by remove_dead()"""
+        self.alive[i] = False
+
+    def remove_dead(self):
+        """Swap-remove every killed asteroid"""
+        dead = np.flatnonzero(~self.alive[: self.count])
+        # Going from the highest index down means the last slot is never one
+        # that still has to be removed
+        for i in dead[::-1]:
+            last = self.count - 1
+            if i != last:
+                for name in self.ARRAYS:
+                    array = getattr(self, name)
+                    array[i] = array[last]
+            self.alive[last] = False
+            self.count = last
+
+    def split(self, i):
+        """Destroy an asteroid, splitting it in two if it is large enough"""
+        pos = self.position(i)
+        size = self.size(i)
+
+        # If this asteroid has a powerup, spawn it instead of splitting
+        if self.has_powerup[i]:
+            powerup_type = POWERUP_TYPES[self.powerup_type[i]]
+            PowerUp(self.game, pos, powerup_type)
+            logger.debug("PowerUp %s released from asteroid at %.0f, %.0f", powerup_type, pos[0], pos[1])
+        elif size > 15:  # Only split if the asteroid is big enough
+            rng = self.game.rng
+            for _ in range(2):
+                # Create a new asteroid at the same position but with a smaller size
+                offset = vec(rng.randint(-10, 10), rng.randint(-10, 10))
+                self.spawn(pos + offset, max(ASTEROID_SIZE_MIN_SPLIT, size // 2))
+
+        # Create a small explosion
+        self.game.explosions.spawn(pos, size // 2)
+        self.kill(i)
+
+    def any_within(self, pos, distance):
+        """Return True if any live asteroid centre is closer than distance to pos"""
+        n = self.count
+        delta = self.pos[:n] - (pos[0], pos[1])
+        near = np.einsum("ij,ij->i", delta, delta) < distance * distance
+        return bool(np.any(near & self.alive[:n]))
+
+    def visible_blits(self, view, camera, alpha=1.0):
+        """Return (image, screen position) pairs for the asteroids inside view.
+
+        Positions are interpolated alpha of the way from the previous sim step.
+        """
+        n = self.count
+        half = self.atlas.half_sizes[self.image_index[:n]]
+        pos = lerp_positions(self.prev_pos[:n], self.pos[:n], alpha)
+        x = pos[:, 0]
+        y = pos[:, 1]
+        visible = np.flatnonzero(
+            self.alive[:n]
+            & (x + half > view.left)
+            & (x - half < view.right)
+            & (y + half > view.top)
+            & (y - half < view.bottom)
+        )
+        topleft = pos[visible] - half[visible, None] - (camera.x, camera.y)
+        images = self.atlas.images
+        return list(
+            zip(
+                [images[i] for i in self.image_index[visible].tolist()],
+                topleft.astype(int).tolist(),
+            )
+        )
@@ -0,0 +1,68 @@
+import random
+
+import pygame as pg
+
+from assets import to_display_format
+from settings import (
+    BACKGROUND_GRID_COLOR,
+    BACKGROUND_GRID_SIZE,
+    BACKGROUND_PARALLAX_LAYERS,
+    BACKGROUND_SEED,
+    BACKGROUND_STAR_COUNT,
+    BACKGROUND_TILE_SIZE,
+    BLACK,
+)
+
+
+def make_star_tile(size, star_count, rng, brightness=255):
+    """Draw a tile of scattered single-pixel and small stars on black"""
+    tile = pg.Surface((size, size))
+    tile.fill(BLACK)
+    for _ in range(star_count):
+        shade = rng.randint(brightness // 3, brightness)
+        pos = (rng.randrange(size), rng.randrange(size))
+        if rng.random() < 0.1:
+            pg.draw.circle(tile, (shade, shade, shade), pos, 1)
+        else:
+            tile.set_at(pos, (shade, shade, shade))
+    return tile
+
+
+class Background:
+    """Pre-rendered background tiles scrolled with the camera.
+
+    The grid and an optional starfield are drawn into one tile at start-up,
+    and each parallax layer into another tile with a black colorkey. Drawing a
+    frame is then a few tile blits per layer, however big the world is.
+    """
+
+    def __init__(self, tile_size=BACKGROUND_TILE_SIZE):
+        self.tile_size = tile_size
+        # A fixed seed keeps the starfield the same every launch
+        rng = random.Random(BACKGROUND_SEED)
+
+        # Base layer: starfield plus the reference grid, moves with the world
+        base = make_star_tile(tile_size, BACKGROUND_STAR_COUNT, rng)
+        for offset in range(0, tile_size, BACKGROUND_GRID_SIZE):
+            pg.draw.line(base, BACKGROUND_GRID_COLOR, (offset, 0), (offset, tile_size))
+            pg.draw.line(base, BACKGROUND_GRID_COLOR, (0, offset), (tile_size, offset))
+        self.layers = [(to_display_format(base), 1.0)]
+
+        # Parallax layers: dimmer stars that scroll slower than the world
+        for factor, star_count in BACKGROUND_PARALLAX_LAYERS:
+            tile = make_star_tile(tile_size, star_count, rng, int(255 * factor))
+            tile.set_colorkey(BLACK)
+            self.layers.append((to_display_format(tile), factor))
+
+    def draw(self, screen, camera):
+        size = self.tile_size
+        width, height = screen.get_size()
+        blits = []
+        for tile, factor in self.layers:
+            # Offset of the first tile so the pattern lines up with the world
+            start_x = -int(camera.x * factor) % size - size
+            start_y = -int(camera.y * factor) % size - size
+            for x in range(start_x, width, size):
+                for y in range(start_y, height, size):
+                    blits.append((tile, (x, y)))
+        screen.blits(blits, doreturn=False)
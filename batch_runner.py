@@ -0,0 +1,237 @@
+"""Run many seeded headless matches in parallel, for balance and load testing.
+
+Matches are spread over a ProcessPoolExecutor, one match per task. Each
+worker process builds one headless Game up front and starts a new match on
+it for every task, so the per-match cost is the match itself. Players are
+driven by bots. Results are collected into one columnar file, a .npz of
+one array per column or a .csv with one row per match:
+
+    python batch_runner.py --matches 1000 --out results.npz
+    python batch_runner.py --matches 200 --bots aim,random --workers 4 --out results.csv
+
+Match i uses seed --seed + i, so any match can be replayed on its own.
+"""
+
+import argparse
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import log
+from display import HeadlessDisplay
+from headless import idle, random_presses, spin_fire
+from input_sources import ScriptedInput
+from main import Game
+from settings import SIM_DT, SIM_HZ
+
+BATCH_MATCHES = 100
+BATCH_SEED = 0  # Seed of the first match, the others count up from it
+BATCH_MAX_SECONDS = 180  # Game time before a match is stopped as a timeout
+BATCH_CHUNKSIZE = 4  # Matches handed to a worker per round trip
+BATCH_PROGRESS_EVERY = 50  # Matches between progress lines
+
+AIM_BOT_FIRE_ANGLE = 15  # Degrees off target the aim bot still fires at
+AIM_BOT_TURN_DEADZONE = 5  # Degrees off target the aim bot stops turning at
+AIM_BOT_THRUST_DISTANCE = 300  # The aim bot closes in on targets farther than this
+
+
+def aim_bot(game, player_index):
+    """Script that turns toward the nearest asteroid or enemy and shoots it.
+
+    The script reads the live game state every step, so it is only valid
+    for the game it was made for.
+    """
+
+    def script(step):
+        player = game.player1 if player_index == 0 else game.player2
+        if not player.alive():
+            return {}
+
+        # Nearest target, asteroids come from the field's arrays
+        best = None
+        best_distance = math.inf
+        field = game.asteroids
+        if field.count:
+            offsets = field.pos[: field.count] - (player.pos.x, player.pos.y)
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+            nearest = int(distances.argmin())
+            best, best_distance = offsets[nearest], distances[nearest]
+        for enemy in game.enemies:
+            offset = enemy.pos - player.pos
+            distance = offset.length()
+            if distance < best_distance:
+                best, best_distance = offset, distance
+        if best is None:
+            return {"left": True}
+
+        # Signed angle from the ship's heading to the target, negative is to the left
+        heading = ship_heading(player.rot)
+        angle = math.degrees(
+            math.atan2(best[1], best[0]) - math.atan2(heading[1], heading[0])
+        )
+        angle = (angle + 180) % 360 - 180
+        return {
+            "left": angle < -AIM_BOT_TURN_DEADZONE,
+            "right": angle > AIM_BOT_TURN_DEADZONE,
+            "up": best_distance > AIM_BOT_THRUST_DISTANCE,
+            "fire": abs(angle) < AIM_BOT_FIRE_ANGLE,
+        }
+
+    return script
+
+
+def ship_heading(rot):
+    """Unit vector a ship with rotation rot faces, as vec(0, -1).rotate(-rot)"""
+    rad = math.radians(rot)
+    return (-math.sin(rad), -math.cos(rad))
+
+
+# Bot name -> factory(game, player index, match seed) returning an input script
+BOTS = {
+    "idle": lambda game, index, seed: idle,
+    "spin_fire": lambda game, index, seed: spin_fire,
+    "random": lambda game, index, seed: random_presses(seed * 2 + index),
+    "aim": lambda game, index, seed: aim_bot(game, index),
+}
+
+# Set up once per worker process by init_worker()
+worker_game = None
+
+
+def init_worker():
+    """Build the worker's headless Game, reused for every match it runs"""
+    global worker_game
+    # Under the spawn start method a worker imports everything afresh
+    log.setup_logging()
+    # Per-match log lines from every worker would drown the progress output
+    log.set_level("WARNING")
+    worker_game = Game(display=HeadlessDisplay())
+
+
+def run_match(task):
+    """Play one match and return its result row as a dict"""
+    seed, bots, max_steps, draw_every = task
+    game = worker_game
+    game.player_inputs = tuple(
+        ScriptedInput(BOTS[bot](game, index, seed)) for index, bot in enumerate(bots)
+    )
+    game.new(seed)
+
+    step_times = np.zeros(max_steps)
+    peaks = dict.fromkeys(("asteroids", "enemies", "lasers", "explosions", "powerups"), 0)
+    start = time.perf_counter()
+    steps = 0
+    while game.playing and steps < max_steps:
+        step_start = time.perf_counter()
+        game.dt = SIM_DT
+        game.update()
+        if draw_every and steps % draw_every == 0:
+            game.draw()
+        step_times[steps] = time.perf_counter() - step_start
+        steps += 1
+
+        peaks["asteroids"] = max(peaks["asteroids"], len(game.asteroids))
+        peaks["enemies"] = max(peaks["enemies"], len(game.enemies))
+        peaks["lasers"] = max(peaks["lasers"], len(game.lasers))
+        peaks["explosions"] = max(peaks["explosions"], len(game.explosions))
+        peaks["powerups"] = max(peaks["powerups"], len(game.powerups))
+    wall = time.perf_counter() - start
+
+    step_ms = step_times[:steps] * 1000
+    return {
+        "seed": seed,
+        "bot1": bots[0],
+        "bot2": bots[1],
+        "outcome": "game_over" if not game.playing else "timeout",
+        "score": game.score,
+        "steps": steps,
+        "game_seconds": steps * SIM_DT,
+        "wall_seconds": wall,
+        **{f"peak_{name}": peak for name, peak in peaks.items()},
+        "step_ms_mean": float(step_ms.mean()) if steps else 0.0,
+        "step_ms_p95": float(np.percentile(step_ms, 95)) if steps else 0.0,
+        "step_ms_p99": float(np.percentile(step_ms, 99)) if steps else 0.0,
+        "step_ms_max": float(step_ms.max()) if steps else 0.0,
+    }
+
+
+def run_batch(matches, bots, seed=BATCH_SEED, max_seconds=BATCH_MAX_SECONDS,
+              workers=None, draw_every=0, chunksize=BATCH_CHUNKSIZE, progress=True):
+    """Run matches over a process pool and return the results as columns.
+
+    The columns dict maps each result field to a list, one entry per match
+    in seed order.
+    """
+    max_steps = int(max_seconds * SIM_HZ)
+    tasks = [(seed + i, bots, max_steps, draw_every) for i in range(matches)]
+    columns = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        for done, row in enumerate(executor.map(run_match, tasks, chunksize=chunksize), 1):
+            for name, value in row.items():
+                columns.setdefault(name, []).append(value)
+            if progress and (done % BATCH_PROGRESS_EVERY == 0 or done == matches):
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{matches} matches, {done / elapsed:.2f} matches/s")
+    return columns
+
+
+def save_columns(columns, path):
+    """Write result columns as .npz (one array per column) or, for .csv, one row per match"""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*columns.values()))
+    else:
+        np.savez_compressed(path, **{name: np.array(values) for name, values in columns.items()})
+
+
+def parse_bots(text):
+    """'aim,random' -> ('aim', 'random'), a single name is used for both players"""
+    bots = tuple(text.split(","))
+    if len(bots) == 1:
+        bots *= 2
+    if len(bots) != 2 or any(bot not in BOTS for bot in bots):
+        raise argparse.ArgumentTypeError(f"expected one or two of {sorted(BOTS)}, comma separated")
+    return bots
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=BATCH_MATCHES)
+    parser.add_argument("--bots", type=parse_bots, default=("aim", "aim"),
+                        help=f"bot for each player, from {sorted(BOTS)} (default aim)")
+    parser.add_argument("--seed", type=int, default=BATCH_SEED, help="seed of the first match")
+    parser.add_argument("--max-seconds", type=float, default=BATCH_MAX_SECONDS,
+                        help="game time before a match is stopped")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--draw-every", type=int, default=0,
+                        help="also render every Nth step, to include draw cost (0 = never)")
+    parser.add_argument("--chunksize", type=int, default=BATCH_CHUNKSIZE)
+    parser.add_argument("--out", default="batch_results.npz", help=".npz or .csv output file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    columns = run_batch(
+        args.matches, args.bots, args.seed, args.max_seconds,
+        args.workers, args.draw_every, args.chunksize,
+    )
+    elapsed = time.perf_counter() - start
+    save_columns(columns, args.out)
+
+    steps = sum(columns.get("steps", []))
+    print(
+        f"{args.matches} matches on {args.workers} workers in {elapsed:.1f}s: "
+        f"{args.matches / elapsed:.2f} matches/s, {steps / elapsed:.0f} sim steps/s. "
+        f"Results saved to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
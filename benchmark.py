@@ -0,0 +1,385 @@
+"""Headless benchmark suite built from scenario definitions.
+
+Each scenario fills a world with a given number of asteroids, enemies and
+motherships (optionally with both players on sustained shotgun fire, or a
+stream of new explosions) and runs a fixed number of frames. A frame is one
+fixed sim step plus a draw to the off-screen surface. Results are mean, p95
+and p99 frame time plus sim steps per second.
+
+    python benchmark.py                                  # every scenario
+    python benchmark.py asteroids --sweep asteroids=100,200,400,800
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.15
+    python benchmark.py --startup                        # import and Game() cost
+    python benchmark.py everything --snapshot            # save/restore and rollback cost
+
+With --baseline, any scenario whose mean or p95 frame time got slower than
+the baseline by more than the threshold fails the run (exit status 1).
+
+With --snapshot, each scenario instead times snapshot.save() and
+snapshot.restore() on its world and a rollback of ROLLBACK_MAX_FRAMES
+frames (a restore, then a save and a sim step per frame), checking the
+frames run again end in the same state. A rollback is spread over
+advance() calls of at most ROLLBACK_MAX_STEPS steps, so the most work one
+call does, a restore and that many steps, is what has to fit the render
+frame budget. The run fails if any scenario's p99 for it is over budget
+or a rollback diverged.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import log
+import snapshot
+from display import HeadlessDisplay
+from headless import idle, spin_fire
+from input_sources import ScriptedInput
+from main import Game
+from replay import state_digest
+from rollback import ROLLBACK_MAX_FRAMES, ROLLBACK_MAX_STEPS
+from settings import FPS, SIM_DT
+from sprites import EnemyShip, MotherShip
+
+BENCHMARK_FRAMES = 600  # Measured frames per scenario
+BENCHMARK_WARMUP = 60  # Frames run first and left out of the stats
+BENCHMARK_SEED = 1
+BENCHMARK_THRESHOLD = 0.15  # Allowed slowdown against a baseline (15%)
+STARTUP_RUNS = 5  # Fresh interpreters started by --startup, the fastest run counts
+SNAPSHOT_RUNS = 200  # Saves, restores and rollbacks timed per scenario by --snapshot
+
+# Run in a fresh interpreter, so nothing is imported yet. Prints the
+# milliseconds each startup stage took, as JSON.
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import settings
+settings_done = time.perf_counter()
+from main import Game
+main_done = time.perf_counter()
+from display import HeadlessDisplay
+Game(display=HeadlessDisplay())
+game_done = time.perf_counter()
+print(json.dumps({
+    "import settings": (settings_done - start) * 1000,
+    "import main": (main_done - settings_done) * 1000,
+    "Game()": (game_done - main_done) * 1000,
+}))
+"""
+
+# Entity counts are kept topped up every frame, so the load stays constant
+# while things get destroyed
+SCENARIO_DEFAULTS = {
+    "asteroids": 0,  # Asteroids kept alive
+    "enemies": 0,  # Enemy ships kept alive
+    "motherships": 0,  # Motherships kept alive
+    "fire": False,  # Both players spin with shotgun and laser stream firing
+    "explosions": 0,  # New explosions spawned per frame
+}
+
+SCENARIOS = {
+    "idle": {},
+    "asteroids": {"asteroids": 1000},
+    "enemies": {"enemies": 150},
+    "motherships": {"motherships": 12},
+    "shotgun": {"asteroids": 100, "fire": True},
+    "explosions": {"explosions": 20},
+    "everything": {
+        "asteroids": 500,
+        "enemies": 80,
+        "motherships": 4,
+        "fire": True,
+        "explosions": 5,
+    },
+}
+
+
+def top_up(game, params):
+    """Bring the world back to the scenario's entity counts"""
+    rng = game.rng
+    for _ in range(params["asteroids"] - len(game.asteroids)):
+        game.asteroids.spawn()
+    for _ in range(params["motherships"] - len(game.motherships)):
+        MotherShip(game)
+    # Motherships count as enemies too
+    for _ in range(params["enemies"] - (len(game.enemies) - len(game.motherships))):
+        EnemyShip(game, (rng.uniform(0, game.width), rng.uniform(0, game.height)))
+    for _ in range(params["explosions"]):
+        game.explosions.spawn(
+            (rng.uniform(0, game.width), rng.uniform(0, game.height)), rng.randint(10, 100)
+        )
+
+
+def start_scenario(game, params):
+    """Start a new match on game set up for the scenario, return its full params"""
+    params = {**SCENARIO_DEFAULTS, **params}
+    script = spin_fire if params["fire"] else idle
+    game.player_inputs = (ScriptedInput(script), ScriptedInput(script))
+    game.new(BENCHMARK_SEED)
+    for player in game.players:
+        # Dead players would leave their collisions, firing and drawing out
+        # of every sample
+        player.invulnerable = True
+        if params["fire"]:
+            player.apply_powerup("shotgun")
+            player.apply_powerup("laser_stream")
+    return params
+
+
+def check_players(game):
+    """Raise if a player is gone or the match ended, the scenario would measure less"""
+    for player in (game.player1, game.player2):
+        if not player.alive():
+            raise RuntimeError(f"player {player.player_num} was removed during the scenario")
+    if not game.playing:
+        raise RuntimeError("the match ended during the scenario")
+
+
+def run_scenario(game, params, frames=BENCHMARK_FRAMES, warmup=BENCHMARK_WARMUP):
+    """Run one scenario on game and return its timing stats"""
+    params = start_scenario(game, params)
+    update_times = []
+    frame_times = []
+    for frame in range(warmup + frames):
+        top_up(game, params)
+        start = time.perf_counter()
+        game.dt = SIM_DT
+        game.update()
+        updated = time.perf_counter()
+        game.draw()
+        end = time.perf_counter()
+        check_players(game)
+        if frame >= warmup:
+            update_times.append(updated - start)
+            frame_times.append(end - start)
+
+    frame_ms = np.array(frame_times) * 1000
+    return {
+        "mean_ms": float(frame_ms.mean()),
+        "p95_ms": float(np.percentile(frame_ms, 95)),
+        "p99_ms": float(np.percentile(frame_ms, 99)),
+        "steps_per_second": len(update_times) / sum(update_times),
+        "asteroids": len(game.asteroids),
+        "enemies": len(game.enemies),
+    }
+
+
+def measure_snapshot(game, params, runs=SNAPSHOT_RUNS, warmup=BENCHMARK_WARMUP,
+                     depth=ROLLBACK_MAX_FRAMES, max_steps=ROLLBACK_MAX_STEPS):
+    """Time saving, restoring and rolling back depth frames on a scenario's world.
+
+    A rollback's first advance() call, the restore and max_steps frames, is
+    timed on its own as well.
+    """
+    params = start_scenario(game, params)
+    for _ in range(warmup):
+        top_up(game, params)
+        game.dt = SIM_DT
+        game.update()
+
+    save_times = []
+    restore_times = []
+    step_times = []
+    rollback_times = []
+    advance_times = []
+    diverged = 0
+    for _ in range(runs):
+        top_up(game, params)
+        check_players(game)
+        # Scripts count their own steps, they have to replay the same input
+        script_steps = [source.step for source in game.player_inputs]
+
+        start = time.perf_counter()
+        state = snapshot.save(game)
+        saved = time.perf_counter()
+        snapshot.restore(game, state)
+        save_times.append(saved - start)
+        restore_times.append(time.perf_counter() - saved)
+
+        for _ in range(depth):
+            start = time.perf_counter()
+            game.dt = SIM_DT
+            game.update()
+            step_times.append(time.perf_counter() - start)
+        expected = state_digest(game)
+
+        # What a rollback does: back to the saved state, then every frame
+        # again, saving the state before each one for the next rollback
+        start = time.perf_counter()
+        snapshot.restore(game, state)
+        for source, step in zip(game.player_inputs, script_steps):
+            source.step = step
+        for frame in range(depth):
+            if frame == max_steps:
+                advance_times.append(time.perf_counter() - start)
+            snapshot.save(game)
+            game.dt = SIM_DT
+            game.update(interpolate=False)
+        rollback_times.append(time.perf_counter() - start)
+        diverged += state_digest(game) != expected
+
+    return {
+        "save_us": float(np.mean(save_times)) * 1e6,
+        "restore_us": float(np.mean(restore_times)) * 1e6,
+        "step_ms": float(np.mean(step_times)) * 1000,
+        "rollback_ms": float(np.mean(rollback_times)) * 1000,
+        "advance_ms": float(np.mean(advance_times)) * 1000,
+        "advance_p99_ms": float(np.percentile(advance_times, 99)) * 1000,
+        "diverged": diverged,
+        "sprites": len(game.all_sprites),
+        "asteroids": len(game.asteroids),
+    }
+
+
+def measure_startup(runs=STARTUP_RUNS):
+    """Milliseconds per startup stage, the best of runs fresh interpreters"""
+    best = {}
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env={**os.environ, "ASTEROID_DUEL_LOG": "WARNING"},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        # pygame prints its banner first, the timings are the last line
+        for stage, ms in json.loads(output.splitlines()[-1]).items():
+            best[stage] = min(ms, best.get(stage, ms))
+    return best
+
+
+def parse_sweep(text):
+    """'asteroids=100,200,400' -> ('asteroids', [100, 200, 400])"""
+    key, _, values = text.partition("=")
+    if key not in SCENARIO_DEFAULTS or not values:
+        raise argparse.ArgumentTypeError(
+            f"expected <count>=<n>,<n>,... with count one of {sorted(SCENARIO_DEFAULTS)}"
+        )
+    return key, [int(value) for value in values.split(",")]
+
+
+def print_row(name, stats):
+    print(
+        f"{name:<24} {stats['mean_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} "
+        f"{stats['steps_per_second']:10.0f}"
+    )
+
+
+def compare(results, baseline, threshold):
+    """Return a description of every regression past threshold"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in ("mean_ms", "p95_ms"):
+            if stats[key] > base[key] * (1 + threshold):
+                regressions.append(
+                    f"{name} {key}: {stats[key]:.2f} vs baseline {base[key]:.2f} "
+                    f"(+{(stats[key] / base[key] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run, from {sorted(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=BENCHMARK_FRAMES)
+    parser.add_argument("--warmup", type=int, default=BENCHMARK_WARMUP)
+    parser.add_argument(
+        "--sweep", type=parse_sweep, metavar="COUNT=N,N,...",
+        help="run each scenario once per value of an entity count, for a scaling curve",
+    )
+    parser.add_argument("--save-baseline", metavar="PATH", help="store results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="fail on regressions against this")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_THRESHOLD)
+    parser.add_argument(
+        "--startup", action="store_true",
+        help="time importing settings and main and creating a Game, then exit",
+    )
+    parser.add_argument(
+        "--snapshot", action="store_true",
+        help="time snapshot save/restore and rollbacks instead of frames",
+    )
+    args = parser.parse_args()
+
+    if args.startup:
+        for stage, ms in measure_startup().items():
+            print(f"{stage:<24} {ms:8.2f} ms")
+        return
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios {unknown}, expected some of {sorted(SCENARIOS)}")
+
+    # Every run is listed under its own name, sweep runs get the value appended
+    runs = []
+    for name in names:
+        if args.sweep:
+            key, values = args.sweep
+            for value in values:
+                runs.append((f"{name}[{key}={value}]", {**SCENARIOS[name], key: value}))
+        else:
+            runs.append((name, SCENARIOS[name]))
+
+    if args.snapshot:
+        budget = 1000 / FPS
+        print(
+            f"{'scenario':<24} {'save us':>8} {'restore us':>10} {'step ms':>8} "
+            f"{f'rollback {ROLLBACK_MAX_FRAMES} ms':>14} {f'advance {ROLLBACK_MAX_STEPS} ms':>12} "
+            f"{'p99 ms':>8} {'diverged':>8}"
+        )
+        failed = False
+        with log.quiet():
+            game = Game(display=HeadlessDisplay())
+            for name, params in runs:
+                stats = measure_snapshot(game, params, warmup=args.warmup)
+                failed |= stats["advance_p99_ms"] > budget or stats["diverged"] > 0
+                print(
+                    f"{name:<24} {stats['save_us']:8.0f} {stats['restore_us']:10.0f} "
+                    f"{stats['step_ms']:8.2f} {stats['rollback_ms']:14.2f} {stats['advance_ms']:12.2f} "
+                    f"{stats['advance_p99_ms']:8.2f} {stats['diverged']:8d}"
+                )
+                if stats["advance_p99_ms"] > budget:
+                    print(f"OVER BUDGET {name}: p99 advance() past the {budget:.2f} ms frame budget")
+                if stats["diverged"]:
+                    print(f"DIVERGED {name}: a rollback did not reproduce the original state")
+        if failed:
+            sys.exit(1)
+        print(f"Every advance() of a rollback fits the {budget:.2f} ms frame budget")
+        return
+
+    print(f"{'scenario':<24} {'mean ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'steps/s':>10}")
+    results = {}
+    # The game's log output would clutter the table
+    with log.quiet():
+        game = Game(display=HeadlessDisplay())
+        for name, params in runs:
+            stats = run_scenario(game, params, args.frames, args.warmup)
+            results[name] = stats
+            print_row(name, stats)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions past {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 import pygame as pg
-from settings import WIDTH, HEIGHT
+from log import get_logger
+
+logger = get_logger(__name__)
 
 class Camera:
-    def __init__(self, width, height):
+    def __init__(self, width, height, view_width, view_height):
         self.width = width
         self.height = height
+        # Size of the visible area, the game's resolution
+        self.view_width = view_width
+        self.view_height = view_height
         self.x = 0
         self.y = 0
         self.camera = pg.Rect(0, 0, width, height)
-        print(f"Camera initialized with dimensions {width}x{height}")
+        logger.debug("Camera initialized with dimensions %dx%d", width, height)
     
     def apply(self, pos):
         """Apply camera offset to a position vector"""
@@ -18,19 +23,28 @@ class Camera:
     def apply_rect(self, rect):
         """Apply camera offset to a rectangle"""
         return pg.Rect(rect.x - self.x, rect.y - self.y, rect.width, rect.height)
+
+    def view_rect(self, margin=0):
+        """Return the visible world area, grown by margin on every side"""
+        return pg.Rect(
+            self.x - margin,
+            self.y - margin,
+            self.view_width + margin * 2,
+            self.view_height + margin * 2,
+        )
     
     def update(self, target):
         """Update camera position to center on a target"""
         # Calculate new camera position to center on target
-        self.x = target.pos.x - WIDTH // 2
-        self.y = target.pos.y - HEIGHT // 2
+        self.x = target.pos.x - self.view_width // 2
+        self.y = target.pos.y - self.view_height // 2
         
         # Update the camera rect
         self.camera = pg.Rect(self.x, self.y, self.width, self.height)
         
         # Keep camera within world bounds
-        self.x = max(0, min(self.x, self.width - WIDTH))
-        self.y = max(0, min(self.y, self.height - HEIGHT))
+        self.x = max(0, min(self.x, self.width - self.view_width))
+        self.y = max(0, min(self.y, self.height - self.view_height))
     
     def update_for_two_players(self, player1, player2):
         """Update camera to keep both players in view"""
@@ -39,16 +53,15 @@ class Camera:
         mid_y = (player1.pos.y + player2.pos.y) / 2
         
         # Set camera position to center on midpoint
-        self.x = mid_x - WIDTH // 2
-        self.y = mid_y - HEIGHT // 2
+        self.x = mid_x - self.view_width // 2
+        self.y = mid_y - self.view_height // 2
         
         # Update the camera rect
         self.camera = pg.Rect(self.x, self.y, self.width, self.height)
         
         # Keep camera within world bounds
-        self.x = max(0, min(self.x, self.width - WIDTH))
-        self.y = max(0, min(self.y, self.height - HEIGHT))
+        self.x = max(0, min(self.x, self.width - self.view_width))
+        self.y = max(0, min(self.y, self.height - self.view_height))
         
-        # Debug info
-        if pg.time.get_ticks() % 1000 < 10:  # Print only occasionally
-            print(f"Camera at {self.x}, {self.y}, tracking midpoint {mid_x}, {mid_y}")
+        # Debug info, rate limited to about once a second
+        logger.debug("Camera at %.0f, %.0f, tracking midpoint %.0f, %.0f", self.x, self.y, mid_x, mid_y)
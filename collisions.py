@@ -0,0 +1,254 @@
+from collections import namedtuple
+
+import numpy as np
+import pygame as pg
+
+from log import get_logger
+from settings import POWERUP_SPAWN_CHANCE
+from sprites import MotherShip, PowerUp
+
+logger = get_logger(__name__)
+
+# A resolved collision between two entities, in the order the pair was tested
+CollisionEvent = namedtuple("CollisionEvent", ["kind_a", "kind_b", "a", "b"])
+
+# Pairs tested each frame, in resolution order. The first kind is the group
+# that is iterated, the second is the spatial hash grid it is queried against.
+# Asteroids and lasers live in NumPy arrays and are referred to by slot index.
+COLLISION_PAIRS = (
+    ("laser", "asteroid"),
+    ("laser", "enemy"),
+    ("laser", "player"),
+    ("player", "asteroid"),
+    ("player", "enemy"),
+    ("player", "powerup"),
+    ("enemy", "asteroid"),
+)
+
+
+def laser_hits_asteroid(game, laser, asteroid):
+    game.lasers.kill(laser)
+    field = game.asteroids
+
+    # Asteroids without a powerup core still have a chance to drop one
+    if not field.has_powerup[asteroid] and game.rng.random() < POWERUP_SPAWN_CHANCE["asteroid"]:
+        # Create powerup at asteroid position with a slight offset for visibility
+        powerup_pos = field.position(asteroid) + pg.math.Vector2(
+            game.rng.uniform(-10, 10), game.rng.uniform(-10, 10)
+        )
+        PowerUp(game, powerup_pos)
+        logger.debug("PowerUp spawned at %.0f, %.0f from asteroid", powerup_pos.x, powerup_pos.y)
+
+    field.split(asteroid)
+    game.score += 10
+    return True
+
+
+def laser_hits_enemy(game, laser, enemy):
+    game.lasers.kill(laser)
+    if isinstance(enemy, MotherShip):
+        enemy.take_damage(10)  # Mothership takes less damage
+    else:
+        enemy.take_damage(30)  # Regular enemy ships take full damage
+    return True
+
+
+def laser_hits_player(game, laser, player):
+    # Lasers pass over the ship that fired them
+    shooter = game.lasers.owner[laser]
+    if shooter is player:
+        return False
+
+    # Players are immune to each other's weapons, the laser is just absorbed
+    game.lasers.kill(laser)
+    logger.debug(
+        "Laser from Player %d passed through Player %d", shooter.player_num, player.player_num
+    )
+    return True
+
+
+def player_hits_asteroid(game, player, asteroid):
+    game.asteroids.kill(asteroid)
+    game.explosions.spawn(game.asteroids.position(asteroid), game.asteroids.size(asteroid))
+    logger.debug("Player %d collided with asteroid", player.player_num)
+    player.take_damage(20)
+    return True
+
+
+def player_hits_enemy(game, player, enemy):
+    if isinstance(enemy, MotherShip):
+        # Check if player has an active shield
+        if player.active_powerups["shield"]:
+            logger.debug("Player %d's shield protected from mothership collision!", player.player_num)
+            # Shield protects from damage but is removed after mothership collision
+            player.active_powerups["shield"] = False
+            player.shield_health = 0
+            # Create shield break effect
+            for _ in range(5):
+                game.explosions.spawn(player.pos, game.rng.randint(10, 20))
+        elif not player.invulnerable:
+            # No shield, player takes damage
+            player.health -= 30
+
+        # Player collision still damages mothership
+        enemy.take_damage(50)
+    else:
+        # For regular enemy ships
+        if player.active_powerups["shield"]:
+            # Shield absorbs damage from regular enemies
+            player.shield_health -= 10
+            logger.debug(
+                "Player %d's shield absorbed enemy collision. Shield health: %d",
+                player.player_num, player.shield_health,
+            )
+
+            # If shield is depleted, remove it
+            if player.shield_health <= 0:
+                player.active_powerups["shield"] = False
+                logger.debug("Player %d's shield depleted from enemy collision", player.player_num)
+        elif not player.invulnerable:
+            # No shield, player takes damage
+            player.health -= 10
+
+        # Enemy ship destroyed on player collision
+        enemy.take_damage(100)
+
+    if player.health <= 0 and player.alive():
+        player.kill()
+        game.explosions.spawn(player.pos, player.size)
+    return True
+
+
+def player_hits_powerup(game, player, powerup):
+    powerup.kill()
+    player.collect_powerup(powerup.type)
+    return True
+
+
+def enemy_hits_asteroid(game, enemy, asteroid):
+    game.asteroids.kill(asteroid)
+    game.explosions.spawn(game.asteroids.position(asteroid), game.asteroids.size(asteroid))
+    if isinstance(enemy, MotherShip):
+        enemy.take_damage(20)  # Mothership takes less damage from asteroids
+    else:
+        enemy.take_damage(100)  # Regular enemy ships are destroyed by asteroids
+    return True
+
+
+# Collision response for each (kind_a, kind_b) pair. A response returns False
+# when the pair turned out not to interact, so no event is recorded for it.
+COLLISION_RESPONSES = {
+    ("laser", "asteroid"): laser_hits_asteroid,
+    ("laser", "enemy"): laser_hits_enemy,
+    ("laser", "player"): laser_hits_player,
+    ("player", "asteroid"): player_hits_asteroid,
+    ("player", "enemy"): player_hits_enemy,
+    ("player", "powerup"): player_hits_powerup,
+    ("enemy", "asteroid"): enemy_hits_asteroid,
+}
+
+
+def collision_groups(game):
+    """Map each sprite-based entity kind to the sprite group holding it"""
+    return {
+        "enemy": game.enemies,
+        "powerup": game.powerups,
+        "player": game.players,
+    }
+
+
+def entity_rects(game, groups, kind):
+    """Yield (entity, rect) for every live entity of a kind that is tested first"""
+    if kind == "laser":
+        for i in game.lasers.indices():
+            yield i, game.lasers.rect(i)
+    else:
+        for sprite in groups[kind]:
+            yield sprite, sprite.rect
+
+
+def find_asteroid_pairs(game, rects):
+    """Map each kind tested against asteroids to its overlapping pairs.
+
+    The rects of every such kind go through one asteroid grid search, which
+    costs about the same for a handful of rects as for a hundred.
+    """
+    kinds = [kind_a for kind_a, kind_b in COLLISION_PAIRS if kind_b == "asteroid"]
+    bounds = np.array(
+        [(rect.left, rect.top, rect.right, rect.bottom) for kind in kinds for _, rect in rects[kind]],
+        dtype=float,
+    ).reshape(-1, 4)
+    rows, hits = game.spatial_hash.query_points("asteroid", bounds)
+
+    # Rows come sorted, so each kind's hits are one slice
+    firsts = np.cumsum([0] + [len(rects[kind]) for kind in kinds])
+    ends = rows.searchsorted(firsts).tolist()
+    rows = rows.tolist()
+    hits = hits.tolist()
+    found = {}
+    for index, kind in enumerate(kinds):
+        entities = rects[kind]
+        first = int(firsts[index])
+        found[kind] = [
+            (kind, "asteroid", entities[row - first][0], b)
+            for row, b in zip(rows[ends[index] : ends[index + 1]], hits[ends[index] : ends[index + 1]])
+        ]
+    return found
+
+
+def find_candidate_pairs(game, groups):
+    """Build every overlapping pair for this frame in a single broadphase pass"""
+    # Kind -> [(entity, rect)], built once for every pair it is in
+    rects = {kind_a: list(entity_rects(game, groups, kind_a)) for kind_a, _ in COLLISION_PAIRS}
+    with game.profiler.section("update.collisions.asteroids"):
+        asteroid_pairs = find_asteroid_pairs(game, rects)
+
+    pairs = []
+    for kind_a, kind_b in COLLISION_PAIRS:
+        if kind_b == "asteroid":
+            pairs.extend(asteroid_pairs[kind_a])
+            continue
+        with game.profiler.section(f"update.collisions.{kind_a}-{kind_b}"):
+            for a, rect in rects[kind_a]:
+                for b in game.spatial_hash.rectcollide(rect, kind_b):
+                    pairs.append((kind_a, kind_b, a, b))
+    return pairs
+
+
+def is_alive(game, kind, entity):
+    if kind == "asteroid":
+        return game.asteroids.alive[entity]
+    if kind == "laser":
+        return game.lasers.active[entity]
+    return entity.alive()
+
+
+def run_collision_stage(game):
+    """Detect and resolve all collisions for the frame, once, after movement.
+
+    Returns the list of CollisionEvents that were resolved. Each pair is
+    resolved at most once, and pairs whose entities were already destroyed
+    earlier in the stage are skipped, so a laser only ever hits one target.
+    """
+    groups = collision_groups(game)
+    field = game.asteroids
+    n = field.count
+    with game.profiler.section("update.collisions.rebuild"):
+        game.spatial_hash.rebuild(groups)
+        game.spatial_hash.rebuild_points(
+            "asteroid", field.pos[:n], field.radius[:n], field.alive[:n]
+        )
+
+    candidates = find_candidate_pairs(game, groups)
+
+    events = []
+    with game.profiler.section("update.collisions.resolve"):
+        for kind_a, kind_b, a, b in candidates:
+            if not (is_alive(game, kind_a, a) and is_alive(game, kind_b, b)):
+                continue
+            if COLLISION_RESPONSES[(kind_a, kind_b)](game, a, b):
+                events.append(CollisionEvent(kind_a, kind_b, a, b))
+
+    # Asteroid indices in the events refer to slots before this compaction
+    field.remove_dead()
+    return events
@@ -0,0 +1,87 @@
+"""Display backends a Game opens its window through.
+
+A backend picks the default window size and opens the window, so pygame's
+display is only initialized once a Game is actually created. Game() uses
+default_display() unless it is handed one:
+
+    Game(display=HeadlessDisplay(), size=(640, 360))
+"""
+
+import os
+
+import pygame as pg
+
+from log import get_logger
+from settings import FULLSCREEN, HEADLESS, HEADLESS_HEIGHT, HEADLESS_WIDTH, TITLE, WINDOWED_SCALE
+
+logger = get_logger(__name__)
+
+
+class WindowDisplay:
+    """A desktop window, or fullscreen, sized from the desktop resolution"""
+
+    def __init__(self, fullscreen=FULLSCREEN):
+        self.fullscreen = fullscreen
+
+    def default_size(self):
+        pg.display.init()
+        info = pg.display.Info()
+        size = (info.current_w, info.current_h)
+        logger.info("Detected screen resolution: %dx%d", *size)
+        if not self.fullscreen:
+            # Leave room for the desktop around a window
+            size = (int(size[0] * WINDOWED_SCALE), int(size[1] * WINDOWED_SCALE))
+        return size
+
+    def open(self, size):
+        pg.display.init()
+        if self.fullscreen:
+            window = pg.display.set_mode(size, pg.FULLSCREEN)
+            logger.info("Game running in fullscreen mode")
+        else:
+            window = pg.display.set_mode(size)
+            logger.info("Game running in windowed mode: %dx%d", *size)
+        pg.display.set_caption(TITLE)
+        return window
+
+
+class HeadlessDisplay:
+    """SDL's dummy video driver: nothing is shown and no real input arrives.
+
+    Surfaces still work as usual, so the whole game runs and draws off-screen.
+    """
+
+    def __init__(self, size=(HEADLESS_WIDTH, HEADLESS_HEIGHT)):
+        self.size = size
+
+    def default_size(self):
+        return self.size
+
+    def open(self, size):
+        if pg.display.get_init() and pg.display.get_driver() != "dummy":
+            raise RuntimeError("pygame's display is already running with a real video driver")
+        # The dummy drivers have to be picked before the display initializes,
+        # overriding any driver the environment asks for
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        pg.display.init()
+        if pg.display.get_driver() != "dummy":
+            raise RuntimeError(f"SDL picked the {pg.display.get_driver()} video driver instead of dummy")
+        window = pg.display.get_surface()
+        if window is not None:
+            # Several headless games in one process (see env.VecDuelEnv) share
+            # the mode set by the first, a new mode would invalidate its surface
+            if window.get_size() != tuple(size):
+                raise ValueError(
+                    f"a {window.get_width()}x{window.get_height()} headless game is already open, "
+                    f"games in one process have to share its size, not {size[0]}x{size[1]}"
+                )
+            return window
+        # The dummy driver still needs a mode for surface conversion
+        window = pg.display.set_mode(size)
+        logger.info("Game running headless: %dx%d", *size)
+        return window
+
+def default_display():
+    """The backend settings ask for, headless when ASTEROID_DUEL_HEADLESS is set"""
+    return HeadlessDisplay() if HEADLESS else WindowDisplay()
@@ -0,0 +1,253 @@
+"""Gym-style environment API for driving both players from code.
+
+DuelEnv wraps one headless Game. reset(seed) starts a match, and
+step(actions) holds each player's action mask (see encode_actions) for
+ENV_FRAME_SKIP sim steps. It returns (observations, rewards, terminated,
+truncated, info) in the usual gym layout, with one row per player:
+
+    env = DuelEnv()
+    obs, info = env.reset(seed=1)
+    obs, rewards, terminated, truncated, info = env.step([0b10000, 0b10100])
+
+VecDuelEnv steps many independent matches in lockstep and returns batched
+arrays, resetting each match as soon as it ends. Nothing is drawn unless
+render_mode asks for it, so throughput is bounded by the simulation.
+"""
+
+import numpy as np
+import pygame as pg
+
+from display import HeadlessDisplay, WindowDisplay
+from input_sources import PLAYER_ACTIONS, ScriptedInput, decode_actions
+from main import Game
+from settings import POWERUP_SHIELD_HEALTH, SIM_DT
+from sprites import MotherShip
+
+ENV_FRAME_SKIP = 4  # Sim steps each action is held for (30 decisions per second at 120 Hz)
+ENV_MAX_STEPS = 3600  # Env steps before a match is truncated (2 minutes of game time)
+ENV_NEAREST_ASTEROIDS = 8  # Asteroids in each observation, nearest first
+ENV_NEAREST_ENEMIES = 4  # Enemy ships in each observation, nearest first
+ENV_REWARD_SCORE = 0.01  # Reward per point of the shared score
+ENV_REWARD_HEALTH = 0.01  # Reward per point of health or shield gained, negative when lost
+
+ACTION_COUNT = 2 ** len(PLAYER_ACTIONS)  # Action masks are 0..ACTION_COUNT - 1
+ENV_SPEED_SCALE = 300  # Player top speed, velocities are divided by this
+
+# Observation layout, one float32 row per player
+OBS_SELF = 12  # x, y, vel x, vel y, sin, cos of heading, health, shield, 3 powerups, alive
+OBS_OTHER = 3  # Other player's offset x, y and alive
+OBS_ASTEROID = 5  # Offset x, y, velocity x, y and radius of each asteroid
+OBS_ENEMY = 3  # Offset x, y and is-mothership of each enemy
+OBS_SIZE = (
+    OBS_SELF + OBS_OTHER + ENV_NEAREST_ASTEROIDS * OBS_ASTEROID + ENV_NEAREST_ENEMIES * OBS_ENEMY
+)
+
+
+class DuelEnv:
+    """One match, both players driven by step().
+
+    Observations are float32 arrays of shape (2, OBS_SIZE), positions and
+    offsets in units of the screen size. Rewards are per player: the shared
+    score gained plus the player's own health and shield change.
+    render_mode is None (never draw), "rgb_array" (render() returns the
+    frame as an array) or "human" (open a window and draw every step).
+    """
+
+    def __init__(
+        self,
+        render_mode=None,
+        size=None,
+        frame_skip=ENV_FRAME_SKIP,
+        max_steps=ENV_MAX_STEPS,
+    ):
+        self.render_mode = render_mode
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        display = WindowDisplay() if render_mode == "human" else HeadlessDisplay()
+        self.inputs = (ScriptedInput(), ScriptedInput())
+        self.game = Game(self.inputs, size=size, display=display)
+        self.steps = 0
+        self.last_score = 0
+        self.last_health = np.zeros(2)
+
+    def players(self):
+        game = self.game
+        return (game.player1, game.player2)
+
+    def health(self):
+        """Health plus shield of both players, 0 for a dead player"""
+        return np.array(
+            [
+                player.health + player.shield_health if player.alive() else 0
+                for player in self.players()
+            ],
+            dtype=float,
+        )
+
+    def reset(self, seed=None, out=None):
+        """Start a new match and return (observations, info), written into out if given"""
+        self.game.new(seed)
+        self.steps = 0
+        self.last_score = 0
+        self.last_health = self.health()
+        if self.render_mode == "human":
+            self.render()
+        return self.observe(out), {"seed": self.game.seed}
+
+    def step(self, actions, out=None):
+        """Hold one action mask per player for frame_skip sim steps.
+
+        The observations are written into out if given, see observe().
+        """
+        game = self.game
+        for player_input, mask in zip(self.inputs, actions):
+            player_input.set(**decode_actions(int(mask)))
+        for _ in range(self.frame_skip):
+            game.dt = SIM_DT
+            game.update()
+            if not game.playing:
+                break
+        self.steps += 1
+
+        health = self.health()
+        rewards = (
+            (game.score - self.last_score) * ENV_REWARD_SCORE
+            + (health - self.last_health) * ENV_REWARD_HEALTH
+        ).astype(np.float32)
+        self.last_score = game.score
+        self.last_health = health
+
+        if self.render_mode == "human":
+            self.render()
+        terminated = not game.playing
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(out), rewards, terminated, truncated, {"score": game.score}
+
+    def observe(self, out=None):
+        """Write both players' observations into out, shape (2, OBS_SIZE)"""
+        if out is None:
+            out = np.zeros((2, OBS_SIZE), dtype=np.float32)
+        else:
+            out[:] = 0
+        game = self.game
+        scale = np.array([game.width, game.height], dtype=float)
+        players = self.players()
+        field = game.asteroids
+        asteroid_pos = field.pos[: field.count]
+        enemies = list(game.enemies)
+        enemy_pos = np.array([(enemy.pos.x, enemy.pos.y) for enemy in enemies]).reshape(-1, 2)
+        enemy_kind = np.array([isinstance(enemy, MotherShip) for enemy in enemies], dtype=float)
+
+        for index, player in enumerate(players):
+            row = out[index]
+            pos = np.array([player.pos.x, player.pos.y])
+            alive = player.alive()
+            heading = np.radians(player.rot)
+            row[0:2] = pos / scale
+            row[2:4] = (player.vel.x / ENV_SPEED_SCALE, player.vel.y / ENV_SPEED_SCALE)
+            row[4:6] = (np.sin(heading), np.cos(heading))
+            row[6] = player.health / 100 if alive else 0
+            row[7] = player.shield_health / POWERUP_SHIELD_HEALTH if alive else 0
+            row[8:11] = [player.active_powerups[name] for name in ("shotgun", "laser_stream", "shield")]
+            row[11] = alive
+
+            other = players[1 - index]
+            col = OBS_SELF
+            row[col : col + 2] = (np.array([other.pos.x, other.pos.y]) - pos) / scale
+            row[col + 2] = other.alive()
+            col += OBS_OTHER
+
+            if len(asteroid_pos):
+                offsets = asteroid_pos - pos
+                nearest = np.argsort(np.einsum("ij,ij->i", offsets, offsets))[:ENV_NEAREST_ASTEROIDS]
+                block = row[col : col + len(nearest) * OBS_ASTEROID].reshape(-1, OBS_ASTEROID)
+                block[:, 0:2] = offsets[nearest] / scale
+                block[:, 2:4] = field.vel[nearest] / ENV_SPEED_SCALE
+                block[:, 4] = field.radius[nearest] / scale[1]
+            col += ENV_NEAREST_ASTEROIDS * OBS_ASTEROID
+
+            if len(enemy_pos):
+                offsets = enemy_pos - pos
+                nearest = np.argsort(np.einsum("ij,ij->i", offsets, offsets))[:ENV_NEAREST_ENEMIES]
+                block = row[col : col + len(nearest) * OBS_ENEMY].reshape(-1, OBS_ENEMY)
+                block[:, 0:2] = offsets[nearest] / scale
+                block[:, 2] = enemy_kind[nearest]
+        return out
+
+    def render(self):
+        """Draw the current state, returning it as an (H, W, 3) array for "rgb_array" """
+        game = self.game
+        game.alpha = 1.0
+        game.draw()
+        if self.render_mode == "rgb_array":
+            # surfarray is indexed (x, y), images are (row, column)
+            return np.transpose(pg.surfarray.array3d(game.window), (1, 0, 2))
+        # Keep the window responsive, step() is what drives the game
+        pg.event.pump()
+        return None
+
+    def close(self):
+        self.game.quit()
+
+
+class VecDuelEnv:
+    """Many independent matches stepped in lockstep, with batched arrays.
+
+    Observations have shape (num_envs, 2, OBS_SIZE) and rewards (num_envs, 2).
+    A match that ends is reset right away with the next unused seed; its
+    last observation is kept in info["final_observation"], as gym's vector
+    environments do.
+    """
+
+    def __init__(self, num_envs, size=None, frame_skip=ENV_FRAME_SKIP, max_steps=ENV_MAX_STEPS):
+        # Every game draws to the one display surface pygame has, so vector
+        # environments never render
+        self.envs = [
+            DuelEnv(size=size, frame_skip=frame_skip, max_steps=max_steps)
+            for _ in range(num_envs)
+        ]
+        self.num_envs = num_envs
+        self.observations = np.zeros((num_envs, 2, OBS_SIZE), dtype=np.float32)
+        self.rewards = np.zeros((num_envs, 2), dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.next_seed = None
+
+    def reset(self, seed=None):
+        """Reset every match, env i with seed + i, and return (observations, info)"""
+        seeds = []
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index, self.observations[index])
+            seeds.append(env.game.seed)
+        self.next_seed = None if seed is None else seed + self.num_envs
+        return self.observations.copy(), {"seed": np.array(seeds)}
+
+    def step(self, actions):
+        """actions has shape (num_envs, 2): one action mask per player per match"""
+        final_observations = {}
+        scores = np.zeros(self.num_envs, dtype=np.int64)
+        for index, env in enumerate(self.envs):
+            # Each observation is built once, straight into the batch
+            observation = self.observations[index]
+            _, rewards, terminated, truncated, info = env.step(actions[index], observation)
+            self.rewards[index] = rewards
+            self.terminated[index] = terminated
+            self.truncated[index] = truncated
+            scores[index] = info["score"]
+            if terminated or truncated:
+                final_observations[index] = observation.copy()
+                env.reset(self.next_seed, observation)
+                if self.next_seed is not None:
+                    self.next_seed += 1
+        info = {"score": scores, "final_observation": final_observations}
+        return (
+            self.observations.copy(),
+            self.rewards.copy(),
+            self.terminated.copy(),
+            self.truncated.copy(),
+            info,
+        )
+
+    def close(self):
+        if self.envs:
+            self.envs[0].close()
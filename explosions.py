@@ -0,0 +1,101 @@
+import numpy as np
+import pygame as pg
+
+from assets import to_display_format
+from settings import (
+    EXPLOSION_CAPACITY,
+    EXPLOSION_DURATION,
+    EXPLOSION_FADE_FRAMES,
+    EXPLOSION_SIZE_MAX,
+    EXPLOSION_SIZE_STEP,
+    GREEN,
+    RED,
+)
+from sprites import SRCALPHA
+
+# Sizes that explosion images are drawn at, every explosion uses the nearest
+EXPLOSION_SIZES = list(range(EXPLOSION_SIZE_STEP, EXPLOSION_SIZE_MAX + 1, EXPLOSION_SIZE_STEP))
+
+# Pre-faded frames per size bucket, indexed [bucket][fade frame]
+EXPLOSION_FRAMES = []
+
+
+def explosion_frames():
+    """Return the shared explosion frames, drawing them on first use"""
+    if not EXPLOSION_FRAMES:
+        for size in EXPLOSION_SIZES:
+            # Two nested circles, as the old Explosion sprite drew them
+            base = pg.Surface((size, size), flags=SRCALPHA)
+            pg.draw.circle(base, RED, (size // 2, size // 2), size // 2)
+            pg.draw.circle(base, GREEN, (size // 2, size // 2), size // 3)
+
+            frames = []
+            for f in range(EXPLOSION_FADE_FRAMES):
+                # Bake the fade into the pixels so drawing needs no set_alpha
+                alpha = int(255 * (1 - f / EXPLOSION_FADE_FRAMES))
+                frame = base.copy()
+                frame.fill((255, 255, 255, alpha), special_flags=pg.BLEND_RGBA_MULT)
+                frames.append(to_display_format(frame))
+            EXPLOSION_FRAMES.append(frames)
+    return EXPLOSION_FRAMES
+
+
+class ExplosionSystem:
+    """Every active explosion effect, stored in arrays and drawn in one batch.
+
+    When all EXPLOSION_CAPACITY slots are busy, a new explosion replaces the
+    one closest to fading out, so big chain reactions cost a bounded amount
+    per frame instead of piling up sprites.
+    """
+
+    def __init__(self, capacity=EXPLOSION_CAPACITY):
+        self.frames = explosion_frames()
+        self.half_sizes = np.array(EXPLOSION_SIZES) / 2
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.bucket = np.zeros(capacity, dtype=np.int16)
+        self.age = np.zeros(capacity)  # Milliseconds
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.active))
+
+    def spawn(self, center, size=30):
+        """Start an explosion of roughly the given diameter at center"""
+        free = np.flatnonzero(~self.active)
+        if len(free):
+            i = free[0]
+        else:
+            # Full, recycle the oldest effect
+            i = int(np.argmax(self.age))
+
+        bucket = round(size / EXPLOSION_SIZE_STEP) - 1
+        self.bucket[i] = min(max(bucket, 0), len(EXPLOSION_SIZES) - 1)
+        self.pos[i] = (center[0], center[1])
+        self.age[i] = 0
+        self.active[i] = True
+
+    def update(self, dt):
+        self.age[self.active] += dt * 1000  # Convert to milliseconds
+        self.active &= self.age < EXPLOSION_DURATION
+
+    def visible_blits(self, view, camera):
+        """Return (image, screen position) pairs for the explosions inside view"""
+        half = self.half_sizes[self.bucket]
+        x = self.pos[:, 0]
+        y = self.pos[:, 1]
+        live = np.flatnonzero(
+            self.active
+            & (x + half > view.left)
+            & (x - half < view.right)
+            & (y + half > view.top)
+            & (y - half < view.bottom)
+        )
+        fade = (self.age[live] * EXPLOSION_FADE_FRAMES / EXPLOSION_DURATION).astype(int)
+        fade = np.minimum(fade, EXPLOSION_FADE_FRAMES - 1).tolist()
+        buckets = self.bucket[live].tolist()
+        topleft = self.pos[live] - half[live, None] - (camera.x, camera.y)
+        return [
+            (self.frames[b][f], xy)
+            for b, f, xy in zip(buckets, fade, topleft.astype(int).tolist())
+        ]
@@ -0,0 +1,112 @@
+"""Run the game without a window, as fast as the CPU allows.
+
+Players are driven by scripted input and the simulation is stepped at the
+fixed SIM_DT with no frame cap, so a run reports how many sim steps per
+second the machine sustains. Useful for soak tests and throughput numbers:
+
+    python headless.py --steps 20000 --script spin_fire
+"""
+
+import argparse
+import contextlib
+import math
+import random
+import time
+
+import log
+from display import HeadlessDisplay
+from input_sources import ScriptedInput
+from main import Game
+from settings import SIM_DT
+
+
+def idle(step):
+    """Never press anything"""
+    return {}
+
+
+def spin_fire(step):
+    """Turn in circles while thrusting and firing, covers most of the sim"""
+    return {"left": True, "up": step % 240 < 120, "fire": True}
+
+
+def random_presses(seed):
+    """Return a script holding random actions for a few steps at a time"""
+    rng = random.Random(seed)
+    held = {}
+
+    def script(step):
+        if step % 15 == 0:
+            held.clear()
+            held.update(
+                up=rng.random() < 0.6,
+                left=rng.random() < 0.3,
+                right=rng.random() < 0.3,
+                fire=rng.random() < 0.7,
+            )
+        return held
+
+    return script
+
+
+SCRIPTS = {
+    "idle": lambda player: idle,
+    "spin_fire": lambda player: spin_fire,
+    "random": lambda player: random_presses(player),
+}
+
+
+def run(steps, script="spin_fire", draw_every=0, quiet=True):
+    """Simulate steps fixed sim steps and return throughput stats.
+
+    A new match starts whenever both players die, so long runs keep going.
+    With draw_every > 0, every draw_every-th step is also rendered to the
+    off-screen surface, to include draw cost in the numbers.
+    """
+    inputs = tuple(ScriptedInput(SCRIPTS[script](player)) for player in (1, 2))
+    # Match by match log output would only clutter the throughput numbers
+    with log.quiet() if quiet else contextlib.nullcontext():
+        game = Game(inputs, display=HeadlessDisplay())
+        game.new()
+        matches = 1
+        start = time.perf_counter()
+        for step in range(steps):
+            game.dt = SIM_DT
+            game.update()
+            if draw_every and step % draw_every == 0:
+                game.draw()
+            if not game.playing:
+                game.new()
+                matches += 1
+        elapsed = time.perf_counter() - start
+
+    return {
+        "steps": steps,
+        "seconds": elapsed,
+        "steps_per_second": steps / elapsed if elapsed else math.inf,
+        "realtime_factor": steps * SIM_DT / elapsed if elapsed else math.inf,
+        "matches": matches,
+    }
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10000, help="sim steps to run")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="spin_fire")
+    parser.add_argument(
+        "--draw-every", type=int, default=0, help="also render every Nth step (0 = never)"
+    )
+    parser.add_argument("--verbose", action="store_true", help="keep the game's log output")
+    args = parser.parse_args()
+
+    stats = run(args.steps, args.script, args.draw_every, quiet=not args.verbose)
+    print(
+        f"{stats['steps']} steps in {stats['seconds']:.2f}s: "
+        f"{stats['steps_per_second']:.0f} steps/s "
+        f"({stats['realtime_factor']:.1f}x real time), {stats['matches']} matches"
+    )
+
+
+if __name__ == "__main__":
+    main()
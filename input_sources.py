@@ -0,0 +1,64 @@
+import pygame as pg
+
+# Every action a player can take, the keys of PLAYER1_CONTROLS/PLAYER2_CONTROLS
+PLAYER_ACTIONS = ("up", "down", "left", "right", "fire")
+
+
+def no_actions():
+    return dict.fromkeys(PLAYER_ACTIONS, False)
+
+
+def encode_actions(actions):
+    """Pack an action -> pressed dict into a bitmask, one bit per PLAYER_ACTIONS entry"""
+    mask = 0
+    for bit, action in enumerate(PLAYER_ACTIONS):
+        if actions.get(action):
+            mask |= 1 << bit
+    return mask
+
+
+def decode_actions(mask):
+    """Inverse of encode_actions()"""
+    return {action: bool(mask >> bit & 1) for bit, action in enumerate(PLAYER_ACTIONS)}
+
+
+class KeyboardInput:
+    """Reads a player's actions from the keyboard through a control mapping"""
+
+    def __init__(self, controls):
+        # Action -> key name as in settings, resolved to pygame key constants
+        self.controls = {action: pg.key.key_code(name) for action, name in controls.items()}
+
+    def poll(self):
+        """Return the action -> pressed dict for this sim step"""
+        keys = pg.key.get_pressed()
+        return {action: bool(keys[key]) for action, key in self.controls.items()}
+
+
+class ScriptedInput:
+    """Feeds actions from code instead of the keyboard.
+
+    With a script, poll() calls script(step) every sim step and uses the
+    returned dict (missing actions count as released). Without one, the
+    actions are whatever set() last held, so a bot or test can drive the
+    player directly.
+    """
+
+    def __init__(self, script=None):
+        self.script = script
+        self.step = 0
+        self.actions = no_actions()
+
+    def set(self, **actions):
+        """Hold or release actions, e.g. set(fire=True, left=False)"""
+        for action, pressed in actions.items():
+            if action not in self.actions:
+                raise ValueError(f"Unknown action {action!r}, expected one of {PLAYER_ACTIONS}")
+            self.actions[action] = bool(pressed)
+
+    def poll(self):
+        if self.script is not None:
+            self.actions = no_actions()
+            self.set(**self.script(self.step))
+        self.step += 1
+        return self.actions
@@ -0,0 +1,25 @@
+import numpy as np
+
+from settings import INTERPOLATION_SNAP_DISTANCE
+
+
+def lerp(prev, cur, alpha, snap=INTERPOLATION_SNAP_DISTANCE):
+    """Blend a previous and current position for drawing between two sim steps.
+
+    Moves longer than snap (screen wrapping, respawns) are not blended, the
+    current position is used as is.
+    """
+    dx = cur[0] - prev[0]
+    dy = cur[1] - prev[1]
+    if abs(dx) > snap or abs(dy) > snap:
+        return cur[0], cur[1]
+    return prev[0] + dx * alpha, prev[1] + dy * alpha
+
+
+def lerp_positions(prev, cur, alpha, snap=INTERPOLATION_SNAP_DISTANCE):
+    """lerp() for (n, 2) position arrays"""
+    delta = cur - prev
+    jumped = np.abs(delta).max(axis=1) > snap
+    delta[jumped] = 0
+    # Jumped rows keep cur, the rest are pulled back towards prev
+    return cur - delta * (1 - alpha)
@@ -0,0 +1,139 @@
+import numpy as np
+import pygame as pg
+
+from interpolation import lerp_positions
+from rotation_cache import rotation_cache
+from settings import (
+    LASER_LIFETIME,
+    LASER_POOL_CAPACITY,
+    LASER_SPEED,
+    WHITE,
+)
+from sprites import SRCALPHA
+
+vec = pg.math.Vector2
+
+
+# Unrotated laser image per color, shared by every pool so the rotation cache
+# only renders each color once
+LASER_IMAGES = {}
+
+
+def laser_image(color):
+    """Return the shared laser bolt for a color, pointing up like an unrotated ship"""
+    image = LASER_IMAGES.get(color)
+    if image is None:
+        width, height = 4, 10  # Laser dimensions
+        image = pg.Surface((width, height), flags=SRCALPHA)
+        pg.draw.rect(image, color, (0, 0, width, height))
+
+        # Add a white outline to make the laser more visible
+        pg.draw.rect(image, WHITE, (0, 0, width, height), 1)
+        LASER_IMAGES[color] = image
+    return image
+
+
+class LaserPool:
+    """Fixed-capacity store of laser projectiles, recycled instead of allocated.
+
+    Lasers are slots in parallel NumPy arrays. Firing claims a free slot (or
+    the oldest live one when the pool is full), and expiry frees slots in
+    bulk, so sustained fire never creates surfaces or touches sprite groups.
+    """
+
+    def __init__(self, game, capacity=LASER_POOL_CAPACITY):
+        self.game = game
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))  # Position before the last sim step
+        self.vel = np.zeros((capacity, 2))
+        self.spawn_time = np.zeros(capacity)  # Game clock milliseconds
+        self.angle = np.zeros(capacity, dtype=np.int16)  # Rotation cache frame index
+        self.active = np.zeros(capacity, dtype=bool)
+        self.ids = np.zeros(capacity, dtype=np.uint32)  # See Game.new_entity_id
+        self.owner = [None] * capacity  # Player that fired each slot
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def indices(self):
+        """Slot indices of the live lasers"""
+        return np.flatnonzero(self.active).tolist()
+
+    def image(self, color, bucket):
+        return rotation_cache.get_bucket(laser_image(color), bucket)
+
+    def fire(self, player, direction):
+        """Launch a laser from the nose of a player's ship"""
+        if self.free:
+            i = self.free.pop()
+        else:
+            # Pool exhausted, recycle the oldest laser
+            i = int(np.argmin(self.spawn_time))
+
+        # Offset to the front of the ship (top vertex of triangle)
+        offset = vec(0, -player.size / 2).rotate(-direction)
+        self.pos[i] = player.pos + offset
+        self.prev_pos[i] = self.pos[i]
+        # Set velocity in the same direction as the ship is pointing
+        self.vel[i] = vec(0, -LASER_SPEED).rotate(-direction)
+        self.spawn_time[i] = self.game.ticks
+        self.angle[i] = rotation_cache.bucket(direction)
+        self.active[i] = True
+        self.owner[i] = player
+        self.ids[i] = self.game.new_entity_id()
+        return i
+
+    def kill(self, i):
+        if self.active[i]:
+            self.active[i] = False
+            self.free.append(i)
+
+    def save_previous(self):
+        """Remember positions before a sim step, for interpolated drawing"""
+        self.prev_pos[:] = self.pos
+
+    def update(self, dt):
+        active = self.active
+        self.pos[active] += self.vel[active] * dt
+
+        # Retire every laser that left the screen or outlived its lifetime at once
+        x = self.pos[:, 0]
+        y = self.pos[:, 1]
+        expired = active & (
+            (x < 0)
+            | (x > self.game.width)
+            | (y < 0)
+            | (y > self.game.height)
+            | (self.game.ticks - self.spawn_time > LASER_LIFETIME)
+        )
+        if expired.any():
+            active[expired] = False
+            self.free.extend(np.flatnonzero(expired).tolist())
+
+    def rect(self, i):
+        image = self.image(self.owner[i].color, int(self.angle[i]))
+        return image.get_rect(center=(int(self.pos[i, 0]), int(self.pos[i, 1])))
+
+    def visible_blits(self, view, camera, alpha=1.0):
+        """Return (image, screen rect) pairs for the lasers inside view.
+
+        Positions are interpolated alpha of the way from the previous sim step.
+        """
+        pos = lerp_positions(self.prev_pos, self.pos, alpha)
+        x = pos[:, 0]
+        y = pos[:, 1]
+        visible = np.flatnonzero(
+            self.active
+            & (x > view.left)
+            & (x < view.right)
+            & (y > view.top)
+            & (y < view.bottom)
+        )
+        centers = (pos[visible] - (camera.x, camera.y)).astype(int).tolist()
+        blits = []
+        for i, center in zip(visible.tolist(), centers):
+            image = self.image(self.owner[i].color, int(self.angle[i]))
+            blits.append((image, image.get_rect(center=center)))
+        return blits
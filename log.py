@@ -0,0 +1,159 @@
+"""Game logging: levels, per-call-site rate limiting and a background writer.
+
+Modules get a logger with `logger = get_logger(__name__)` and log with
+printf-style arguments, `logger.debug("Player %d at %.0f, %.0f", n, x, y)`.
+Disabled levels return before anything is formatted. Debug records are
+rate limited per call site, info and above always pass. Records are put on
+a queue unformatted; a listener thread formats them and writes them to
+stderr, so the game loop never waits on the terminal.
+
+Importing this module has no side effects beyond setting the level. Entry
+points call setup_logging() to start the writer thread. Until then only
+warnings and errors are shown, through logging's last-resort handler.
+
+As formatting happens later, on another thread, pass plain values (numbers,
+strings) rather than objects the game keeps mutating, like a sprite's pos.
+
+The level comes from ASTEROID_DUEL_LOG (DEBUG, INFO, WARNING, ...) and can
+be changed at runtime with set_level().
+"""
+
+import atexit
+import contextlib
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOG_ROOT = "asteroid_duel"  # Parent of every game logger
+LOG_LEVEL = os.environ.get("ASTEROID_DUEL_LOG", "INFO").upper()
+LOG_RATE_LIMIT = 1.0  # Seconds between debug records from one call site
+LOG_FORMAT = "%(relativeCreated)8.0f %(levelname)-7s %(name)s: %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most one debug record per call site every `interval` seconds.
+
+    Info and above always pass, they are one-off events that must not be
+    lost. The next record let through from a call site reports how many
+    were dropped since the previous one.
+    """
+
+    def __init__(self, interval=LOG_RATE_LIMIT):
+        super().__init__()
+        self.interval = interval
+        self.sites = {}  # (path, line) -> [time of last record, records dropped since]
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        site = self.sites.get((record.pathname, record.lineno))
+        if site is None:
+            self.sites[(record.pathname, record.lineno)] = [record.created, 0]
+            return True
+        if record.created - site[0] < self.interval:
+            site[1] += 1
+            return False
+        record.suppressed = site[1]
+        site[0] = record.created
+        site[1] = 0
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() formats the message on the logging thread, which is
+    exactly the cost the queue is there to move off the game loop.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class GameFormatter(logging.Formatter):
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar suppressed)"
+        return text
+
+
+def start_listener():
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def restart_listener_in_child():
+    # Threads don't survive fork(), a worker process needs its own writer
+    global listener
+    if listener is not None:
+        listener = start_listener()
+
+
+def stop_listener():
+    """Write out everything still queued and stop the writer thread"""
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+def setup_logging():
+    """Send game logs through the background writer, called once by entry points.
+
+    Calling it again does nothing.
+    """
+    global listener
+    if listener is not None:
+        return
+    root.addHandler(queue_handler)
+    listener = start_listener()
+    atexit.register(stop_listener)
+
+
+def get_logger(name):
+    """Logger for a game module, e.g. get_logger(__name__)"""
+    return logging.getLogger(f"{LOG_ROOT}.{name}")
+
+
+def set_level(level):
+    """Change the level of every game logger and return the previous one.
+
+    The level is a name like "DEBUG" or a logging constant.
+    """
+    previous = root.level
+    if isinstance(level, str):
+        level = level.upper()
+    root.setLevel(level)
+    return previous
+
+
+@contextlib.contextmanager
+def quiet(level="WARNING"):
+    """Only log at level or above inside the with block"""
+    previous = set_level(level)
+    try:
+        yield
+    finally:
+        set_level(previous)
+
+
+root = logging.getLogger(LOG_ROOT)
+root.setLevel(LOG_LEVEL)
+root.propagate = False
+
+log_queue = queue.SimpleQueue()
+queue_handler = DeferredQueueHandler(log_queue)
+# Filters on the handler run on the logging thread, before the record is queued
+queue_handler.addFilter(RateLimitFilter())
+
+stream_handler = logging.StreamHandler(sys.stderr)
+stream_handler.setFormatter(GameFormatter(LOG_FORMAT))
+
+listener = None  # Started by setup_logging()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=restart_listener_in_child)
@@ -1,74 +1,144 @@
+import argparse
 import os
 import random
+import time
 
 import pygame as pg
 
+from assets import AssetManager, to_display_format
+from asteroid_atlas import AsteroidAtlas
+from asteroid_field import AsteroidField
+from background import Background
 from camera import Camera
+from collisions import run_collision_stage
+from display import default_display
+from explosions import ExplosionSystem, explosion_frames
+from input_sources import KeyboardInput, no_actions
+from laser_pool import LaserPool, laser_image
+from log import get_logger, set_level, setup_logging
+from profiler import Profiler
+from render_scaler import RenderScaler
+from renderer import WorldRenderer
+from replay import ReplayRecorder, parse_seed
+from rotation_cache import rotation_cache
 from settings import (
     ASSET_FOLDER,
     ASTEROID_COUNT,
     BLACK,
     BLUE,
+    ENEMY_COLOR,
+    ENEMY_SHIP_SIZE,
     FPS,
-    FULLSCREEN,
     GREEN,
-    HEIGHT,
+    HUD_OVERLAY_HEIGHT,
     PLAYER1_CONTROLS,
-    PLAYER1_START,
     PLAYER2_CONTROLS,
-    PLAYER2_START,
     PLAYER_RESPAWN_SAFE_DISTANCE,
+    PLAYER_SIZE,
+    PROFILER_TOGGLE_KEY,
     POWERUP_COLORS,
-    POWERUP_SPAWN_CHANCE,
     POWERUP_TYPES,
     RED,
+    SIM_DT,
+    SIM_MAX_STEPS,
     TITLE,
     WHITE,
-    WIDTH,
-    WORLD_HEIGHT,
-    WORLD_WIDTH,
     YELLOW,
+    display_values,
 )
-from sprites import Asteroid, Explosion, MotherShip, Player, PowerUp
+from spatial_hash import SpatialHash
+from sprites import MotherShip, Player, PowerUp, powerup_frames, ship_image
+from text_cache import TextCache
+
+logger = get_logger(__name__)
 
 # pylint: disable=no-member
 
 
 class Game:
-    def __init__(self):
-        # Initialize pygame and create window
-        pg.init()
-        
-        # Set up the display based on settings
-        if FULLSCREEN:
-            self.screen = pg.display.set_mode((WIDTH, HEIGHT), pg.FULLSCREEN)
-            print("Game running in fullscreen mode")
-        else:
-            self.screen = pg.display.set_mode((WIDTH, HEIGHT))
-            print(f"Game running in windowed mode: {WIDTH}x{HEIGHT}")
-            
-        pg.display.set_caption(TITLE)
+    def __init__(self, input_sources=None, size=None, display=None):
+        """Open the window and load assets.
+
+        size is the window size, by default whatever the display backend
+        picks (the desktop size, or HEADLESS_WIDTH x HEADLESS_HEIGHT for
+        the headless backend). display defaults to default_display().
+        """
+        self.display = display or default_display()
+        window_size = tuple(size or self.display.default_size())
+        sizes = display_values(window_size)
+        # Resolution the game is simulated and drawn at, and the world size
+        self.width = sizes["WIDTH"]
+        self.height = sizes["HEIGHT"]
+        self.world_width = sizes["WORLD_WIDTH"]
+        self.world_height = sizes["WORLD_HEIGHT"]
+        self.player_starts = (sizes["PLAYER1_START"], sizes["PLAYER2_START"])
+
+        # Only the pygame modules the game uses are started, which keeps
+        # startup fast (no audio or joystick setup)
+        self.window = self.display.open(window_size)
+        pg.font.init()
+
+        # Everything is drawn to screen, at the internal resolution when
+        # RENDER_SCALING is on, and scaled to the window by present()
+        self.scaler = RenderScaler(self.window, (self.width, self.height))
+        self.screen = self.scaler.surface
+
         self.clock = pg.time.Clock()
         self.running = True
         self.playing = False
-        self.dt = 0.0
+        self.dt = SIM_DT
+        # Unsimulated time carried to the next frame, and how far the frame
+        # being drawn sits between the last two sim steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+        # Every random draw and timer in a match goes through the match RNG and
+        # game clock, so a seed plus recorded input reproduces it exactly
+        self.seed = None
+        self.rng = random.Random()
+        self.ticks = 0.0  # Game clock in milliseconds, advanced by each sim step
+        self.recorder = None  # ReplayRecorder capturing each step's input
+        # Next id handed out by new_entity_id(), never reset so ids stay
+        # unique across matches on this Game
+        self.next_entity_id = 1
+
+        # Per-phase frame timings, shown with PROFILER_TOGGLE_KEY
+        self.profiler = Profiler()
+        self.profiler_toggle_key = pg.key.key_code(PROFILER_TOGGLE_KEY)
+
+        # Where each player's actions come from, kept across respawns
+        self.player_inputs = input_sources or (
+            KeyboardInput(PLAYER1_CONTROLS),
+            KeyboardInput(PLAYER2_CONTROLS),
+        )
+        # Actions polled from player_inputs at the start of the current step
+        self.player_actions = (no_actions(), no_actions())
         self.asset_folder = os.path.join(
             os.path.dirname(__file__), ASSET_FOLDER
         )  # pylint: disable=no-member
+        self.assets = AssetManager(os.path.dirname(os.path.abspath(__file__)))
 
         # Initialize sprite groups in __init__ to address pylint warnings
         self.all_sprites = None
         self.players = None
         self.asteroids = None
         self.lasers = None
-        self.lasers_p1 = None
-        self.lasers_p2 = None
         self.enemies = None
         self.motherships = None
         self.powerups = None  # New group for powerups
+        self.explosions = None
         self.player1 = None
         self.player2 = None
         self.camera = None
+        self.asteroid_atlas = None
+
+        # Camera-culled world render pass
+        self.renderer = WorldRenderer(self)
+        self.background = None
+
+        # Collision broadphase, rebuilt every frame by the collision stage
+        self.spatial_hash = SpatialHash()
+        self.collision_events = []
 
         # Game score
         self.score = 0
@@ -87,215 +157,209 @@ class Game:
         )  # Decrease spawn delay by this amount each spawn
         self.max_asteroids = 30  # Maximum number of asteroids allowed at once
 
-        # Initialize font
+        # Initialize font and the cache of rendered text
         self.font_name = pg.font.match_font("arial")
+        self.text_cache = TextCache(self.font_name)
+
+        # HUD overlay, redrawn only when the state it shows changes
+        self.hud_surface = to_display_format(
+            pg.Surface((self.width, HUD_OVERLAY_HEIGHT), pg.SRCALPHA)
+        )
+        self.hud_drawn_state = None
 
         self.load_assets()
 
     def load_assets(self):
-        # No assets to load - using primitive shapes
-        pass
+        # Image files are loaded and converted, but sprites still use primitive
+        # shapes: the ship PNGs have a baked checkerboard instead of alpha
+        self.assets.load_images()
+
+        # Procedural sprite sets come from the disk cache when settings are unchanged
+        for name, image in (
+            ("ship_p1", ship_image(GREEN, PLAYER_SIZE, WHITE)),
+            ("ship_p2", ship_image(RED, PLAYER_SIZE, WHITE)),
+            ("ship_enemy", ship_image(ENEMY_COLOR, ENEMY_SHIP_SIZE)),
+            ("laser_p1", laser_image(GREEN)),
+            ("laser_p2", laser_image(RED)),
+        ):
+            rotation_cache.prerender(image, self.assets, name)
+
+        # Draw the shared asteroid images once, before the first asteroid spawns
+        self.asteroid_atlas = AsteroidAtlas()
+        self.asteroid_atlas.prewarm(self.assets)
+
+        # Grid and starfield tiles for the background
+        self.background = Background()
+
+        # Draw the faded explosion frames up front as well
+        explosion_frames()
+
+        # Render the powerup animation strips so the first drop doesn't hitch
+        for powerup_type in POWERUP_TYPES:
+            powerup_frames(powerup_type, assets=self.assets)
+
+    def new(self, seed=None):
+        # Start a new game, from a random seed unless one is given
+        self.new_empty(seed)
 
-    def new(self):
-        # Start a new game
+        # Create asteroids
+        for _ in range(ASTEROID_COUNT):
+            self.asteroids.spawn()
+
+        # Spawn initial mothership
+        MotherShip(self)
+
+        # Nothing to interpolate from yet
+        self.renderer.save_previous()
+
+    def new_empty(self, seed=None):
+        # Start a game with only the two players in the world, as the
+        # network client does before snapshots fill it in
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.ticks = 0.0
+        self.last_asteroid_spawn = 0  # Timers restart with the game clock
+        logger.info("Match seed: %d", self.seed)
         self.score = 0
 
         # Create sprite groups
         self.all_sprites = pg.sprite.LayeredUpdates()
         self.players = pg.sprite.Group()
-        self.asteroids = pg.sprite.Group()
-        self.lasers = pg.sprite.Group()
-        self.lasers_p1 = pg.sprite.Group()
-        self.lasers_p2 = pg.sprite.Group()
+        self.asteroids = AsteroidField(self)
+        self.lasers = LaserPool(self)
         self.enemies = pg.sprite.Group()
         self.motherships = pg.sprite.Group()
         self.powerups = pg.sprite.Group()  # Initialize powerups group
+        self.explosions = ExplosionSystem()
 
         # Create player objects - use the controls from settings.py
-        self.player1 = Player(self, PLAYER1_START, PLAYER1_CONTROLS, GREEN, 1)
-        self.player2 = Player(self, PLAYER2_START, PLAYER2_CONTROLS, RED, 2)
-
-        # Create asteroids
-        for _ in range(ASTEROID_COUNT):
-            Asteroid(self)
+        self.player1 = Player(self, self.player_starts[0], PLAYER1_CONTROLS, GREEN, 1)
+        self.player2 = Player(self, self.player_starts[1], PLAYER2_CONTROLS, RED, 2)
 
         # Initialize mothership spawn timer
-        self.last_mothership_spawn = pg.time.get_ticks()
-
-        # Spawn initial mothership
-        MotherShip(self)
+        self.last_mothership_spawn = self.ticks
 
         # Create camera
-        self.camera = Camera(WORLD_WIDTH, WORLD_HEIGHT)
+        self.camera = Camera(self.world_width, self.world_height, self.width, self.height)
+
+        # Nothing to interpolate from yet
+        self.renderer.save_previous()
+        self.accumulator = 0.0
+        self.alpha = 1.0
 
         # Start the game
         self.playing = True
-        print("Game initialized with players and asteroids")
+        logger.debug("Game initialized with players")
+
+    def new_entity_id(self):
+        """Return a new id naming an asteroid, laser or sprite, used by net.py"""
+        entity_id = self.next_entity_id
+        self.next_entity_id += 1
+        return entity_id
 
     def run(self):
-        # Print debug info
-        print("Game started. Players and asteroids initialized.")
-        print(
-            f"Player 1 position: {self.player1.pos}, Player 2 position: {self.player2.pos}"
-        )
-        print(f"Number of asteroids: {len(self.asteroids)}")
+        logger.info("Game started with %d asteroids", len(self.asteroids))
 
         while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000  # Convert to seconds
-            self.events()
-            self.update()
+            frame_time = self.clock.tick(FPS) / 1000  # Convert to seconds
+            self.profiler.begin_frame()
+            with self.profiler.section("events"):
+                self.events()
+            self.advance(frame_time)
             self.draw()
+            self.profiler.end_frame()
 
-            # Add debug info
-            if pg.time.get_ticks() % 1000 < 20:  # Print every ~1 second
-                print(f"FPS: {self.clock.get_fps():.1f}")
-                print(
-                    f"Player 1 pos: {self.player1.pos}, Player 2 pos: {self.player2.pos}"
-                )
-                print(f"Camera pos: {self.camera.x:.0f}, {self.camera.y:.0f}")
-
-    def update(self):
-        # Game loop - update
-        self.all_sprites.update(self.dt)
-
-        # Check for collisions between lasers and asteroids
-        for laser in self.lasers:
-            # Check collision with asteroids
-            hits = pg.sprite.spritecollide(laser, self.asteroids, False)
-            for hit in hits:
-                laser.kill()
-                hit.kill()
-                Explosion(self, hit.pos, hit.size)
-
-                # Chance to spawn a powerup from destroyed asteroid
-                if random.random() < POWERUP_SPAWN_CHANCE["asteroid"]:
-                    # Create powerup at asteroid position with a slight offset for visibility
-                    powerup_pos = hit.pos + pg.math.Vector2(
-                        random.uniform(-10, 10), random.uniform(-10, 10)
-                    )
-                    PowerUp(self, powerup_pos)
-                    print(f"PowerUp spawned at {powerup_pos} from asteroid")
-
-                # Spawn smaller asteroids
-                if hit.size > 20:
-                    for _ in range(2):
-                        Asteroid(self, hit.pos, hit.size // 2)
-                # Increase score
-                self.score += 10
-                break
+            # Rate limited, so this shows up about once a second
+            logger.debug("FPS: %.1f", self.clock.get_fps())
+
+    def advance(self, frame_time):
+        """Run as many fixed sim steps as frame_time covers and return the count.
 
-            # Check collision with enemy ships
-            hits = pg.sprite.spritecollide(laser, self.enemies, False)
-            for hit in hits:
-                laser.kill()
-                if isinstance(hit, MotherShip):
-                    hit.take_damage(10)  # Mothership takes less damage
-                else:
-                    hit.take_damage(30)  # Regular enemy ships take full damage
+        Leftover time is carried over in the accumulator. After SIM_MAX_STEPS
+        the backlog is dropped, so a slow machine runs the game slower rather
+        than falling further behind every frame.
+        """
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= SIM_DT and self.playing:
+            if steps == SIM_MAX_STEPS:
+                self.accumulator = 0.0
                 break
+            self.dt = SIM_DT
+            with self.profiler.section("update"):
+                self.update()
+            self.accumulator -= SIM_DT
+            steps += 1
+        self.alpha = self.accumulator / SIM_DT
+        return steps
+
+    def update(self, interpolate=True):
+        # Game loop - update, one fixed sim step. Rollback passes
+        # interpolate=False for the frames it runs again, they are never drawn
+        profiler = self.profiler
+        if interpolate:
+            self.renderer.save_previous()
+
+        # Poll every input source once per step, even for dead players, so
+        # scripted and replayed input stay in step with the simulation
+        self.player_actions = tuple(source.poll() for source in self.player_inputs)
+        if self.recorder is not None:
+            self.recorder.record(self.player_actions)
+
+        self.ticks += self.dt * 1000  # Convert to milliseconds
+        self.update_sprites()
+        with profiler.section("update.asteroids"):
+            self.asteroids.update(self.dt)
+        with profiler.section("update.lasers"):
+            self.lasers.update(self.dt)
+        with profiler.section("update.explosions"):
+            self.explosions.update(self.dt)
+
+        # Resolve every collision for this frame in a single pass
+        with profiler.section("update.collisions"):
+            self.collision_events = run_collision_stage(self)
+
+        with profiler.section("update.spawning"):
+            # Spawn new asteroids over time
+            self.handle_asteroid_spawning()
+
+            # Check for mothership spawn
+            now = self.ticks
+            if now - self.last_mothership_spawn > 10000:
+                self.last_mothership_spawn = now
+                if self.rng.random() < 0.1 and len(self.motherships) < 1:
+                    MotherShip(self)
+
+        with profiler.section("update.camera"):
+            self.update_camera()
 
-            # Check collision with players (can't hit yourself)
-            # Players are now immune to each other's weapons
-            if laser in self.lasers_p1:
-                if pg.sprite.collide_rect(laser, self.player2) and self.player2.alive():
-                    laser.kill()
-                    # No damage applied - players are immune to each other
-                    print("Laser from Player 1 passed through Player 2")
-                    # self.player2.health -= 10
-                    # if self.player2.health <= 0:
-                    #     self.player2.kill()
-                    #     Explosion(self, self.player2.pos, self.player2.size)
-            elif laser in self.lasers_p2:
-                if pg.sprite.collide_rect(laser, self.player1) and self.player1.alive():
-                    laser.kill()
-                    # No damage applied - players are immune to each other
-                    print("Laser from Player 2 passed through Player 1")
-                    # self.player1.health -= 10
-                    # if self.player1.health <= 0:
-                    #     self.player1.kill()
-                    #     Explosion(self, self.player1.pos, self.player1.size)
-
-        # Check for collisions between players and asteroids
-        for player in self.players:
-            if not player.alive():
-                continue
-
-            hits = pg.sprite.spritecollide(player, self.asteroids, True)
-            for hit in hits:
-                player.health -= 20
-                Explosion(self, hit.pos, hit.size)
-                if player.health <= 0:
-                    player.kill()
-                    Explosion(self, player.pos, player.size)
-
-        # Check for collisions between players and enemy ships
-        for player in self.players:
-            if not player.alive():
-                continue
-
-            hits = pg.sprite.spritecollide(player, self.enemies, False)
-            for hit in hits:
-                if isinstance(hit, MotherShip):
-                    # Check if player has an active shield
-                    if player.active_powerups["shield"]:
-                        print(f"Player {player.player_num}'s shield protected from mothership collision!")
-                        # Shield protects from damage but is removed after mothership collision
-                        player.active_powerups["shield"] = False
-                        player.shield_health = 0
-                        # Create shield break effect
-                        for _ in range(5):
-                            Explosion(self, player.pos, random.randint(10, 20))
-                    else:
-                        # No shield, player takes damage
-                        player.health -= 30
-                    
-                    # Player collision still damages mothership
-                    hit.take_damage(50)
-                else:
-                    # For regular enemy ships
-                    if player.active_powerups["shield"]:
-                        # Shield absorbs damage from regular enemies
-                        player.shield_health -= 10
-                        print(f"Player {player.player_num}'s shield absorbed enemy collision. Shield health: {player.shield_health}")
-                        
-                        # If shield is depleted, remove it
-                        if player.shield_health <= 0:
-                            player.active_powerups["shield"] = False
-                            print(f"Player {player.player_num}'s shield depleted from enemy collision")
-                    else:
-                        # No shield, player takes damage
-                        player.health -= 10
-                    
-                    # Enemy ship destroyed on player collision
-                    hit.take_damage(100)
-
-                if player.health <= 0:
-                    player.kill()
-                    Explosion(self, player.pos, player.size)
-
-        # Check for collisions between asteroids and enemy ships
-        for enemy in self.enemies:
-            hits = pg.sprite.spritecollide(enemy, self.asteroids, True)
-            for hit in hits:
-                Explosion(self, hit.pos, hit.size)
-                if isinstance(enemy, MotherShip):
-                    enemy.take_damage(20)  # Mothership takes less damage from asteroids
-                else:
-                    enemy.take_damage(
-                        100
-                    )  # Regular enemy ships are destroyed by asteroids
-
-        # Spawn new asteroids over time
-        self.handle_asteroid_spawning()
-
-        # Check for mothership spawn
-        now = pg.time.get_ticks()
-        if now - self.last_mothership_spawn > 10000:
-            self.last_mothership_spawn = now
-            if random.random() < 0.1 and len(self.motherships) < 1:
-                MotherShip(self)
-                print("Mothership spawned")
+        # Check for game over condition
+        if self.playing and not self.player1.alive() and not self.player2.alive():
+            self.playing = False
+            logger.info("Game over - both players destroyed")
 
+    def update_sprites(self):
+        """Update every sprite, timed per sprite type while profiling"""
+        if not self.profiler.enabled:
+            self.all_sprites.update(self.dt)
+            return
+
+        # Same order as Group.update, with the time summed per type
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        totals = {}
+        for sprite in self.all_sprites.sprites():
+            before = perf_counter()
+            sprite.update(self.dt)
+            name = type(sprite).__name__
+            totals[name] = totals.get(name, 0.0) + perf_counter() - before
+
+        # Laid out back to back, the real calls are interleaved
+        for name, duration in totals.items():
+            self.profiler.add(f"update.{name}", start, duration)
+            start += duration
+
+    def update_camera(self):
         # Update camera position
         if self.player1.alive() and self.player2.alive():
             # If both players are alive, center camera between them
@@ -312,16 +376,11 @@ class Game:
                 # Convert to list to use random.choice
                 sprites = list(self.all_sprites)
                 if sprites:
-                    self.camera.update(random.choice(sprites))
-
-        # Check for game over condition
-        if not self.player1.alive() and not self.player2.alive():
-            self.playing = False
-            print("Game over - both players destroyed")
+                    self.camera.update(self.rng.choice(sprites))
 
     def handle_asteroid_spawning(self):
         """Spawn new asteroids at random intervals"""
-        now = pg.time.get_ticks()
+        now = self.ticks
 
         # Only spawn if we're below the maximum number of asteroids
         if len(self.asteroids) < 10:
@@ -331,8 +390,7 @@ class Game:
 
                 # Create a new asteroid at a random position away from players
                 self.spawn_asteroid_away_from_players()
-
-                print(f"Asteroid spawned. Current count: {len(self.asteroids)}")
+                logger.debug("Asteroid spawned. Current count: %d", len(self.asteroids))
 
     def spawn_asteroid_away_from_players(self):
         """Spawn an asteroid at a random position, but not too close to players"""
@@ -341,8 +399,8 @@ class Game:
 
         for _ in range(max_attempts):
             # Generate random position within world bounds
-            x = random.randint(0, WORLD_WIDTH)
-            y = random.randint(0, WORLD_HEIGHT)
+            x = self.rng.randint(0, self.world_width)
+            y = self.rng.randint(0, self.world_height)
             pos = pg.math.Vector2(x, y)
 
             # Check distance from players
@@ -354,68 +412,73 @@ class Game:
 
             # If position is safe, create asteroid and return
             if safe_distance:
-                size = random.randint(20, 50)
-                Asteroid(self, pos, size)
+                size = self.rng.randint(20, 50)
+                self.asteroids.spawn(pos, size)
                 return
 
         # If we couldn't find a safe position after max attempts, just spawn it randomly
-        x = random.randint(0, WORLD_WIDTH)
-        y = random.randint(0, WORLD_HEIGHT)
+        x = self.rng.randint(0, self.world_width)
+        y = self.rng.randint(0, self.world_height)
         pos = pg.math.Vector2(x, y)
-        size = random.randint(20, 50)
-        Asteroid(self, pos, size)
+        size = self.rng.randint(20, 50)
+        self.asteroids.spawn(pos, size)
 
     def mothership_destroyed(self):
         """Called when a mothership is destroyed. Respawns dead players and increases score."""
         # Increase score
         self.score += 100
 
-        print("Mothership destroyed! Checking for dead players to respawn...")
+        logger.debug("Checking for dead players to respawn")
 
         # Spawn a powerup at the mothership's position
         # Always spawn a powerup when a mothership is destroyed
         if hasattr(self, "last_mothership_pos"):
             # Make the powerup more visible by increasing its size
-            powerup_type = random.choice(POWERUP_TYPES)
+            powerup_type = self.rng.choice(POWERUP_TYPES)
             PowerUp(self, self.last_mothership_pos, powerup_type)
-            print(
-                f"PowerUp {powerup_type} spawned at mothership position {self.last_mothership_pos}"
+            logger.debug(
+                "PowerUp %s spawned at mothership position %.0f, %.0f",
+                powerup_type, self.last_mothership_pos.x, self.last_mothership_pos.y,
             )
 
-        # Find a safe spawn position away from the mothership's last position
+        # Find a safe spawn position away from the mothership's last position.
+        # The search can take dozens of tries in a crowded world, so it only
+        # runs when someone is waiting to respawn.
+        if self.player1.alive() and self.player2.alive():
+            return
         safe_spawn_pos = self.find_safe_spawn_position()
 
         # Respawn player 1 if dead
         if not self.player1.alive():
-            print("Respawning Player 1")
+            logger.info("Respawning Player 1")
             # Create a new player at the safe position with a small random offset
             spawn_pos = pg.math.Vector2(
-                safe_spawn_pos.x + random.randint(-50, 50),
-                safe_spawn_pos.y + random.randint(-50, 50),
+                safe_spawn_pos.x + self.rng.randint(-50, 50),
+                safe_spawn_pos.y + self.rng.randint(-50, 50),
             )
             self.player1 = Player(self, spawn_pos, PLAYER1_CONTROLS, GREEN, 1)
-            print("Copying powerups from Player 2 to Player 1")
+            logger.debug("Copying powerups from Player 2 to Player 1")
             self.player1.copy_powerups_from(self.player2)
 
             # Create a respawn effect
             for _ in range(3):
-                Explosion(self, spawn_pos, random.randint(20, 40))
+                self.explosions.spawn(spawn_pos, self.rng.randint(20, 40))
 
         # Respawn player 2 if dead
         if not self.player2.alive():
-            print("Respawning Player 2")
+            logger.info("Respawning Player 2")
             # Create a new player at the safe position with a small random offset
             spawn_pos = pg.math.Vector2(
-                safe_spawn_pos.x + random.randint(-50, 50),
-                safe_spawn_pos.y + random.randint(-50, 50),
+                safe_spawn_pos.x + self.rng.randint(-50, 50),
+                safe_spawn_pos.y + self.rng.randint(-50, 50),
             )
             self.player2 = Player(self, spawn_pos, PLAYER2_CONTROLS, RED, 2)
-            print("Copying powerups from Player 1 to Player 2")
+            logger.debug("Copying powerups from Player 1 to Player 2")
             self.player2.copy_powerups_from(self.player1)
 
             # Create a respawn effect
             for _ in range(3):
-                Explosion(self, spawn_pos, random.randint(20, 40))
+                self.explosions.spawn(spawn_pos, self.rng.randint(20, 40))
 
     def find_safe_spawn_position(self):
         """
@@ -437,21 +500,21 @@ class Game:
             center_y = self.player2.pos.y
         else:
             # Default to center of the world if no players alive
-            center_x = WORLD_WIDTH / 2
-            center_y = WORLD_HEIGHT / 2
+            center_x = self.world_width / 2
+            center_y = self.world_height / 2
         
         # Calculate the current viewable area boundaries
-        view_left = max(0, center_x - WIDTH / 2)
-        view_right = min(WORLD_WIDTH, center_x + WIDTH / 2)
-        view_top = max(0, center_y - HEIGHT / 2)
-        view_bottom = min(WORLD_HEIGHT, center_y + HEIGHT / 2)
+        view_left = max(0, center_x - self.width / 2)
+        view_right = min(self.world_width, center_x + self.width / 2)
+        view_top = max(0, center_y - self.height / 2)
+        view_bottom = min(self.world_height, center_y + self.height / 2)
         
         # Try to find a safe position within the viewable area
         max_attempts = 50  # Maximum number of attempts to find a safe position
         for attempt in range(max_attempts):
             # Generate a random position within the viewable area
-            x = random.uniform(view_left + 50, view_right - 50)
-            y = random.uniform(view_top + 50, view_bottom - 50)
+            x = self.rng.uniform(view_left + 50, view_right - 50)
+            y = self.rng.uniform(view_top + 50, view_bottom - 50)
             test_pos = pg.math.Vector2(x, y)
             
             # Check if this position is safe (away from motherships and enemies)
@@ -472,18 +535,22 @@ class Game:
             
             # Check distance from asteroids
             if is_safe:
-                for asteroid in self.asteroids:
-                    if test_pos.distance_to(asteroid.pos) < PLAYER_RESPAWN_SAFE_DISTANCE / 2:  # Less strict for asteroids
-                        is_safe = False
-                        break
+                # Less strict for asteroids
+                if self.asteroids.any_within(test_pos, PLAYER_RESPAWN_SAFE_DISTANCE / 2):
+                    is_safe = False
             
             # If we found a safe position, return it
             if is_safe:
-                print(f"Found safe spawn position at {test_pos} on attempt {attempt+1}")
+                logger.debug(
+                    "Found safe spawn position at %.0f, %.0f on attempt %d",
+                    test_pos.x, test_pos.y, attempt + 1,
+                )
                 return test_pos
         
         # If we couldn't find a safe position after max attempts, use the center of the viewable area
-        print(f"Could not find safe spawn position after {max_attempts} attempts, using center of view")
+        logger.warning(
+            "Could not find safe spawn position after %d attempts, using center of view", max_attempts
+        )
         return pg.math.Vector2((view_left + view_right) / 2, (view_top + view_bottom) / 2)
 
     def events(self):
@@ -493,32 +560,86 @@ class Game:
                 if self.playing:
                     self.playing = False
                 self.running = False
+            if event.type == pg.KEYDOWN and event.key == self.profiler_toggle_key:
+                self.profiler.toggle_overlay()
             # Player shooting is now handled in the Player class update
 
     def draw(self):
         # Game loop - render
-        self.screen.fill(BLACK)
+        profiler = self.profiler
+        with profiler.section("draw"):
+            # Draw between the last two sim steps, so motion stays smooth when
+            # the render rate does not match SIM_HZ
+            camera = self.renderer.interpolated_camera(self.alpha)
+
+            # The pre-rendered grid and starfield tiles cover the whole screen
+            with profiler.section("draw.background"):
+                self.background.draw(self.screen, camera)
+
+            # Draw everything on screen through the camera in one batch
+            with profiler.section("draw.world"):
+                self.renderer.draw(self.screen, camera, self.alpha)
+
+            with profiler.section("draw.hud"):
+                # The HUD overlay is only redrawn when something on it changed
+                hud_state = self.hud_state()
+                if hud_state != self.hud_drawn_state:
+                    self.hud_drawn_state = hud_state
+                    self.hud_surface.fill((0, 0, 0, 0))
+                    self.draw_hud(self.hud_surface)
+                self.screen.blit(self.hud_surface, (0, 0))
+
+                # Draw FPS
+                margin = int(self.width * 0.01)  # 1% of screen width as margin
+                self.draw_text(
+                    f"FPS: {int(self.clock.get_fps())}",
+                    20,
+                    WHITE,
+                    self.width - margin,
+                    self.height - margin,
+                    align="right",
+                )
 
-        # Draw grid for reference
-        self.draw_grid()
+            with profiler.section("draw.profiler"):
+                self.profiler.draw_overlay(self.screen, self.text_cache)
 
-        # Apply camera offset to all sprites
-        for sprite in self.all_sprites:
-            # Special handling for players to draw ghost ships when near boundaries
-            if isinstance(sprite, Player):
-                sprite.draw(self.screen)
+            with profiler.section("draw.scale"):
+                self.scaler.present()
+
+        # Update display
+        with profiler.section("display.flip"):
+            pg.display.flip()
+
+    def hud_state(self):
+        """Everything the HUD overlay shows, used to detect when it needs redrawing"""
+        state = [self.score]
+        for player in (self.player1, self.player2):
+            if player.alive():
+                powerups = player.active_powerups
+                state.append(
+                    (
+                        player.health,
+                        powerups["shotgun"],
+                        powerups["laser_stream"],
+                        powerups["shield"],
+                        player.shield_health,
+                    )
+                )
             else:
-                self.screen.blit(sprite.image, sprite.rect)
+                state.append(None)
+        return tuple(state)
 
+    def draw_hud(self, surface):
+        """Draw health bars, powerup indicators and the score onto the HUD overlay"""
         # Calculate UI positions based on screen size
-        margin = int(WIDTH * 0.01)  # 1% of screen width as margin
-        health_bar_width = int(WIDTH * 0.1)  # 10% of screen width
+        margin = int(self.width * 0.01)  # 1% of screen width as margin
+        health_bar_width = int(self.width * 0.1)  # 10% of screen width
         
         # Draw player health bars
         if self.player1.alive():
-            self.draw_health_bar(self.screen, margin, margin, self.player1.health, health_bar_width)
+            self.draw_health_bar(surface, margin, margin, self.player1.health, health_bar_width)
         if self.player2.alive():
-            self.draw_health_bar(self.screen, WIDTH - margin - health_bar_width, margin, self.player2.health, health_bar_width)
+            self.draw_health_bar(surface, self.width - margin - health_bar_width, margin, self.player2.health, health_bar_width)
 
         # Draw player powerup indicators
         if self.player1.alive():
@@ -526,11 +647,18 @@ class Game:
             y_offset = margin + 30
             powerup_x = margin + health_bar_width // 2
             if self.player1.active_powerups["shotgun"]:
-                self.draw_text("SHOTGUN", 20, POWERUP_COLORS["shotgun"], powerup_x, y_offset)
+                self.draw_text(
+                    "SHOTGUN", 20, POWERUP_COLORS["shotgun"], powerup_x, y_offset, surface=surface
+                )
                 y_offset += 25
             if self.player1.active_powerups["laser_stream"]:
                 self.draw_text(
-                    "LASER STREAM", 20, POWERUP_COLORS["laser_stream"], powerup_x, y_offset
+                    "LASER STREAM",
+                    20,
+                    POWERUP_COLORS["laser_stream"],
+                    powerup_x,
+                    y_offset,
+                    surface=surface,
                 )
                 y_offset += 25
             if self.player1.active_powerups["shield"]:
@@ -540,15 +668,22 @@ class Game:
                     POWERUP_COLORS["shield"],
                     powerup_x,
                     y_offset,
+                    surface=surface,
                 )
 
         if self.player2.alive():
             # Draw powerup indicators for player 2
             y_offset = margin + 30
-            powerup_x = WIDTH - margin - health_bar_width // 2
+            powerup_x = self.width - margin - health_bar_width // 2
             if self.player2.active_powerups["shotgun"]:
                 self.draw_text(
-                    "SHOTGUN", 20, POWERUP_COLORS["shotgun"], powerup_x, y_offset, align="right"
+                    "SHOTGUN",
+                    20,
+                    POWERUP_COLORS["shotgun"],
+                    powerup_x,
+                    y_offset,
+                    align="right",
+                    surface=surface,
                 )
                 y_offset += 25
             if self.player2.active_powerups["laser_stream"]:
@@ -558,7 +693,8 @@ class Game:
                     POWERUP_COLORS["laser_stream"],
                     powerup_x,
                     y_offset,
-                    align="right"
+                    align="right",
+                    surface=surface,
                 )
                 y_offset += 25
             if self.player2.active_powerups["shield"]:
@@ -568,43 +704,15 @@ class Game:
                     POWERUP_COLORS["shield"],
                     powerup_x,
                     y_offset,
-                    align="right"
+                    align="right",
+                    surface=surface,
                 )
 
         # Draw score
         self.draw_text(
-            f"Score: {self.score}", 30, WHITE, WIDTH // 2, margin, align="center"
-        )
-
-        # Draw FPS
-        self.draw_text(
-            f"FPS: {int(self.clock.get_fps())}",
-            20,
-            WHITE,
-            WIDTH - margin,
-            HEIGHT - margin,
-            align="right",
+            f"Score: {self.score}", 30, WHITE, self.width // 2, margin, align="center", surface=surface
         )
 
-        # Update display
-        pg.display.flip()
-
-    def draw_grid(self):
-        # Draw a grid to help visualize the world (debug)
-        grid_size = 100
-        for x in range(0, WORLD_WIDTH, grid_size):
-            x_screen = x - self.camera.camera.x
-            if 0 <= x_screen < WIDTH:
-                pg.draw.line(
-                    self.screen, (20, 20, 20), (x_screen, 0), (x_screen, HEIGHT)
-                )
-        for y in range(0, WORLD_HEIGHT, grid_size):
-            y_screen = y - self.camera.camera.y
-            if 0 <= y_screen < HEIGHT:
-                pg.draw.line(
-                    self.screen, (20, 20, 20), (0, y_screen), (WIDTH, y_screen)
-                )
-
     def draw_health_bar(self, screen, x, y, health, width):
         """Draw a health bar at the specified position"""
         BAR_HEIGHT = 10
@@ -617,10 +725,9 @@ class Game:
     def quit(self):
         pg.quit()  # pylint: disable=no-member
 
-    def draw_text(self, text, size, color, x, y, align="center"):
-        """Helper method to draw text on screen"""
-        font = pg.font.Font(self.font_name, size)
-        text_surface = font.render(text, True, color)
+    def draw_text(self, text, size, color, x, y, align="center", surface=None):
+        """Helper method to draw text on screen, or on another surface"""
+        text_surface = self.text_cache.render(text, size, color)
         text_rect = text_surface.get_rect()
         if align == "center":
             text_rect.midtop = (x, y)
@@ -628,7 +735,7 @@ class Game:
             text_rect.topleft = (x, y)
         elif align == "right":
             text_rect.topright = (x, y)
-        self.screen.blit(text_surface, text_rect)
+        (surface or self.screen).blit(text_surface, text_rect)
         return text_rect
 
     def wait_for_key(self):
@@ -649,28 +756,28 @@ class Game:
         self.screen.fill(BLACK)
 
         # Draw game title
-        self.draw_text(TITLE, 48, WHITE, WIDTH / 2, HEIGHT / 4)
+        self.draw_text(TITLE, 48, WHITE, self.width / 2, self.height / 4)
 
         # Draw instructions
         self.draw_text(
-            "Two-Player Space Shooter", 22, WHITE, WIDTH / 2, HEIGHT / 2 - 40
+            "Two-Player Space Shooter", 22, WHITE, self.width / 2, self.height / 2 - 40
         )
         self.draw_text(
-            "Player 1: WASD to move, SPACE to shoot", 22, RED, WIDTH / 2, HEIGHT / 2
+            "Player 1: WASD to move, SPACE to shoot", 22, RED, self.width / 2, self.height / 2
         )
         self.draw_text(
             "Player 2: Arrow keys to move, Right CTRL to shoot",
             22,
             BLUE,
-            WIDTH / 2,
-            HEIGHT / 2 + 30,
+            self.width / 2,
+            self.height / 2 + 30,
         )
 
         # Draw a pulsing "Press any key" message
         pulse = (pg.time.get_ticks() % 1000) / 1000  # Value between 0 and 1
         pulse_color = [int(c * (0.5 + 0.5 * pulse)) for c in YELLOW]
         self.draw_text(
-            "Press any key to begin", 22, pulse_color, WIDTH / 2, HEIGHT * 3 / 4
+            "Press any key to begin", 22, pulse_color, self.width / 2, self.height * 3 / 4
         )
 
         # Draw sample ships
@@ -679,12 +786,12 @@ class Game:
         p1_ship = pg.Surface((ship_size, ship_size), pg.SRCALPHA)
         points = [(ship_size // 2, 0), (0, ship_size), (ship_size, ship_size)]
         pg.draw.polygon(p1_ship, RED, points)
-        self.screen.blit(p1_ship, (WIDTH // 4 - ship_size // 2, HEIGHT * 3 / 5))
+        self.screen.blit(p1_ship, (self.width // 4 - ship_size // 2, self.height * 3 / 5))
 
         # Player 2 ship (blue triangle)
         p2_ship = pg.Surface((ship_size, ship_size), pg.SRCALPHA)
         pg.draw.polygon(p2_ship, BLUE, points)
-        self.screen.blit(p2_ship, (WIDTH * 3 // 4 - ship_size // 2, HEIGHT * 3 / 5))
+        self.screen.blit(p2_ship, (self.width * 3 // 4 - ship_size // 2, self.height * 3 / 5))
 
         # Draw sample asteroid
         asteroid_size = 40
@@ -703,17 +810,16 @@ class Game:
                 random.randint(crater_size, asteroid_size - crater_size),
             )
             pg.draw.circle(asteroid, (128, 128, 128), crater_pos, crater_size)
-        self.screen.blit(asteroid, (WIDTH // 2 - asteroid_size // 2, HEIGHT * 3 / 5))
+        self.screen.blit(asteroid, (self.width // 2 - asteroid_size // 2, self.height * 3 / 5))
 
         # Update the display
         pg.display.flip()
 
-        # Print debug info
-        print("Start screen displayed. Waiting for key press...")
+        logger.debug("Start screen displayed. Waiting for key press...")
 
         # Wait for a key press to start
         self.wait_for_key()
-        print("Key pressed. Starting game...")
+        logger.debug("Key pressed. Starting game...")
 
     def show_go_screen(self):
         """Game over screen"""
@@ -724,9 +830,9 @@ class Game:
         self.screen.fill(BLACK)
 
         # Draw game over text
-        self.draw_text("GAME OVER", 48, WHITE, WIDTH / 2, HEIGHT / 4)
+        self.draw_text("GAME OVER", 48, WHITE, self.width / 2, self.height / 4)
         self.draw_text(
-            "Press any key to play again", 22, WHITE, WIDTH / 2, HEIGHT * 3 / 4
+            "Press any key to play again", 22, WHITE, self.width / 2, self.height * 3 / 4
         )
 
         # Update the display
@@ -736,19 +842,52 @@ class Game:
         self.wait_for_key()
 
 
-# Create the game object
-g = Game()
-# Show the start screen
-g.show_start_screen()
-
-# Game loop
-while g.running:
-    # Start a new game
-    g.new()
-    # Run the game loop
-    g.run()
-    # Show the game over screen
-    g.show_go_screen()
-
-# Quit the game
-g.quit()
+def main():
+    setup_logging()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--seed", type=parse_seed, help="seed for the first match")
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the last match here")
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="profile from the start and export the last frames on exit (.json trace or .csv)",
+    )
+    parser.add_argument(
+        "--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"), type=str.upper,
+        help="game log verbosity (default: ASTEROID_DUEL_LOG or INFO)",
+    )
+    args = parser.parse_args()
+    if args.log_level:
+        set_level(args.log_level)
+
+    # Create the game object
+    g = Game()
+    if args.profile:
+        g.profiler.start_exporting()
+    # Show the start screen
+    g.show_start_screen()
+
+    # Game loop
+    seed = args.seed
+    while g.running:
+        # Start a new game
+        g.new(seed)
+        seed = None
+        recorder = ReplayRecorder(g) if args.record else None
+        # Run the game loop
+        g.run()
+        if recorder is not None:
+            recorder.stop().save(args.record)
+            logger.info("Replay of match %d saved to %s", g.seed, args.record)
+        # Show the game over screen
+        g.show_go_screen()
+
+    if args.profile:
+        g.profiler.export(args.profile)
+        logger.info("Profile of the last %d frames saved to %s", len(g.profiler.frames), args.profile)
+
+    # Quit the game
+    g.quit()
+
+
+if __name__ == "__main__":
+    main()
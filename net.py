@@ -0,0 +1,1000 @@
+"""Authoritative UDP multiplayer: one server runs the Game, clients draw it.
+
+The server owns the only simulation. Each client sends the actions its
+player holds as an input mask over UDP, and every NET_SNAPSHOT_EVERY sim
+steps the server sends each client a snapshot of the world. Clients never
+simulate, they draw the latest snapshot, blending from the one before it.
+
+Snapshots are delta compressed against the newest snapshot the client has
+acked. Positions and velocities are quantized to int16, an entity whose
+position the client can extrapolate from the baseline to within
+NET_POS_TOLERANCE is left out, moving entities only send their motion, and
+only entities that appeared or changed otherwise are sent in full. The
+server decodes every snapshot it sends exactly as the client will, so both
+sides always agree on the baseline. An input packet holds the whole input
+state, so losing one only delays a key change until the next.
+
+    python net.py server --port 7777
+    python net.py client 192.168.1.20 --port 7777
+    python net.py loopback --clients 2 --latency 80 --loss 0.05 --asteroids 300
+
+loopback runs a server and bot clients in one process over real 127.0.0.1
+sockets, with latency, jitter and loss simulated on every link, and checks
+every snapshot a client decodes against what the server encoded.
+"""
+
+import argparse
+import heapq
+import random
+import socket
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+import pygame as pg
+
+import log
+from batch_runner import BOTS
+from display import HeadlessDisplay, default_display
+from input_sources import KeyboardInput, ScriptedInput, decode_actions, encode_actions, no_actions
+from log import get_logger
+from main import Game
+from rotation_cache import rotation_cache
+from settings import FPS, GREEN, PLAYER1_CONTROLS, PLAYER2_CONTROLS, POWERUP_TYPES, RED, SIM_DT, SIM_HZ
+from sprites import EnemyShip, MotherShip, Player, PowerUp
+
+logger = get_logger(__name__)
+
+vec = pg.math.Vector2
+
+NET_PORT = 7777
+NET_MAGIC = b"ADNP"
+NET_VERSION = 1
+NET_SNAPSHOT_EVERY = 4  # Sim steps between snapshots (30 per second at 120 Hz)
+NET_INPUT_HZ = 60  # Input packets a client sends per second
+NET_HISTORY = 64  # Snapshots kept on both sides as possible baselines (about 2 seconds)
+NET_POS_SCALE = 2  # Position units per pixel, int16 covers worlds up to 16000 pixels
+NET_VEL_SCALE = 8  # Velocity units per pixel per second
+NET_POS_TOLERANCE = 2  # Extrapolation error, in position units, an entity is not resent for
+NET_VEL_TOLERANCE = 4  # Velocity error, in velocity units, an entity is not resent for
+NET_COMPRESS_MIN = 64  # Snapshot bodies at least this long are zlib compressed if that helps
+NET_TIMEOUT = 5.0  # Seconds without a packet before the other side is given up on
+NET_HELLO_INTERVAL = 0.5  # Seconds between connection attempts
+NET_RESTART_DELAY = 3.0  # Seconds after a game over before the server starts a new match
+NET_MAX_PACKET = 65507  # Largest UDP payload
+
+NET_LOOPBACK_SECONDS = 30  # Game time a loopback test runs for
+NET_LOOPBACK_LATENCY = 80  # One-way milliseconds added to every loopback packet
+NET_LOOPBACK_JITTER = 20  # Milliseconds of random extra delay, so packets also reorder
+NET_LOOPBACK_LOSS = 0.05  # Fraction of loopback packets dropped
+
+# Message types, the first byte of every packet
+MSG_HELLO = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_SNAPSHOT = 4
+MSG_BYE = 5
+
+HELLO = struct.Struct("<B4sH")  # Type, magic, protocol version
+WELCOME = struct.Struct("<BBHHH")  # Type, player slot (0 = server full), sim width, height, snapshot interval
+INPUT = struct.Struct("<BIIB")  # Type, input seq, newest snapshot seq received, action mask
+SNAPSHOT = struct.Struct("<BIIIiB")  # Type, seq, baseline seq (0 = none), server step, score, flags
+SECTION = struct.Struct("<HHH")  # Removed, full and motion record counts of one entity kind
+BYE = struct.Struct("<B")
+
+FLAG_PLAYING = 1
+FLAG_COMPRESSED = 2
+
+# Quantized wire records, one dtype per entity kind. Every kind starts with
+# id, pos and vel, the fields MOTION records update on their own.
+POS = ("pos", "<i2", 2)
+VEL = ("vel", "<i2", 2)
+RECORDS = {
+    "asteroids": np.dtype([("id", "<u4"), POS, VEL, ("image", "<u2"), ("size", "u1")]),
+    "lasers": np.dtype([("id", "<u4"), POS, VEL, ("angle", "<u2"), ("owner", "u1")]),
+    "enemies": np.dtype([("id", "<u4"), POS, VEL, ("angle", "<u2"), ("mothership", "u1")]),
+    "powerups": np.dtype([("id", "<u4"), POS, VEL, ("type", "u1")]),
+}
+KINDS = tuple(RECORDS)
+WRAPPED = ("asteroids",)  # Kinds extrapolated with screen wrapping, see predict()
+MOTION = np.dtype([("id", "<u4"), POS, VEL])
+# Decoded state, the records plus the step pos and vel were last sent at
+STATES = {kind: np.dtype(dtype.descr + [("since", "<u4")]) for kind, dtype in RECORDS.items()}
+# Both players are always sent whole, they change every step anyway
+PLAYER = np.dtype(
+    [("alive", "u1"), POS, VEL, ("angle", "<u2"), ("health", "<i2"), ("shield", "<i2"), ("powerups", "u1")]
+)
+PLAYER_POWERUPS = ("shotgun", "laser_stream", "shield")  # Bits of PLAYER powerups
+# Controls and color of each player slot, as Game.new() creates them
+PLAYER_LOOKS = ((PLAYER1_CONTROLS, GREEN), (PLAYER2_CONTROLS, RED))
+
+# A decoded snapshot, world maps each kind to its STATES records sorted by id
+Snapshot = namedtuple("Snapshot", ["seq", "step", "score", "playing", "players", "world"])
+
+
+def quantize_pos(pos):
+    return np.clip(np.rint(np.asarray(pos) * NET_POS_SCALE), -32768, 32767)
+
+
+def quantize_vel(vel):
+    return np.clip(np.rint(np.asarray(vel) * NET_VEL_SCALE), -32768, 32767)
+
+
+def make_records(kind, ids, pos, vel, **fields):
+    """Build a kind's records sorted by id from float positions and velocities"""
+    records = np.zeros(len(ids), dtype=RECORDS[kind])
+    records["id"] = ids
+    records["pos"] = quantize_pos(pos).reshape(-1, 2)
+    records["vel"] = quantize_vel(vel).reshape(-1, 2)
+    for name, values in fields.items():
+        records[name] = values
+    return records[np.argsort(records["id"], kind="stable")]
+
+
+def capture(game):
+    """Quantize the game's state: (players, world) as a snapshot carries them"""
+    field = game.asteroids
+    alive = np.flatnonzero(field.alive[: field.count])
+    lasers = game.lasers
+    active = np.flatnonzero(lasers.active)
+    enemies = game.enemies.sprites()
+    powerups = game.powerups.sprites()
+    world = {
+        "asteroids": make_records(
+            "asteroids",
+            field.ids[alive],
+            field.pos[alive],
+            field.vel[alive],
+            image=field.image_index[alive],
+            size=np.rint(field.radius[alive] * 2),
+        ),
+        "lasers": make_records(
+            "lasers",
+            lasers.ids[active],
+            lasers.pos[active],
+            lasers.vel[active],
+            angle=lasers.angle[active],
+            owner=[lasers.owner[i].player_num for i in active.tolist()],
+        ),
+        "enemies": make_records(
+            "enemies",
+            [enemy.id for enemy in enemies],
+            [(enemy.pos.x, enemy.pos.y) for enemy in enemies],
+            [(enemy.vel.x, enemy.vel.y) for enemy in enemies],
+            angle=[rotation_cache.bucket(getattr(enemy, "rot", 0)) for enemy in enemies],
+            mothership=[isinstance(enemy, MotherShip) for enemy in enemies],
+        ),
+        "powerups": make_records(
+            "powerups",
+            [powerup.id for powerup in powerups],
+            [(powerup.pos.x, powerup.pos.y) for powerup in powerups],
+            [(powerup.vel.x, powerup.vel.y) for powerup in powerups],
+            type=[POWERUP_TYPES.index(powerup.type) for powerup in powerups],
+        ),
+    }
+
+    players = np.zeros(2, dtype=PLAYER)
+    for index, player in enumerate((game.player1, game.player2)):
+        players[index] = (
+            player.alive(),
+            quantize_pos((player.pos.x, player.pos.y)),
+            quantize_vel((player.vel.x, player.vel.y)),
+            rotation_cache.bucket(player.rot),
+            player.health,
+            player.shield_health,
+            sum(1 << bit for bit, name in enumerate(PLAYER_POWERUPS) if player.active_powerups[name]),
+        )
+    return players, world
+
+
+def predict(state, step, bounds=None):
+    """Positions the client extrapolates for a decoded state at a later step.
+
+    Each entity moves on from where it was last sent with the velocity sent
+    along, so rounding never builds up. With bounds, the screen size in
+    pixels, positions wrap a full diameter past each edge as
+    AsteroidField.update() wraps asteroids.
+    """
+    elapsed = (step - state["since"].astype(np.int64))[:, None]
+    pos = state["pos"] + np.rint(state["vel"] * elapsed * (SIM_DT * NET_POS_SCALE / NET_VEL_SCALE))
+    if bounds is not None:
+        size = state["size"][:, None].astype(np.int64) * NET_POS_SCALE
+        limit = np.array(bounds) * NET_POS_SCALE
+        outside = (pos < -size) | (pos > limit + size)
+        pos = np.where(outside, (pos + size) % (limit + 2 * size) - size, pos)
+    return np.clip(pos, -32768, 32767)
+
+
+def diff(current, baseline, step, bounds=None):
+    """Return (removed ids, full records, motion records) taking a decoded state to current"""
+    removed = np.setdiff1d(baseline["id"], current["id"], assume_unique=True).astype("<u4")
+    _, cur_index, base_index = np.intersect1d(
+        current["id"], baseline["id"], assume_unique=True, return_indices=True
+    )
+    cur = current[cur_index]
+    base = baseline[base_index]
+
+    # Anything besides motion changing (an asteroid image, a laser owner...)
+    # resends the whole record, as does being new
+    changed = np.zeros(len(cur), dtype=bool)
+    for name in current.dtype.names[3:]:
+        changed |= cur[name] != base[name]
+    full = np.ones(len(current), dtype=bool)
+    full[cur_index[~changed]] = False
+
+    # The rest only go out when the client's extrapolation has drifted too far
+    pos_error = np.abs(cur["pos"] - predict(base, step, bounds)).max(axis=1, initial=0)
+    vel_error = np.abs(cur["vel"].astype(np.int32) - base["vel"]).max(axis=1, initial=0)
+    moved = cur[~changed & ((pos_error > NET_POS_TOLERANCE) | (vel_error > NET_VEL_TOLERANCE))]
+    motion = np.zeros(len(moved), dtype=MOTION)
+    for name in MOTION.names:
+        motion[name] = moved[name]
+    return removed, current[full], motion
+
+
+def patch(baseline, step, removed, full, motion):
+    """Apply diff() output to a decoded state, returning the new state"""
+    kept = ~np.isin(baseline["id"], removed) & ~np.isin(baseline["id"], full["id"])
+    state = baseline[kept]
+    index = np.searchsorted(state["id"], motion["id"])
+    state["pos"][index] = motion["pos"]
+    state["vel"][index] = motion["vel"]
+    state["since"][index] = step
+    added = np.zeros(len(full), dtype=state.dtype)
+    for name in full.dtype.names:
+        added[name] = full[name]
+    added["since"] = step
+    state = np.concatenate((state, added))
+    return state[np.argsort(state["id"], kind="stable")]
+
+
+def empty_world():
+    return {kind: np.zeros(0, dtype=dtype) for kind, dtype in STATES.items()}
+
+
+def encode_snapshot(seq, step, score, playing, players, world, bounds, baseline=None):
+    """Return (packet, world as the client will decode it).
+
+    bounds is the game's screen size, baseline is (seq, world) of a
+    snapshot the client has decoded, None sends every entity in full.
+    """
+    base_seq, base_world = baseline or (0, empty_world())
+    body = [players.tobytes()]
+    decoded = {}
+    for kind in KINDS:
+        wrap = bounds if kind in WRAPPED else None
+        removed, full, motion = diff(world[kind], base_world[kind], step, wrap)
+        body += [
+            SECTION.pack(len(removed), len(full), len(motion)),
+            removed.tobytes(),
+            full.tobytes(),
+            motion.tobytes(),
+        ]
+        decoded[kind] = patch(base_world[kind], step, removed, full, motion)
+    body = b"".join(body)
+
+    flags = FLAG_PLAYING if playing else 0
+    if len(body) >= NET_COMPRESS_MIN:
+        packed = zlib.compress(body, 1)
+        if len(packed) < len(body):
+            body = packed
+            flags |= FLAG_COMPRESSED
+    packet = SNAPSHOT.pack(MSG_SNAPSHOT, seq, base_seq, step, score, flags) + body
+    return packet, decoded
+
+
+def decode_snapshot(packet, baselines):
+    """Decode a snapshot packet, None when its baseline is not in baselines.
+
+    baselines maps seq -> world of snapshots decoded earlier.
+    """
+    _, seq, base_seq, step, score, flags = SNAPSHOT.unpack_from(packet)
+    if base_seq:
+        if base_seq not in baselines:
+            return None
+        base_world = baselines[base_seq]
+    else:
+        base_world = empty_world()
+    body = packet[SNAPSHOT.size :]
+    if flags & FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+
+    players = np.frombuffer(body, dtype=PLAYER, count=2)
+    offset = players.nbytes
+    world = {}
+    for kind, dtype in RECORDS.items():
+        removed_count, full_count, motion_count = SECTION.unpack_from(body, offset)
+        offset += SECTION.size
+        removed = np.frombuffer(body, dtype="<u4", count=removed_count, offset=offset)
+        offset += removed.nbytes
+        full = np.frombuffer(body, dtype=dtype, count=full_count, offset=offset)
+        offset += full.nbytes
+        motion = np.frombuffer(body, dtype=MOTION, count=motion_count, offset=offset)
+        offset += motion.nbytes
+        world[kind] = patch(base_world[kind], step, removed, full, motion)
+    return Snapshot(seq, step, score, bool(flags & FLAG_PLAYING), players, world)
+
+
+def open_socket(host="0.0.0.0", port=0):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.setblocking(False)
+    return sock
+
+
+def receive_all(sock):
+    """Every datagram waiting on a non-blocking socket, as (data, address) pairs"""
+    packets = []
+    while True:
+        try:
+            packets.append(sock.recvfrom(NET_MAX_PACKET))
+        except (BlockingIOError, ConnectionResetError):
+            # Windows reports an earlier send to a closed port as a reset
+            return packets
+
+
+class DirectLink:
+    """Sends straight to the socket"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.bytes_sent = 0
+        self.packets_sent = 0
+
+    def send(self, data, address):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        self.sock.sendto(data, address)
+
+    def flush(self):
+        pass
+
+
+class LossyLink(DirectLink):
+    """Sends through the socket after a simulated delay, dropping some packets.
+
+    Each packet is held for latency plus up to jitter seconds, so packets
+    also arrive out of order, and a loss fraction of them is never sent.
+    flush() sends whatever is due and has to be called regularly. clock
+    returns the current time in seconds.
+    """
+
+    def __init__(self, sock, latency=0.0, jitter=0.0, loss=0.0, seed=None, clock=time.perf_counter):
+        super().__init__(sock)
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.pending = []  # Heap of (due time, order, data, address)
+        self.order = 0
+        self.dropped = 0
+
+    def send(self, data, address):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        due = self.clock() + self.latency + self.rng.uniform(0, self.jitter)
+        heapq.heappush(self.pending, (due, self.order, data, address))
+        self.order += 1
+
+    def flush(self):
+        now = self.clock()
+        while self.pending and self.pending[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.pending)
+            self.sock.sendto(data, address)
+
+
+class RemoteClient:
+    """What the server knows about one connected client"""
+
+    def __init__(self, address, slot, now):
+        self.address = address
+        self.slot = slot  # Player number, 1 or 2
+        self.last_heard = now
+        self.input_seq = 0  # Newest input applied, older ones arriving late are ignored
+        self.acked = 0  # Newest snapshot seq the client has decoded
+        self.history = {}  # Snapshot seq -> world as the client decodes it
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+
+
+class NetServer:
+    """Runs a Game and serves it to up to two clients, one per player.
+
+    Call poll() and step() yourself (loopback does), or serve() to do it in
+    real time. A player without a client simply holds no actions.
+    """
+
+    def __init__(self, game, sock, link=None, snapshot_every=NET_SNAPSHOT_EVERY, clock=time.perf_counter):
+        self.game = game
+        self.sock = sock
+        self.link = link or DirectLink(sock)
+        self.snapshot_every = snapshot_every
+        self.clock = clock
+        self.inputs = (ScriptedInput(), ScriptedInput())
+        game.player_inputs = self.inputs
+        self.clients = {}  # Address -> RemoteClient
+        # Sim steps run since the server started, never reset between matches.
+        # Snapshots are stamped with it, so nothing is extrapolated while the
+        # game is over and the world stands still
+        self.steps = 0
+        self.ticks = 0  # Server steps, including those of game over pauses
+        self.seq = 0
+        self.game_over_steps = 0
+
+    @property
+    def bounds(self):
+        return (self.game.width, self.game.height)
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def poll(self):
+        """Handle every packet that arrived, and drop clients that went quiet"""
+        now = self.clock()
+        self.link.flush()
+        for data, address in receive_all(self.sock):
+            kind = data[0] if data else None
+            client = self.clients.get(address)
+            if kind == MSG_HELLO and len(data) == HELLO.size:
+                self.handle_hello(data, address, now)
+            elif client is None:
+                continue
+            elif kind == MSG_INPUT and len(data) == INPUT.size:
+                _, input_seq, ack, mask = INPUT.unpack(data)
+                client.last_heard = now
+                client.acked = max(client.acked, ack)
+                if input_seq > client.input_seq:
+                    client.input_seq = input_seq
+                    self.inputs[client.slot - 1].set(**decode_actions(mask))
+            elif kind == MSG_BYE:
+                self.disconnect(client, "left")
+
+        for client in list(self.clients.values()):
+            if now - client.last_heard > NET_TIMEOUT:
+                self.disconnect(client, "timed out")
+
+    def handle_hello(self, data, address, now):
+        _, magic, version = HELLO.unpack(data)
+        if magic != NET_MAGIC or version != NET_VERSION:
+            logger.warning("Ignoring hello from %s:%d with protocol version %d", *address, version)
+            return
+        client = self.clients.get(address)
+        if client is None:
+            taken = {other.slot for other in self.clients.values()}
+            free = [slot for slot in (1, 2) if slot not in taken]
+            if not free:
+                self.link.send(WELCOME.pack(MSG_WELCOME, 0, 0, 0, 0), address)
+                return
+            client = self.clients[address] = RemoteClient(address, free[0], now)
+            logger.info("Client %s:%d joined as player %d", *address, client.slot)
+        # Hellos are repeated until a welcome gets through, answer each one
+        game = self.game
+        self.link.send(
+            WELCOME.pack(MSG_WELCOME, client.slot, game.width, game.height, self.snapshot_every),
+            address,
+        )
+
+    def disconnect(self, client, reason):
+        logger.info("Client %s:%d (player %d) %s", *client.address, client.slot, reason)
+        del self.clients[client.address]
+        self.inputs[client.slot - 1].set(**no_actions())
+
+    def step(self):
+        """Run one sim step, sending snapshots when one is due"""
+        game = self.game
+        if game.playing:
+            game.dt = SIM_DT
+            game.update()
+            self.steps += 1
+        else:
+            # Start over once everyone had a moment to see the game over
+            self.game_over_steps += 1
+            if self.game_over_steps >= NET_RESTART_DELAY * SIM_HZ:
+                self.game_over_steps = 0
+                game.new()
+        self.ticks += 1
+        if self.ticks % self.snapshot_every == 0:
+            self.send_snapshots()
+
+    def send_snapshots(self):
+        game = self.game
+        self.seq += 1
+        players, world = capture(game)
+        for client in self.clients.values():
+            history = client.history
+            baseline = None
+            if client.acked in history:
+                baseline = (client.acked, history[client.acked])
+            packet, decoded = encode_snapshot(
+                self.seq, self.steps, game.score, game.playing, players, world, self.bounds, baseline
+            )
+            if len(packet) > NET_MAX_PACKET:
+                logger.warning("Snapshot of %d bytes does not fit a datagram", len(packet))
+                continue
+            self.link.send(packet, client.address)
+            client.bytes_sent += len(packet)
+            client.snapshots_sent += 1
+
+            # Baselines older than the acked one will never be used again
+            history[self.seq] = decoded
+            for seq in list(history):
+                if seq < client.acked or seq <= self.seq - NET_HISTORY:
+                    del history[seq]
+
+    def serve(self):
+        """Step the game in real time until interrupted"""
+        logger.info("Serving on %s:%d", *self.address)
+        next_step = self.clock()
+        try:
+            while True:
+                self.poll()
+                now = self.clock()
+                if now >= next_step:
+                    self.step()
+                    next_step += SIM_DT
+                    # Fell far behind, skip ahead rather than run a burst of steps
+                    if now - next_step > SIM_DT * 8:
+                        next_step = now
+                else:
+                    time.sleep(min(next_step - now, 0.002))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for client in self.clients.values():
+                self.link.send(BYE.pack(MSG_BYE), client.address)
+            self.link.flush()
+
+
+class NetClient:
+    """Plays on a NetServer: sends local input and draws the server's snapshots.
+
+    The client's Game is only a mirror that is never updated, its entities
+    are rewritten from each snapshot. It is created once the server's
+    welcome says what size the simulation has.
+    """
+
+    def __init__(self, sock, server, bot=None, display=None, link=None, clock=time.perf_counter):
+        self.sock = sock
+        self.server = server  # (host, port)
+        # A bot (one of batch_runner.BOTS) plays from the mirror game once connected
+        self.bot = bot
+        self.input_source = KeyboardInput(PLAYER1_CONTROLS) if bot is None else None
+        self.display = display
+        self.link = link or DirectLink(sock)
+        self.clock = clock
+        self.game = None
+        self.slot = 0
+        self.snapshot_interval = NET_SNAPSHOT_EVERY * SIM_DT
+        self.last_hello = None
+        self.last_input = None
+        self.input_seq = 0
+        self.baselines = {}  # Snapshot seq -> world, for decoding deltas
+        self.latest = None  # Newest Snapshot applied
+        self.last_heard = clock()
+        self.arrival = clock()  # When latest was applied
+        self.sprites = {"enemies": {}, "powerups": {}}  # Server entity id -> mirror sprite
+        self.snapshots_received = 0
+        self.undecodable = 0
+        self.malformed = 0  # Snapshots dropped as truncated or corrupt
+        self.bytes_received = 0
+
+    def connected(self):
+        return self.game is not None
+
+    def update(self):
+        """Exchange packets: say hello until welcomed, then send input and apply snapshots"""
+        now = self.clock()
+        self.link.flush()
+        if not self.connected():
+            if self.last_hello is None or now - self.last_hello >= NET_HELLO_INTERVAL:
+                self.last_hello = now
+                self.link.send(HELLO.pack(MSG_HELLO, NET_MAGIC, NET_VERSION), self.server)
+
+        for data, address in receive_all(self.sock):
+            if address != self.server or not data:
+                continue
+            self.last_heard = now
+            self.bytes_received += len(data)
+            if data[0] == MSG_WELCOME and len(data) == WELCOME.size and not self.connected():
+                self.welcome(data)
+            elif data[0] == MSG_SNAPSHOT and self.connected():
+                self.receive_snapshot(data, now)
+            elif data[0] == MSG_BYE and self.connected():
+                logger.info("Server closed the connection")
+                self.game.running = False
+
+        if self.connected() and (self.last_input is None or now - self.last_input >= 1 / NET_INPUT_HZ):
+            self.last_input = now
+            self.input_seq += 1
+            ack = self.latest.seq if self.latest else 0
+            mask = encode_actions(self.input_source.poll())
+            self.link.send(INPUT.pack(MSG_INPUT, self.input_seq, ack, mask), self.server)
+        if now - self.last_heard > NET_TIMEOUT and self.connected():
+            logger.warning("No packets from the server for %.0f seconds", now - self.last_heard)
+            self.last_heard = now
+
+    def welcome(self, data):
+        _, slot, width, height, snapshot_every = WELCOME.unpack(data)
+        if not slot:
+            raise ConnectionRefusedError("the server already has two players")
+        self.slot = slot
+        self.snapshot_interval = snapshot_every * SIM_DT
+        logger.info("Joined as player %d of a %dx%d game", slot, width, height)
+
+        # Same size as the server, so both share one world and screen edges
+        game = self.game = Game((ScriptedInput(), ScriptedInput()), size=(width, height), display=self.display)
+        # Everything but the players comes from snapshots
+        game.new_empty()
+        if self.bot is not None:
+            self.input_source = ScriptedInput(BOTS[self.bot](game, slot - 1, 0))
+
+    def receive_snapshot(self, data, now):
+        try:
+            snapshot = decode_snapshot(data, self.baselines)
+        except (struct.error, zlib.error, ValueError, IndexError) as error:
+            # Truncated or corrupt, dropped like a lost packet
+            logger.debug("Dropped a malformed snapshot: %s", error)
+            self.malformed += 1
+            return
+        if snapshot is None:
+            # Its baseline was dropped already, a newer snapshot will follow
+            self.undecodable += 1
+            return
+        self.snapshots_received += 1
+        if self.latest is not None and snapshot.seq <= self.latest.seq:
+            return
+        self.baselines[snapshot.seq] = snapshot.world
+        for seq in list(self.baselines):
+            if seq <= snapshot.seq - NET_HISTORY:
+                del self.baselines[seq]
+        self.apply(snapshot)
+        self.latest = snapshot
+        self.arrival = now
+
+    def apply(self, snapshot):
+        """Rewrite the mirror game from a snapshot"""
+        game = self.game
+        game.renderer.save_previous()
+        game.ticks = snapshot.step * SIM_DT * 1000
+        game.score = snapshot.score
+        # Entities left out of the snapshot are where the client extrapolates them
+        bounds = (game.width, game.height)
+        world = snapshot.world
+        pos = {
+            kind: predict(world[kind], snapshot.step, bounds if kind in WRAPPED else None) / NET_POS_SCALE
+            for kind in KINDS
+        }
+        self.apply_players(snapshot.players)
+        self.apply_asteroids(world["asteroids"], pos["asteroids"])
+        self.apply_lasers(world["lasers"], pos["lasers"])
+        self.apply_sprites(
+            "enemies", world["enemies"], pos["enemies"], self.make_enemy, self.move_enemy, explode=True
+        )
+        self.apply_sprites("powerups", world["powerups"], pos["powerups"], self.make_powerup, self.move_sprite)
+        game.update_camera()
+
+    def apply_players(self, records):
+        game = self.game
+        for index, record in enumerate(records):
+            player = game.player1 if index == 0 else game.player2
+            pos = vec((record["pos"] / NET_POS_SCALE).tolist())
+            if not record["alive"]:
+                if player.alive():
+                    player.kill()
+                    game.explosions.spawn(player.pos, player.size * 2)
+                continue
+            if not player.alive():
+                controls, color = PLAYER_LOOKS[index]
+                player = Player(game, pos, controls, color, index + 1)
+                if index == 0:
+                    game.player1 = player
+                else:
+                    game.player2 = player
+
+            player.pos.update(pos)
+            player.true_pos = vec(player.pos)
+            player.vel.update(*(record["vel"] / NET_VEL_SCALE))
+            bucket = int(record["angle"])
+            player.rot = bucket * 360 / rotation_cache.steps
+            player.image = rotation_cache.get_bucket(player.original_image, bucket)
+            player.rect = player.image.get_rect(center=player.pos)
+            player.update_ghost()
+            player.health = int(record["health"])
+            player.shield_health = int(record["shield"])
+            for bit, name in enumerate(PLAYER_POWERUPS):
+                player.active_powerups[name] = bool(record["powerups"] >> bit & 1)
+
+    def apply_asteroids(self, records, pos):
+        field = self.game.asteroids
+        old_ids = field.ids[: field.count].copy()
+        old_pos = field.pos[: field.count].copy()
+
+        # Destroyed asteroids leave the same explosion as on the server
+        gone = ~np.isin(old_ids, records["id"])
+        for pos, radius in zip(old_pos[gone].tolist(), field.radius[: field.count][gone].tolist()):
+            self.game.explosions.spawn(vec(pos), int(radius))
+
+        n = len(records)
+        while len(field.pos) < n:
+            field.grow()
+        field.count = n
+        field.ids[:n] = records["id"]
+        field.pos[:n] = pos
+        field.vel[:n] = records["vel"] / NET_VEL_SCALE
+        field.radius[:n] = records["size"] / 2
+        field.image_index[:n] = records["image"]
+        field.alive[:n] = True
+        carry_previous(field.prev_pos[:n], field.pos[:n], records["id"], old_ids, old_pos)
+
+    def apply_lasers(self, records, pos):
+        game = self.game
+        pool = game.lasers
+        active = np.flatnonzero(pool.active)
+        old_ids = pool.ids[active]
+        old_pos = pool.pos[active]
+
+        records = records[: pool.capacity]
+        n = len(records)
+        pool.active[:] = False
+        pool.active[:n] = True
+        pool.free = list(range(pool.capacity - 1, n - 1, -1))
+        pool.ids[:n] = records["id"]
+        pool.pos[:n] = pos[:n]
+        pool.vel[:n] = records["vel"] / NET_VEL_SCALE
+        pool.angle[:n] = records["angle"]
+        players = (game.player1, game.player2)
+        pool.owner[:n] = [players[owner - 1] for owner in records["owner"].tolist()]
+        carry_previous(pool.prev_pos[:n], pool.pos[:n], records["id"], old_ids, old_pos)
+
+    def apply_sprites(self, kind, records, positions, make, move, explode=False):
+        """Create, move and remove the mirror sprites of one kind to match records"""
+        sprites = self.sprites[kind]
+        ids = records["id"].tolist()
+        for entity_id, record, pos in zip(ids, records, positions.tolist()):
+            pos = vec(pos)
+            sprite = sprites.get(entity_id)
+            if sprite is None:
+                sprite = sprites[entity_id] = make(record, pos)
+                sprite.id = entity_id
+            move(sprite, record, pos)
+
+        for entity_id in sprites.keys() - set(ids):
+            sprite = sprites.pop(entity_id)
+            if explode:
+                size = sprite.size * 2 if isinstance(sprite, MotherShip) else sprite.size
+                self.game.explosions.spawn(sprite.pos, size)
+            sprite.kill()
+
+    def make_enemy(self, record, pos):
+        if record["mothership"]:
+            return MotherShip(self.game, pos)
+        return EnemyShip(self.game, pos)
+
+    def make_powerup(self, record, pos):
+        return PowerUp(self.game, pos, POWERUP_TYPES[record["type"]])
+
+    def move_sprite(self, sprite, record, pos):
+        sprite.pos.update(pos)
+        sprite.vel.update(*(record["vel"] / NET_VEL_SCALE))
+        sprite.rect.center = sprite.pos
+
+    def move_enemy(self, sprite, record, pos):
+        if isinstance(sprite, EnemyShip):
+            bucket = int(record["angle"])
+            sprite.rot = bucket * 360 / rotation_cache.steps
+            sprite.image = rotation_cache.get_bucket(sprite.original_image, bucket)
+            sprite.rect = sprite.image.get_rect()
+        self.move_sprite(sprite, record, pos)
+
+    def animate(self, frame_time):
+        """Advance what the client shows between snapshots, return how far to blend"""
+        game = self.game
+        game.explosions.update(frame_time)
+        for powerup in game.powerups:
+            powerup.animate()
+        # Snapshots are drawn one interval late, blending from the one before
+        game.alpha = min(1.0, (self.clock() - self.arrival) / self.snapshot_interval)
+        return game.alpha
+
+    def run(self):
+        """Connect, then play in a window until it is closed"""
+        while not self.connected():
+            self.update()
+            if self.clock() - self.arrival > NET_TIMEOUT:
+                raise ConnectionError(f"no answer from {self.server[0]}:{self.server[1]}")
+            time.sleep(0.01)
+        game = self.game
+        while game.running:
+            frame_time = game.clock.tick(FPS) / 1000
+            game.events()
+            self.update()
+            self.animate(frame_time)
+            game.draw()
+        self.link.send(BYE.pack(MSG_BYE), self.server)
+        self.link.flush()
+        game.quit()
+
+
+def carry_previous(prev_pos, pos, ids, old_ids, old_pos):
+    """Fill prev_pos for entities sorted by ids from where they were before.
+
+    Entities that just appeared start at their current position.
+    """
+    prev_pos[:] = pos
+    _, new_index, old_index = np.intersect1d(ids, old_ids, assume_unique=True, return_indices=True)
+    prev_pos[new_index] = old_pos[old_index]
+
+
+class VirtualClock:
+    """A clock loopback tests advance by hand, so they run faster than real time"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def run_loopback(clients=2, seconds=NET_LOOPBACK_SECONDS, latency=NET_LOOPBACK_LATENCY,
+                 jitter=NET_LOOPBACK_JITTER, loss=NET_LOOPBACK_LOSS, asteroids=0, bots=("aim", "aim"),
+                 seed=0, draw=False):
+    """Play a match between a server and bot clients over 127.0.0.1 and report on it.
+
+    latency and jitter are in milliseconds and apply to both directions.
+    Time is simulated, so the test runs as fast as the machine allows.
+    Returns a dict of statistics.
+    """
+    clock = VirtualClock()
+
+    def link(sock, index):
+        return LossyLink(sock, latency / 1000, jitter / 1000, loss, seed=seed * 10 + index, clock=clock)
+
+    game = Game(display=HeadlessDisplay())
+    game.new(seed)
+    # Extra asteroids to load the snapshots, spawned where the game spawns its own
+    for _ in range(asteroids):
+        game.spawn_asteroid_away_from_players()
+    server_sock = open_socket("127.0.0.1")
+    server = NetServer(game, server_sock, link(server_sock, 0), clock=clock)
+
+    net_clients = []
+    for index in range(clients):
+        sock = open_socket("127.0.0.1")
+        net_clients.append(
+            NetClient(sock, server.address, bots[index], HeadlessDisplay(), link(sock, index + 1), clock)
+        )
+
+    # Catch every snapshot a client decodes, to check it against the server
+    mismatches = 0
+    checked = 0
+    remote = {}
+    step_seconds = []
+    for _ in range(int(seconds * SIM_HZ)):
+        clock.advance(SIM_DT)
+        start = time.perf_counter()
+        server.poll()
+        server.step()
+        step_seconds.append(time.perf_counter() - start)
+
+        for client in net_clients:
+            before = client.latest
+            client.update()
+            if client.latest is not before:
+                if client.slot not in remote:
+                    remote[client.slot] = next(
+                        other for other in server.clients.values() if other.slot == client.slot
+                    )
+                history = remote[client.slot].history
+                if client.latest.seq in history:
+                    checked += 1
+                    expected = history[client.latest.seq]
+                    if any(
+                        not np.array_equal(expected[kind], client.latest.world[kind]) for kind in KINDS
+                    ):
+                        mismatches += 1
+            if client.connected():
+                client.animate(SIM_DT)
+                if draw:
+                    client.game.draw()
+
+    entities = sum(len(records) for records in capture(game)[1].values())
+    full_packet, _ = encode_snapshot(
+        1, server.steps, game.score, game.playing, *capture(game), server.bounds
+    )
+    results = {
+        "entities": entities,
+        "full_snapshot_bytes": len(full_packet),
+        "checked": checked,
+        "mismatches": mismatches,
+        "server_step_ms": 1000 * float(np.mean(step_seconds)),
+        "clients": [],
+    }
+    for client in net_clients:
+        info = remote.get(client.slot)
+        sent = info.snapshots_sent if info else 0
+        results["clients"].append(
+            {
+                "slot": client.slot,
+                "snapshots_sent": sent,
+                "snapshots_applied": client.snapshots_received,
+                "undecodable": client.undecodable,
+                "mean_snapshot_bytes": info.bytes_sent / sent if sent else 0,
+                "down_kbps": 8 * client.bytes_received / seconds / 1000,
+                "up_kbps": 8 * client.link.bytes_sent / seconds / 1000,
+            }
+        )
+    game.quit()
+    return results
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return (host, int(port)) if host else (text, NET_PORT)
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log-level", help="DEBUG, INFO, WARNING or ERROR")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("server", help="run an authoritative headless server")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=NET_PORT)
+    serve.add_argument("--seed", type=int)
+
+    join = commands.add_parser("client", help="join a server and play with PLAYER1_CONTROLS")
+    join.add_argument("server", help="host or host:port")
+    join.add_argument("--bot", choices=sorted(BOTS), help="let a bot play instead of the keyboard")
+
+    loop = commands.add_parser("loopback", help="test a server and bot clients over 127.0.0.1")
+    loop.add_argument("--clients", type=int, choices=(1, 2), default=2)
+    loop.add_argument("--seconds", type=float, default=NET_LOOPBACK_SECONDS)
+    loop.add_argument("--latency", type=float, default=NET_LOOPBACK_LATENCY, help="one-way milliseconds")
+    loop.add_argument("--jitter", type=float, default=NET_LOOPBACK_JITTER, help="milliseconds")
+    loop.add_argument("--loss", type=float, default=NET_LOOPBACK_LOSS, help="fraction of packets dropped")
+    loop.add_argument("--asteroids", type=int, default=0, help="extra asteroids to load the snapshots")
+    loop.add_argument("--seed", type=int, default=0)
+    loop.add_argument("--draw", action="store_true", help="also render every client frame")
+    args = parser.parse_args()
+    if args.log_level:
+        log.set_level(args.log_level.upper())
+
+    if args.command == "server":
+        game = Game(display=HeadlessDisplay())
+        game.new(args.seed)
+        NetServer(game, open_socket(args.host, args.port)).serve()
+    elif args.command == "client":
+        NetClient(open_socket(), parse_address(args.server), args.bot, default_display()).run()
+    else:
+        with log.quiet():
+            results = run_loopback(
+                args.clients, args.seconds, args.latency, args.jitter, args.loss,
+                args.asteroids, seed=args.seed, draw=args.draw,
+            )
+        print(
+            f"{results['entities']} entities at the end, full snapshot {results['full_snapshot_bytes']} bytes, "
+            f"server step {results['server_step_ms']:.2f} ms"
+        )
+        for client in results["clients"]:
+            print(
+                f"player {client['slot']}: {client['snapshots_applied']}/{client['snapshots_sent']} snapshots "
+                f"applied ({client['undecodable']} without baseline), "
+                f"{client['mean_snapshot_bytes']:.0f} bytes each, "
+                f"{client['down_kbps']:.1f} kbit/s down, {client['up_kbps']:.1f} kbit/s up"
+            )
+        print(f"{results['checked']} decoded snapshots checked against the server, {results['mismatches']} differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import contextlib
+import csv
+import json
+import time
+from collections import deque
+
+import pygame as pg
+
+from assets import to_display_format
+from settings import (
+    PROFILER_HISTORY_FRAMES,
+    PROFILER_OVERLAY_FRAMES,
+    PROFILER_OVERLAY_REFRESH,
+    PROFILER_OVERLAY_SCALE,
+    WHITE,
+)
+
+# Colors handed out to section names in the order they first show up
+PROFILER_COLORS = [
+    (230, 80, 80),
+    (80, 180, 240),
+    (120, 220, 100),
+    (240, 200, 60),
+    (200, 110, 230),
+    (250, 140, 60),
+    (90, 220, 200),
+    (180, 180, 180),
+]
+
+# Returned by section() while profiling is off, so instrumented code only
+# pays for a method call and an empty with block
+NULL_SECTION = contextlib.nullcontext()
+
+
+class Section:
+    """Context manager timing one named section, reused for every entry"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.profiler.depth += 1
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        profiler = self.profiler
+        profiler.depth -= 1
+        profiler.current.append((self.name, self.start, end - self.start, profiler.depth))
+
+
+class Profiler:
+    """Per-phase frame timings kept in a ring buffer.
+
+    Code wraps each phase in `with profiler.section(name):`. Between
+    begin_frame() and end_frame() the sections are collected into a frame,
+    and the last PROFILER_HISTORY_FRAMES frames are kept for the overlay and
+    for export as a Chrome trace (chrome://tracing, Perfetto) or CSV.
+    """
+
+    def __init__(self, capacity=PROFILER_HISTORY_FRAMES):
+        self.enabled = False
+        self.overlay_visible = False
+        self.exporting = False  # Keeps profiling on while the overlay is hidden
+        # (frame start, frame duration, [(name, start, duration, depth)])
+        self.frames = deque(maxlen=capacity)
+        self.current = []
+        self.frame_start = 0.0
+        self.depth = 0
+        self.sections = {}  # Name -> reusable Section
+        self.colors = {}  # Section name -> overlay color
+        self.overlay = None  # Last rendered overlay surface
+        self.overlay_age = 0  # Frames since it was rendered
+
+    def start_exporting(self):
+        """Profile every frame from now on, for an export at the end"""
+        self.exporting = True
+        self.enabled = True
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, profiling runs while it is visible"""
+        self.overlay_visible = not self.overlay_visible
+        self.enabled = self.overlay_visible or self.exporting
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def add(self, name, start, duration):
+        """Record a section measured elsewhere, e.g. summed over many calls"""
+        if self.enabled:
+            self.current.append((name, start, duration, self.depth))
+
+    def begin_frame(self):
+        self.current = []
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.enabled:
+            end = time.perf_counter()
+            self.frames.append((self.frame_start, end - self.frame_start, self.current))
+        self.current = []
+
+    def averages(self, frames=None):
+        """Mean milliseconds per frame of every section over the last frames"""
+        history = list(self.frames)[-frames:] if frames else list(self.frames)
+        totals = {}
+        for _, _, sections in history:
+            for name, _, duration, depth in sections:
+                total = totals.setdefault(name, [0.0, depth])
+                total[0] += duration
+        count = max(len(history), 1)
+        return {name: (total * 1000 / count, depth) for name, (total, depth) in totals.items()}
+
+    def color(self, name):
+        color = self.colors.get(name)
+        if color is None:
+            color = self.colors[name] = PROFILER_COLORS[len(self.colors) % len(PROFILER_COLORS)]
+        return color
+
+    def draw_overlay(self, surface, text_cache):
+        """Blit the overlay, redrawing it every PROFILER_OVERLAY_REFRESH frames"""
+        if not self.overlay_visible:
+            return
+        if self.overlay is None or self.overlay_age >= PROFILER_OVERLAY_REFRESH:
+            self.overlay = self.render_overlay(text_cache.font(14))
+            self.overlay_age = 0
+        self.overlay_age += 1
+        surface.blit(self.overlay, (10, surface.get_height() - 10 - self.overlay.get_height()))
+
+    def render_overlay(self, font):
+        """Draw one stacked bar per frame of the top-level sections, plus a legend"""
+        history = list(self.frames)[-PROFILER_OVERLAY_FRAMES:]
+        scale = PROFILER_OVERLAY_SCALE
+        height = int(1000 / 60 * scale * 2)  # Room for two 60 FPS frame budgets
+        width = PROFILER_OVERLAY_FRAMES * 2
+
+        # Legend with the average cost of every section, children indented.
+        # Rendered straight from the font, the changing numbers would only
+        # churn the shared text cache.
+        labels = [
+            font.render(f"{'  ' * depth}{name}: {ms:.2f} ms", True, self.color(name))
+            for name, (ms, depth) in sorted(
+                self.averages(PROFILER_OVERLAY_FRAMES).items(), key=lambda item: item[0].lower()
+            )
+        ]
+        legend_width = max((label.get_width() for label in labels), default=0)
+        height = max(height, sum(label.get_height() for label in labels))
+
+        overlay = to_display_format(
+            pg.Surface((width + 8 + legend_width, height), pg.SRCALPHA)
+        )
+        overlay.fill((0, 0, 0, 160))
+        for x, (_, _, sections) in enumerate(history):
+            y = height
+            for name, _, duration, depth in sections:
+                if depth == 0:
+                    bar = max(1, int(duration * 1000 * scale))
+                    y -= bar
+                    overlay.fill(self.color(name), (x * 2, y, 2, bar))
+
+        # Reference line at the 60 FPS frame budget
+        budget_y = height - int(1000 / 60 * scale)
+        pg.draw.line(overlay, WHITE, (0, budget_y), (width, budget_y))
+
+        y = 0
+        for label in labels:
+            overlay.blit(label, (width + 8, y))
+            y += label.get_height()
+        return overlay
+
+    def export_chrome_trace(self, path):
+        """Write the buffered frames as Chrome trace event JSON"""
+        if not self.frames:
+            return
+        origin = self.frames[0][0]
+        events = []
+        for index, (start, duration, sections) in enumerate(self.frames):
+            events.append(
+                {
+                    "name": f"frame {index}",
+                    "ph": "X",
+                    "ts": (start - origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+            for name, section_start, section_duration, _ in sections:
+                events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": (section_start - origin) * 1e6,
+                        "dur": section_duration * 1e6,
+                        "pid": 1,
+                        "tid": 1,
+                    }
+                )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export_csv(self, path):
+        """Write one row per section per buffered frame"""
+        origin = self.frames[0][0] if self.frames else 0.0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "section", "depth", "start_ms", "duration_ms"])
+            for index, (start, duration, sections) in enumerate(self.frames):
+                writer.writerow([index, "frame", -1, (start - origin) * 1000, duration * 1000])
+                for name, section_start, section_duration, depth in sections:
+                    writer.writerow(
+                        [index, name, depth, (section_start - origin) * 1000, section_duration * 1000]
+                    )
+
+    def export(self, path):
+        """Export by file extension, .csv for CSV and anything else as a Chrome trace"""
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
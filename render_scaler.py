@@ -0,0 +1,82 @@
+import pygame as pg
+
+from log import get_logger
+from settings import RENDER_INTEGER_SCALE, RENDER_SCALE_FILTER
+
+logger = get_logger(__name__)
+
+SCALE_FILTERS = ("nearest", "smooth", "scale2x")
+
+
+class RenderScaler:
+    """Draw target at the internal resolution, scaled to the window once per frame.
+
+    The game draws into surface. When it has the same size as the window,
+    surface is the window itself and present() does nothing. Otherwise
+    present() scales it into a fixed area of the window, keeping the aspect
+    ratio and leaving black bars around it. With integer_scale the scale
+    factor is rounded down to a whole number, which keeps pixels square and
+    lets nearest filtering skip interpolation entirely.
+    """
+
+    def __init__(
+        self,
+        window,
+        size,
+        scale_filter=RENDER_SCALE_FILTER,
+        integer_scale=RENDER_INTEGER_SCALE,
+    ):
+        if scale_filter not in SCALE_FILTERS:
+            raise ValueError(f"Unknown scale filter {scale_filter!r}, expected one of {SCALE_FILTERS}")
+        self.window = window
+        self.scale_filter = scale_filter
+        self.integer_scale = integer_scale
+
+        if window.get_size() == tuple(size):
+            # Nothing to scale, draw straight into the window
+            self.surface = window
+            self.target = None
+            return
+
+        self.surface = pg.Surface(size).convert(window)
+        self.target = self.target_rect(size, window.get_size())
+        # Scaling writes into this part of the window, so no new surface is
+        # allocated per frame
+        self.dest = window.subsurface(self.target)
+        # scale2x doubles into its own buffer first, then nearest-scales the rest
+        self.doubled = None
+        if scale_filter == "scale2x" and self.target.width >= size[0] * 2:
+            if self.target.size == (size[0] * 2, size[1] * 2):
+                self.doubled = self.dest
+            else:
+                self.doubled = pg.Surface((size[0] * 2, size[1] * 2)).convert(window)
+        window.fill((0, 0, 0))  # The letterbox bars are never drawn over
+        logger.info(
+            "Scaling %dx%d to %dx%d (%s)",
+            size[0], size[1], self.target.width, self.target.height, scale_filter,
+        )
+
+    def target_rect(self, size, window_size):
+        """Largest area of the window with the internal aspect ratio, centered"""
+        scale = min(window_size[0] / size[0], window_size[1] / size[1])
+        if self.integer_scale and scale >= 1:
+            scale = int(scale)
+        rect = pg.Rect(0, 0, int(size[0] * scale), int(size[1] * scale))
+        rect.center = (window_size[0] // 2, window_size[1] // 2)
+        return rect
+
+    def present(self):
+        """Copy the finished frame into the window, call before display.flip()"""
+        if self.target is None:
+            return
+        size = self.target.size
+        if self.doubled is not None:
+            pg.transform.scale2x(self.surface, self.doubled)
+            if self.doubled is not self.dest:
+                pg.transform.scale(self.doubled, size, self.dest)
+        elif self.scale_filter == "smooth":
+            pg.transform.smoothscale(self.surface, size, self.dest)
+        elif self.surface.get_size() == size:
+            self.dest.blit(self.surface, (0, 0))
+        else:
+            pg.transform.scale(self.surface, size, self.dest)
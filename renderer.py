@@ -0,0 +1,70 @@
+import copy
+
+from interpolation import lerp
+from settings import RENDER_CULL_MARGIN
+from sprites import Player
+
+
+class WorldRenderer:
+    """Draws the visible part of the world through the game camera.
+
+    Everything outside the camera view (plus RENDER_CULL_MARGIN) is skipped,
+    and what is left is submitted with a single Surface.blits call, so draw
+    cost follows what is on screen rather than how much exists in the world.
+
+    Frames usually fall between two fixed sim steps, so positions and the
+    camera are interpolated from the state saved by save_previous().
+    """
+
+    def __init__(self, game, margin=RENDER_CULL_MARGIN):
+        self.game = game
+        self.margin = margin
+        self.drawn = 0  # Images submitted last frame
+        # Sprite -> center before the last sim step, new sprites are missing
+        self.prev_sprite_pos = {}
+        self.prev_camera = None
+
+    def save_previous(self):
+        """Remember where everything is before a sim step"""
+        game = self.game
+        self.prev_sprite_pos = {
+            sprite: (sprite.pos.x, sprite.pos.y) for sprite in game.all_sprites
+        }
+        self.prev_camera = (game.camera.x, game.camera.y)
+        game.asteroids.save_previous()
+        game.lasers.save_previous()
+
+    def interpolated_camera(self, alpha):
+        """Return a copy of the game camera alpha of the way from its previous position"""
+        camera = self.game.camera
+        if self.prev_camera is None or alpha >= 1:
+            return camera
+        view = copy.copy(camera)
+        view.x, view.y = lerp(self.prev_camera, (camera.x, camera.y), alpha)
+        return view
+
+    def draw(self, screen, camera, alpha=1.0):
+        game = self.game
+        view = camera.view_rect(self.margin)
+
+        # Array-backed entities cull themselves, asteroids sit beneath the sprites
+        blits = game.asteroids.visible_blits(view, camera, alpha)
+        blits += game.lasers.visible_blits(view, camera, alpha)
+        blits += game.explosions.visible_blits(view, camera)
+
+        # Sprites in layer order
+        prev_sprite_pos = self.prev_sprite_pos
+        for sprite in game.all_sprites:
+            offset = (0, 0)
+            prev = prev_sprite_pos.get(sprite)
+            if prev is not None and alpha < 1:
+                x, y = lerp(prev, sprite.pos, alpha)
+                offset = (round(x - sprite.pos.x), round(y - sprite.pos.y))
+            if isinstance(sprite, Player):
+                # Players are never culled so their ghost ship still shows at the edges
+                blits += sprite.blits(camera, offset)
+            elif sprite.rect.colliderect(view):
+                blits.append((sprite.image, camera.apply_rect(sprite.rect.move(offset))))
+
+        screen.blits(blits, doreturn=False)
+        self.drawn = len(blits)
@@ -0,0 +1,234 @@
+"""Record a match's input and play it back bit-for-bit.
+
+A match is fully determined by its seed and the actions both players held
+on every fixed sim step, so that is all a replay stores. Inputs are run
+length encoded, as keys are usually held for many steps. State digests taken
+every REPLAY_CHECKPOINT_STEPS steps and at the end let playback prove that it
+reproduced the match, and find the first step where it did not.
+
+    python replay.py match.replay            # verify
+    python replay.py match.replay --repeat 5 # benchmark the same match
+"""
+
+import argparse
+import contextlib
+import hashlib
+import struct
+import time
+
+import log
+from input_sources import decode_actions, encode_actions
+from settings import REPLAY_CHECKPOINT_STEPS, SIM_DT, SIM_HZ
+
+REPLAY_MAGIC = b"ADRP"
+REPLAY_VERSION = 2  # Bumped when the simulation changes, older replays would not reproduce
+
+# magic, version, seed, sim rate, steps, run count, checkpoint count, final digest
+HEADER = struct.Struct("<4sHQHIII20s")
+RUN = struct.Struct("<HBB")  # Steps, player 1 mask, player 2 mask
+CHECKPOINT = struct.Struct("<I20s")  # Step, digest of the state before it
+REPLAY_MAX_SEED = 2**64 - 1  # The header stores the seed unsigned in 8 bytes
+
+
+def state_digest(game):
+    """SHA-1 of everything the simulation depends on, to compare two runs"""
+    h = hashlib.sha1()
+    h.update(struct.pack("<dq", game.ticks, game.score))
+    h.update(repr(game.rng.getstate()).encode())
+
+    n = game.asteroids.count
+    for name in game.asteroids.ARRAYS:
+        # prev_pos only feeds render interpolation, ids only name asteroids
+        # for network clients
+        if name not in ("prev_pos", "ids"):
+            h.update(getattr(game.asteroids, name)[:n].tobytes())
+    for array in (game.lasers.pos, game.lasers.vel, game.lasers.active):
+        h.update(array.tobytes())
+    for array in (game.explosions.pos, game.explosions.age, game.explosions.active):
+        h.update(array.tobytes())
+
+    for sprite in game.all_sprites:
+        h.update(type(sprite).__name__.encode())
+        h.update(struct.pack("<4d", sprite.pos.x, sprite.pos.y, sprite.vel.x, sprite.vel.y))
+        h.update(struct.pack("<d", getattr(sprite, "health", 0)))
+    return h.digest()
+
+
+def parse_seed(text):
+    """Command line seed, limited to what a replay header can store"""
+    seed = int(text)
+    if not 0 <= seed <= REPLAY_MAX_SEED:
+        raise argparse.ArgumentTypeError(f"expected a seed from 0 to {REPLAY_MAX_SEED}")
+    return seed
+
+
+class Replay:
+    """A match seed plus the per-step input masks of both players"""
+
+    def __init__(self, seed, sim_hz=SIM_HZ):
+        if not 0 <= seed <= REPLAY_MAX_SEED:
+            raise ValueError(f"seed {seed} does not fit in a replay")
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.masks = []  # (player 1 mask, player 2 mask) per sim step
+        self.checkpoints = {}  # Step -> digest of the state before that step
+        self.final_digest = bytes(20)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def input_sources(self):
+        """Input sources that play the recorded actions back, one per player"""
+        return (ReplayInput(self, 0), ReplayInput(self, 1))
+
+    def save(self, path):
+        runs = []
+        for masks in self.masks:
+            if runs and tuple(runs[-1][1:]) == masks and runs[-1][0] < 0xFFFF:
+                runs[-1][0] += 1
+            else:
+                runs.append([1, *masks])
+
+        with open(path, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    REPLAY_MAGIC,
+                    REPLAY_VERSION,
+                    self.seed,
+                    self.sim_hz,
+                    len(self.masks),
+                    len(runs),
+                    len(self.checkpoints),
+                    self.final_digest,
+                )
+            )
+            f.write(b"".join(RUN.pack(*run) for run in runs))
+            f.write(
+                b"".join(
+                    CHECKPOINT.pack(step, digest)
+                    for step, digest in sorted(self.checkpoints.items())
+                )
+            )
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, seed, sim_hz, steps, run_count, checkpoint_count, final_digest = (
+            HEADER.unpack_from(data)
+        )
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay file")
+
+        replay = cls(seed, sim_hz)
+        replay.final_digest = final_digest
+        offset = HEADER.size
+        for count, mask1, mask2 in RUN.iter_unpack(data[offset : offset + run_count * RUN.size]):
+            replay.masks.extend([(mask1, mask2)] * count)
+        offset += run_count * RUN.size
+        for step, digest in CHECKPOINT.iter_unpack(
+            data[offset : offset + checkpoint_count * CHECKPOINT.size]
+        ):
+            replay.checkpoints[step] = digest
+
+        if len(replay.masks) != steps:
+            raise ValueError(f"{path} is truncated: {len(replay.masks)} of {steps} steps")
+        return replay
+
+
+class ReplayInput:
+    """Input source returning one player's recorded actions, step by step"""
+
+    def __init__(self, replay, player_index):
+        self.replay = replay
+        self.player_index = player_index
+        self.step = 0
+
+    def poll(self):
+        masks = self.replay.masks
+        # Past the end of the recording nothing is pressed
+        mask = masks[self.step][self.player_index] if self.step < len(masks) else 0
+        self.step += 1
+        return decode_actions(mask)
+
+
+class ReplayRecorder:
+    """Captures the input of every sim step of the game's current match.
+
+    Create it right after Game.new(), so it picks up the match seed. The game
+    calls record() each step until stop() detaches it.
+    """
+
+    def __init__(self, game, checkpoint_steps=REPLAY_CHECKPOINT_STEPS):
+        self.game = game
+        self.checkpoint_steps = checkpoint_steps
+        self.replay = Replay(game.seed)
+        game.recorder = self
+
+    def record(self, player_actions):
+        replay = self.replay
+        step = len(replay.masks)
+        if self.checkpoint_steps and step % self.checkpoint_steps == 0:
+            replay.checkpoints[step] = state_digest(self.game)
+        replay.masks.append(tuple(encode_actions(actions) for actions in player_actions))
+
+    def stop(self):
+        """Detach from the game and return the finished Replay"""
+        self.game.recorder = None
+        self.replay.final_digest = state_digest(self.game)
+        return self.replay
+
+
+def play(replay, game):
+    """Run a replay on a game built with replay.input_sources().
+
+    Returns the first step whose state differs from the recording, or None
+    when the whole match was reproduced exactly.
+    """
+    if replay.sim_hz != SIM_HZ:
+        raise ValueError(f"Replay was recorded at {replay.sim_hz} Hz, the game runs at {SIM_HZ} Hz")
+
+    game.new(replay.seed)
+    for step in range(len(replay)):
+        expected = replay.checkpoints.get(step)
+        if expected is not None and state_digest(game) != expected:
+            return step
+        game.dt = SIM_DT
+        game.update()
+    if state_digest(game) != replay.final_digest:
+        return len(replay)
+    return None
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="replay file written by main.py --record")
+    parser.add_argument("--repeat", type=int, default=1, help="play the match this many times")
+    parser.add_argument("--window", action="store_true", help="don't force headless mode")
+    parser.add_argument("--verbose", action="store_true", help="keep the game's log output")
+    args = parser.parse_args()
+
+    # Imported here, main.py imports this module for recording
+    from display import HeadlessDisplay
+    from main import Game
+
+    replay = Replay.load(args.path)
+    print(f"Replay: seed {replay.seed}, {len(replay)} steps, {len(replay.checkpoints)} checkpoints")
+    game = Game(display=None if args.window else HeadlessDisplay())
+    for run in range(args.repeat):
+        game.player_inputs = replay.input_sources()
+        # The game's log output would clutter the results
+        with contextlib.nullcontext() if args.verbose else log.quiet():
+            start = time.perf_counter()
+            diverged = play(replay, game)
+            elapsed = time.perf_counter() - start
+        if diverged is None:
+            print(f"Run {run + 1}: reproduced in {elapsed:.2f}s ({len(replay) / elapsed:.0f} steps/s)")
+        else:
+            print(f"Run {run + 1}: diverged from the recording at step {diverged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Peer-to-peer rollback netcode: both peers simulate, only inputs travel.
+
+Each peer runs the same seeded Game and sends the input mask of the player
+it controls for every frame (one sim step). A peer never waits for the
+other's input: it predicts it, the newest input it has received is
+assumed to still be held, and steps on. When the real input for an earlier
+frame arrives and differs from the prediction, the peer restores the state
+it saved before that frame (see snapshot.py) and resimulates up to the
+present with the corrected input.
+
+One call to advance() runs at most ROLLBACK_MAX_STEPS sim steps, so a
+rollback never costs more than a few steps at once. A deeper one is spread
+over the next calls: the game shows a slightly older state for a few
+frames while it catches up, instead of missing the frame deadline.
+
+Local input is delayed by ROLLBACK_INPUT_DELAY frames, which hides that
+much latency without any rollback. A peer more than ROLLBACK_MAX_FRAMES
+frames ahead of the newest input it received stalls until it catches up,
+so a rollback never replays more than that many frames.
+
+    python rollback.py --delay 40 --jitter 10 --loss 0.02
+    python rollback.py --delay 100 --max-frames 8 --bots aim,random
+
+runs two bot peers in one process over real 127.0.0.1 sockets, with the
+given one-way delay on every packet, and checks that both peers computed
+the same states once all inputs were known.
+"""
+
+import argparse
+import struct
+import time
+
+import numpy as np
+
+import log
+import snapshot
+from batch_runner import BOTS, parse_bots
+from display import HeadlessDisplay
+from input_sources import ScriptedInput, decode_actions, encode_actions
+from main import Game
+from net import DirectLink, LossyLink, VirtualClock, open_socket, receive_all
+from replay import state_digest
+from settings import FPS, SIM_DT, SIM_HZ
+
+ROLLBACK_INPUT_DELAY = 2  # Frames local input is held back before it applies
+ROLLBACK_MAX_FRAMES = 8  # Most frames run on predicted input, the deepest rollback
+ROLLBACK_MAX_STEPS = 2  # Most sim steps one advance() runs, rollback included
+ROLLBACK_CHECK_EVERY = 60  # Frames between state checksums (twice a second at 120 Hz)
+ROLLBACK_MAX_INPUTS = 64  # Most unconfirmed inputs resent in one packet
+
+ROLLBACK_LOOPBACK_SECONDS = 30  # Game time a loopback test runs for
+ROLLBACK_LOOPBACK_DELAY = 40  # One-way milliseconds added to every loopback packet
+ROLLBACK_LOOPBACK_JITTER = 10  # Milliseconds of random extra delay, so packets also reorder
+ROLLBACK_LOOPBACK_LOSS = 0.02  # Fraction of loopback packets dropped
+
+# Frame of the first input, frames of the receiver's input confirmed, input count.
+# The input masks follow, one byte per frame.
+INPUTS = struct.Struct("<IIB")
+
+
+class RollbackSession:
+    """One peer of a rollback match, one frame of local input per advance() call.
+
+    player is 0 or 1, the player this peer controls, and peer is the other
+    side's address. Both peers have to start with the same seed. link sends
+    through sock (see net.DirectLink and net.LossyLink).
+    """
+
+    def __init__(self, game, player, sock, peer, link=None, seed=0,
+                 input_delay=ROLLBACK_INPUT_DELAY, max_frames=ROLLBACK_MAX_FRAMES,
+                 max_steps=ROLLBACK_MAX_STEPS, check_every=ROLLBACK_CHECK_EVERY):
+        self.game = game
+        self.player = player
+        self.sock = sock
+        self.peer = peer
+        self.link = link or DirectLink(sock)
+        if max_steps < 2:
+            # One step per call only keeps up with the present, never catches up
+            raise ValueError(f"max_steps has to be at least 2, not {max_steps}")
+        self.max_frames = max_frames
+        self.max_steps = max_steps
+        self.check_every = check_every
+        self.inputs = (ScriptedInput(), ScriptedInput())
+        game.player_inputs = self.inputs
+        game.new(seed)
+
+        self.frame = 0  # Next frame to take local input for
+        self.simulated = 0  # Next frame to run, behind frame while catching up
+        self.local = [0] * input_delay  # Local input per frame, nothing held at first
+        self.remote = []  # Confirmed remote input per frame, without gaps
+        self.predicted = {}  # Frame -> remote input it ran with, until confirmed
+        self.peer_confirmed = 0  # Frames of local input the peer has received
+        self.rollback_to = None  # Earliest frame that ran with a wrong prediction
+        # Saved (frame, state before that frame) at frame % len, deep enough
+        # for the oldest frame a rollback can go back to
+        self.states = [None] * (max_frames + 1)
+        self.unconfirmed_checks = {}  # Frame -> state_digest before it, inputs still predicted
+        self.checksums = {}  # Frame -> state_digest before it, final
+
+        self.stalls = 0
+        self.rollbacks = 0
+        self.resimulated = 0  # Frames run again by rollbacks
+        self.max_depth = 0  # Most frames a single rollback ran again
+        self.behind = 0  # advance() calls that ended with frames left to catch up
+
+    def advance(self, mask):
+        """Take mask as the local player's input for the next frame and run frames.
+
+        Returns False without taking mask while the peer's input is too far
+        behind, call again with the current mask on the next frame.
+        """
+        self.receive()
+        if self.rollback_to is not None:
+            self.roll_back()
+        self.confirm_checks()
+        stalled = self.frame - len(self.remote) >= self.max_frames
+        if stalled:
+            self.stalls += 1
+        else:
+            self.local.append(mask)
+            self.frame += 1
+        self.send()
+        self.catch_up()
+        return not stalled
+
+    def receive(self):
+        """Add newly arrived remote input, noting the first misprediction"""
+        for data, address in receive_all(self.sock):
+            if address != self.peer or len(data) < INPUTS.size:
+                continue
+            first, confirmed, count = INPUTS.unpack_from(data)
+            masks = data[INPUTS.size : INPUTS.size + count]
+            self.peer_confirmed = max(self.peer_confirmed, confirmed)
+
+            # Only input that extends the confirmed run is used. After a
+            # gap the packet is dropped, the peer resends until confirmed.
+            start = len(self.remote) - first
+            if start < 0:
+                continue
+            for frame, remote in enumerate(masks[start:], len(self.remote)):
+                predicted = self.predicted.pop(frame, remote)
+                if predicted != remote and (self.rollback_to is None or frame < self.rollback_to):
+                    self.rollback_to = frame
+                self.remote.append(remote)
+
+    def send(self):
+        """Send every local input the peer has not confirmed yet"""
+        first = self.peer_confirmed
+        masks = bytes(self.local[first : first + ROLLBACK_MAX_INPUTS])
+        self.link.send(INPUTS.pack(first, len(self.remote), len(masks)) + masks, self.peer)
+        self.link.flush()
+
+    def run_frame(self, frame, interpolate=True):
+        """Save the state before frame, then run it on the best input known"""
+        game = self.game
+        if frame >= len(self.remote):
+            # Only a frame run on predicted input can be rolled back to
+            self.states[frame % len(self.states)] = (frame, snapshot.save(game))
+        if self.check_every and frame % self.check_every == 0:
+            self.unconfirmed_checks[frame] = state_digest(game)
+
+        if frame < len(self.remote):
+            remote = self.remote[frame]
+        else:
+            remote = self.remote[-1] if self.remote else 0
+            self.predicted[frame] = remote
+        local = self.local[frame]
+        masks = (local, remote) if self.player == 0 else (remote, local)
+        for source, mask in zip(self.inputs, masks):
+            source.set(**decode_actions(mask))
+        game.dt = SIM_DT
+        game.update(interpolate)
+
+    def catch_up(self):
+        """Run frames towards the present, at most max_steps of them"""
+        last = min(self.frame, self.simulated + self.max_steps)
+        if last - self.simulated > 1:
+            # Only the newest frame run here can be drawn
+            for frame in range(self.simulated, last - 1):
+                self.run_frame(frame, interpolate=False)
+            # Nothing to blend from if the next draw comes before another frame
+            self.game.renderer.save_previous()
+        if last > self.simulated:
+            self.run_frame(last - 1)
+        self.simulated = last
+        if self.simulated < self.frame:
+            self.behind += 1
+
+    def roll_back(self):
+        """Restore the state before the mispredicted frame, catch_up() runs the rest again"""
+        target = self.rollback_to
+        self.rollback_to = None
+        saved_frame, state = self.states[target % len(self.states)]
+        if saved_frame != target:
+            raise RuntimeError(f"no saved state for frame {target}, the newest is {saved_frame}")
+        snapshot.restore(self.game, state)
+
+        # Everything run from target on used the wrong input and runs again
+        for frame in [frame for frame in self.predicted if frame >= target]:
+            del self.predicted[frame]
+        for frame in [frame for frame in self.unconfirmed_checks if frame > target]:
+            del self.unconfirmed_checks[frame]
+        depth = self.simulated - target
+        self.simulated = target
+
+        self.rollbacks += 1
+        self.resimulated += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def confirm_checks(self):
+        """Keep the checksums of states every input before is known for"""
+        for frame in [frame for frame in self.unconfirmed_checks if frame <= len(self.remote)]:
+            self.checksums[frame] = self.unconfirmed_checks.pop(frame)
+
+
+def run_loopback(seconds=ROLLBACK_LOOPBACK_SECONDS, delay=ROLLBACK_LOOPBACK_DELAY,
+                 jitter=ROLLBACK_LOOPBACK_JITTER, loss=ROLLBACK_LOOPBACK_LOSS,
+                 input_delay=ROLLBACK_INPUT_DELAY, max_frames=ROLLBACK_MAX_FRAMES,
+                 max_steps=ROLLBACK_MAX_STEPS, bots=("aim", "aim"), seed=0):
+    """Play a match between two bot peers over 127.0.0.1 and report on it.
+
+    delay and jitter are in milliseconds and apply to both directions.
+    Time is simulated, so the test runs as fast as the machine allows.
+    Returns a dict of statistics.
+    """
+    clock = VirtualClock()
+    socks = [open_socket("127.0.0.1") for _ in range(2)]
+    sessions = []
+    scripts = []
+    for index, sock in enumerate(socks):
+        link = LossyLink(sock, delay / 1000, jitter / 1000, loss, seed=seed * 10 + index, clock=clock)
+        game = Game(display=HeadlessDisplay())
+        session = RollbackSession(
+            game, index, sock, socks[1 - index].getsockname(), link, seed, input_delay, max_frames,
+            max_steps,
+        )
+        sessions.append(session)
+        # Each bot plays on its own peer's game, predicted state included
+        scripts.append(BOTS[bots[index]](game, index, seed))
+
+    advance_seconds = []
+    for _ in range(int(seconds * SIM_HZ)):
+        clock.advance(SIM_DT)
+        for session, script in zip(sessions, scripts):
+            mask = encode_actions(script(session.frame))
+            start = time.perf_counter()
+            session.advance(mask)
+            advance_seconds.append(time.perf_counter() - start)
+
+    first, second = sessions
+    checked = sorted(set(first.checksums) & set(second.checksums))
+    advance_ms = np.array(advance_seconds) * 1000
+    results = {
+        "checked": len(checked),
+        "mismatches": sum(first.checksums[frame] != second.checksums[frame] for frame in checked),
+        "advance_ms_mean": float(advance_ms.mean()),
+        "advance_ms_p99": float(np.percentile(advance_ms, 99)),
+        "advance_ms_max": float(advance_ms.max()),
+        "frame_budget_ms": 1000 / FPS,
+        "peers": [],
+    }
+    for session in sessions:
+        results["peers"].append(
+            {
+                "player": session.player + 1,
+                "frames": session.frame,
+                "stalls": session.stalls,
+                "rollbacks": session.rollbacks,
+                "resimulated": session.resimulated,
+                "max_depth": session.max_depth,
+                "behind": session.behind,
+                "up_kbps": 8 * session.link.bytes_sent / seconds / 1000,
+            }
+        )
+    first.game.quit()
+    return results
+
+
+def main():
+    log.setup_logging()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=ROLLBACK_LOOPBACK_SECONDS)
+    parser.add_argument("--delay", type=float, default=ROLLBACK_LOOPBACK_DELAY, help="one-way milliseconds")
+    parser.add_argument("--jitter", type=float, default=ROLLBACK_LOOPBACK_JITTER, help="milliseconds")
+    parser.add_argument("--loss", type=float, default=ROLLBACK_LOOPBACK_LOSS, help="fraction of packets dropped")
+    parser.add_argument("--input-delay", type=int, default=ROLLBACK_INPUT_DELAY, help="frames")
+    parser.add_argument("--max-frames", type=int, default=ROLLBACK_MAX_FRAMES,
+                        help="deepest rollback, in frames, before a peer stalls")
+    parser.add_argument("--max-steps", type=int, default=ROLLBACK_MAX_STEPS,
+                        help="most sim steps one advance() runs, deeper rollbacks catch up over several")
+    parser.add_argument("--bots", type=parse_bots, default=("aim", "aim"),
+                        help=f"bot for each player, from {sorted(BOTS)} (default aim)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with log.quiet():
+        results = run_loopback(
+            args.seconds, args.delay, args.jitter, args.loss,
+            args.input_delay, args.max_frames, args.max_steps, args.bots, args.seed,
+        )
+    for peer in results["peers"]:
+        print(
+            f"player {peer['player']}: {peer['frames']} frames, {peer['stalls']} stalled, "
+            f"{peer['rollbacks']} rollbacks re-running {peer['resimulated']} frames "
+            f"(deepest {peer['max_depth']}, {peer['behind']} frames shown late), "
+            f"{peer['up_kbps']:.1f} kbit/s up"
+        )
+    print(
+        f"advance() {results['advance_ms_mean']:.2f} ms mean, {results['advance_ms_p99']:.2f} ms p99, "
+        f"{results['advance_ms_max']:.2f} ms max, frame budget {results['frame_budget_ms']:.2f} ms"
+    )
+    print(f"{results['checked']} confirmed states checked on both peers, {results['mismatches']} differ")
+
+
+if __name__ == "__main__":
+    main()
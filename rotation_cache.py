@@ -0,0 +1,72 @@
+import pygame as pg
+
+from assets import to_display_format
+from settings import ROTATION_STEPS
+
+
+class RotationCache:
+    """Pre-rendered rotations of base images, shared by every sprite.
+
+    Each base image is rendered once at ROTATION_STEPS evenly spaced angles
+    the first time it is used, so rotating a sprite afterwards is a lookup.
+    Images are keyed by identity, so callers should share their base images
+    instead of drawing a new one per instance.
+    """
+
+    def __init__(self, steps=ROTATION_STEPS):
+        self.steps = steps
+        # id(base image) -> (base image, list of rotated frames). Holding the base
+        # keeps its id from being reused by another surface.
+        self.frames = {}
+        # (id(base image), alpha) -> rotated frames with the alpha baked in
+        self.faded_frames = {}
+
+    def bucket(self, angle):
+        """Quantize an angle in degrees to a frame index"""
+        return int(round(angle * self.steps / 360)) % self.steps
+
+    def render(self, image):
+        """Rotate an image to every step, without caching the result"""
+        return [
+            pg.transform.rotate(image, i * 360 / self.steps) for i in range(self.steps)
+        ]
+
+    def prerender(self, image, assets=None, name=None):
+        """Return the rotation frames of an image, rendering them on first use.
+
+        With an AssetManager and a name, the frames go through its disk cache.
+        """
+        entry = self.frames.get(id(image))
+        if entry is None:
+            if assets is not None:
+                frames = assets.sprite_set(name, lambda: self.render(image))
+            else:
+                frames = [to_display_format(frame) for frame in self.render(image)]
+            entry = (image, frames)
+            self.frames[id(image)] = entry
+        return entry[1]
+
+    def get(self, image, angle):
+        """Return image rotated by the nearest cached angle"""
+        return self.prerender(image)[self.bucket(angle)]
+
+    def get_bucket(self, image, bucket):
+        """Return image rotated to an already quantized frame index"""
+        return self.prerender(image)[bucket]
+
+    def get_faded(self, image, angle, alpha):
+        """Return a translucent copy of a rotated frame, made once per frame and alpha"""
+        frames = self.faded_frames.get((id(image), alpha))
+        if frames is None:
+            frames = self.faded_frames[(id(image), alpha)] = [None] * self.steps
+        bucket = self.bucket(angle)
+        frame = frames[bucket]
+        if frame is None:
+            frame = self.get_bucket(image, bucket).copy()
+            frame.fill((255, 255, 255, alpha), special_flags=pg.BLEND_RGBA_MULT)
+            frames[bucket] = frame
+        return frame
+
+
+# Shared by ships, enemies and lasers
+rotation_cache = RotationCache()
@@ -1,31 +1,44 @@
-import pygame as pg
-pg.init()  # pylint: disable=no-member
+import os
+
+# Settings are plain values: importing this module never touches pygame or
+# the display. Values that depend on the window size (WIDTH, HEIGHT, the
+# world size, ...) are derived on first access, see display_values().
+
+# Headless mode runs without a window or real input, for soak tests and
+# throughput measurements. Enable it with ASTEROID_DUEL_HEADLESS=1 before
+# the game is created.
+HEADLESS = os.environ.get("ASTEROID_DUEL_HEADLESS", "") not in ("", "0")
+HEADLESS_WIDTH = 1280  # Fixed dimensions, the desktop size is never queried
+HEADLESS_HEIGHT = 720
 
 # Game options/settings
 TITLE = "Asteroid Duel"
 
-# Get the screen info to set dynamic resolution
-screen_info = pg.display.Info()
-WIDTH = screen_info.current_w  # Use current screen width
-HEIGHT = screen_info.current_h  # Use current screen height
-print(f"Detected screen resolution: {WIDTH}x{HEIGHT}")
-
 # Option to use fullscreen or windowed mode
 FULLSCREEN = False  # Set to True for fullscreen mode
-
-# If not using fullscreen, use a reasonable default size that fits most screens
-if not FULLSCREEN:
-    # Use 80% of the screen size for windowed mode
-    WIDTH = int(WIDTH * 0.8)
-    HEIGHT = int(HEIGHT * 0.8)
-    print(f"Using windowed mode with resolution: {WIDTH}x{HEIGHT}")
-
-FPS = 60
+WINDOWED_SCALE = 0.8  # Fraction of the desktop size used by the window in windowed mode
+
+# Render resolution settings
+# With scaling on, the game is drawn at RENDER_WIDTH x RENDER_HEIGHT and scaled
+# to the window once per frame, so fill-rate cost no longer grows with the
+# desktop resolution. WIDTH and HEIGHT are then the internal resolution.
+RENDER_SCALING = False
+RENDER_WIDTH = 1280
+RENDER_HEIGHT = 720
+RENDER_SCALE_FILTER = "nearest"  # "nearest", "smooth" or "scale2x"
+RENDER_INTEGER_SCALE = False  # Scale by whole multiples only, letterboxing the rest
+
+FPS = 60  # Render frame rate cap
+
+# Simulation settings
+SIM_HZ = 120  # Fixed simulation steps per second, independent of the render rate
+SIM_DT = 1 / SIM_HZ
+SIM_MAX_STEPS = 8  # Most steps per rendered frame, beyond this the game slows down instead
+INTERPOLATION_SNAP_DISTANCE = 64  # Moves longer than this in one step (wrapping) are not smoothed
+REPLAY_CHECKPOINT_STEPS = 600  # Sim steps between state digests stored in a replay
 
 # World Size Multiplier (reduced from 10x to 3x for better visibility)
 WORLD_MULTIPLIER = 3
-WORLD_WIDTH = WIDTH * WORLD_MULTIPLIER
-WORLD_HEIGHT = HEIGHT * WORLD_MULTIPLIER
 
 # Player respawn settings
 PLAYER_RESPAWN_SAFE_DISTANCE = 200  # Minimum distance from enemies when respawning
@@ -42,26 +55,26 @@ BROWN = (165, 42, 42)
 
 # Font settings
 FONT_NAME = "arial"
+TEXT_CACHE_SIZE = 128  # Rendered text surfaces kept before the least recently used is dropped
+HUD_OVERLAY_HEIGHT = 140  # Height of the strip at the top of the screen holding the HUD
 
 # Player settings (placeholders for now)
 PLAYER_ACC = 200
 PLAYER_FRICTION = -0.9  # Higher friction value to slow down faster
 PLAYER_DECELERATION = 0.95  # Explicit deceleration factor for quick direction changes
 PLAYER_ROT_SPEED = 200
-PLAYER_HIT_RECT = pg.Rect(0, 0, 35, 35)  # Example hit rectangle
+PLAYER_HIT_RECT = (0, 0, 35, 35)  # Example hit rectangle (x, y, width, height)
 PLAYER_HEALTH = 100
 PLAYER_SIZE = 30  # Example size for primitive shape
 PLAYER_SHOOT_DELAY = 250  # milliseconds
+PLAYER_GHOST_ALPHA = 150  # Opacity of the wrap-around ghost ship
+PLAYER_SHIELD_LEVELS = 8  # Pre-rendered shield opacities, from weakest to full strength
 PLAYER_IMG_P1 = "playerShip1_blue.png"  # Placeholder asset name
 PLAYER_IMG_P2 = "playerShip1_red.png"  # Placeholder asset name
 
-# Player start positions (centered in the world)
-PLAYER1_START = (WIDTH // 4, HEIGHT // 2)  # Left side of screen
-PLAYER2_START = (WIDTH * 3 // 4, HEIGHT // 2)  # Right side of screen
-
 # Laser settings (placeholders)
 LASER_SPEED = 500
-LASER_LIFETIME = 1000  # milliseconds
+LASER_LIFETIME = 2000  # milliseconds
 LASER_SIZE = (4, 20)  # Small rectangle for laser primitive
 LASER_COLOR_P1 = YELLOW  # Example color for Player 1's lasers
 LASER_COLOR_P2 = (255, 100, 0)  # Example color (Orange) for Player 2's lasers
@@ -70,6 +83,7 @@ LASER_COOLDOWN_INCREASE = 50  # ms added to rate after each shot
 LASER_COOLDOWN_RECHARGE = 5  # ms subtracted from rate each frame when not firing
 LASER_MAX_COOLDOWN = 1000  # Maximum delay
 LASER_IMG = "laserBlue01.png"  # Placeholder
+LASER_POOL_CAPACITY = 512  # Lasers alive at once, the oldest is recycled beyond this
 
 # Asteroid settings
 # NUM_ASTEROIDS = 1000
@@ -80,6 +94,11 @@ ASTEROID_ROT_SPEED_MAX = 60  # degrees per second
 ASTEROID_SPAWN_PADDING = 100  # Min distance from edge or player to spawn
 ASTEROID_COUNT = 8  # Initial number of asteroids
 ASTEROID_IMG = "meteorBrown_med1.png"  # Placeholder image
+ASTEROID_SIZE_MIN_SPLIT = 10  # Split asteroids never get smaller than this
+ASTEROID_FIELD_CAPACITY = 256  # Initial slots in the asteroid arrays, doubled when full
+ASTEROID_ATLAS_SIZE_STEP = 5  # Asteroid images are drawn for sizes in steps of this
+ASTEROID_ATLAS_VARIANTS = 4  # Crater layouts drawn per size
+ASTEROID_ATLAS_SEED = 1337  # Fixed seed so the atlas looks the same every launch
 
 # Enemy ship settings
 MOTHERSHIP_SIZE = 50
@@ -100,8 +119,35 @@ ENEMY_MAX_SPEED = 200
 ENEMY_COLOR = (255, 100, 0)  # Orange
 MOTHERSHIP_COLOR = (255, 50, 50)  # Red
 
+# Collision broadphase settings
+SPATIAL_HASH_CELL_SIZE = 128  # Grid cell size in pixels, a few times the largest sprite
+
+# Rendering settings
+ROTATION_STEPS = 360  # Pre-rendered angles per rotated image (1 degree apart)
+RENDER_CULL_MARGIN = 64  # Pixels beyond the screen edge that are still drawn
+
+# Profiler settings
+PROFILER_HISTORY_FRAMES = 600  # Frames of section timings kept for the overlay and export
+PROFILER_TOGGLE_KEY = "f3"  # Key name, as pygame.key.key_code() takes it
+PROFILER_OVERLAY_FRAMES = 180  # Frames shown as bars in the overlay
+PROFILER_OVERLAY_SCALE = 6  # Bar height in pixels per millisecond
+PROFILER_OVERLAY_REFRESH = 15  # Frames between overlay redraws
+
+# Background settings
+BACKGROUND_TILE_SIZE = 400  # Pre-rendered tile size, a multiple of the grid size
+BACKGROUND_GRID_SIZE = 100  # Spacing of the reference grid lines
+BACKGROUND_GRID_COLOR = (20, 20, 20)
+BACKGROUND_STAR_COUNT = 40  # Stars per tile on the grid layer, 0 for a plain grid
+# (scroll factor, stars per tile) for each parallax star layer, empty to disable
+BACKGROUND_PARALLAX_LAYERS = ((0.25, 30), (0.5, 20))
+BACKGROUND_SEED = 7  # Fixed seed so the starfield looks the same every launch
+
 # Explosion settings
 EXPLOSION_DURATION = 500  # milliseconds for the primitive explosion
+EXPLOSION_CAPACITY = 256  # Explosions shown at once, the oldest is replaced beyond this
+EXPLOSION_SIZE_STEP = 10  # Explosion images are drawn for sizes in steps of this
+EXPLOSION_SIZE_MAX = 100  # Largest explosion image (a mothership blowing up)
+EXPLOSION_FADE_FRAMES = 16  # Pre-faded frames per explosion size
 
 # PowerUp settings
 POWERUP_SIZE = 20
@@ -123,6 +169,10 @@ POWERUP_LIFETIME = (
 POWERUP_SHOTGUN_SPREAD = 15  # Angle in degrees between shotgun lasers
 POWERUP_LASER_STREAM_DELAY = 100  # Delay between laser stream shots in milliseconds
 POWERUP_SHIELD_HEALTH = 50  # Additional health provided by shield
+POWERUP_ROTATION_SPEED = 120  # Degrees per second
+POWERUP_ROTATION_FRAMES = 16  # Pre-rendered rotation steps per powerup type
+POWERUP_PULSE_PERIOD = 628  # Milliseconds for one grow/shrink cycle
+POWERUP_PULSE_FRAMES = 8  # Pre-rendered pulse steps per rotation step
 
 # Boundary
 BOUNDARY_COLOR = RED
@@ -130,19 +180,64 @@ BOUNDARY_THICKNESS = 10
 
 # Asset paths (assuming assets are in 'assets' folder)
 ASSET_FOLDER = "assets"  # We might need the absolute path later depending on setup
+ASSET_CACHE_FOLDER = ".cache"  # Pre-rendered sprite sets, safe to delete
 
-# Player Controls (pygame keys)
+# Player Controls (key names, as pygame.key.key_code() takes them)
 PLAYER1_CONTROLS = {
-    "up": pg.K_w,  # pylint: disable=no-member
-    "down": pg.K_s,  # pylint: disable=no-member
-    "left": pg.K_a,  # pylint: disable=no-member
-    "right": pg.K_d,  # pylint: disable=no-member
-    "fire": pg.K_SPACE,  # pylint: disable=no-member
+    "up": "w",
+    "down": "s",
+    "left": "a",
+    "right": "d",
+    "fire": "space",
 }
 PLAYER2_CONTROLS = {
-    "up": pg.K_UP,  # pylint: disable=no-member
-    "down": pg.K_DOWN,  # pylint: disable=no-member
-    "left": pg.K_LEFT,  # pylint: disable=no-member
-    "right": pg.K_RIGHT,  # pylint: disable=no-member
-    "fire": pg.K_RSHIFT,  # pylint: disable=no-member
+    "up": "up",
+    "down": "down",
+    "left": "left",
+    "right": "right",
+    "fire": "right shift",
 }
+
+# Derived from the window size, see display_values()
+DISPLAY_VALUES = (
+    "WINDOW_WIDTH",
+    "WINDOW_HEIGHT",
+    "WIDTH",
+    "HEIGHT",
+    "WORLD_WIDTH",
+    "WORLD_HEIGHT",
+    "PLAYER1_START",
+    "PLAYER2_START",
+)
+
+
+def display_values(window_size):
+    """Every size that follows from the window size.
+
+    WIDTH x HEIGHT is the resolution the game is drawn and simulated at: the
+    window itself, or RENDER_WIDTH x RENDER_HEIGHT with RENDER_SCALING on.
+    """
+    window_width, window_height = window_size
+    width, height = (RENDER_WIDTH, RENDER_HEIGHT) if RENDER_SCALING else window_size
+    return {
+        "WINDOW_WIDTH": window_width,  # Size of the actual window
+        "WINDOW_HEIGHT": window_height,
+        "WIDTH": width,
+        "HEIGHT": height,
+        "WORLD_WIDTH": width * WORLD_MULTIPLIER,
+        "WORLD_HEIGHT": height * WORLD_MULTIPLIER,
+        "PLAYER1_START": (width // 4, height // 2),  # Left side of screen
+        "PLAYER2_START": (width * 3 // 4, height // 2),  # Right side of screen
+    }
+
+
+def __getattr__(name):
+    # Display-dependent values for tools that want the defaults, e.g.
+    # settings.WIDTH. The game itself uses the sizes of its own Game.
+    if name in DISPLAY_VALUES:
+        from display import default_display  # Deferred, it imports pygame
+
+        values = display_values(default_display().default_size())
+        globals().update(values)
+        return values[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,159 @@
+"""Save and restore the whole simulation state of a Game, for rollback.
+
+save(game) copies everything a sim step reads or writes: the game clock,
+score, spawn timers and RNG state, the asteroid, laser and explosion
+arrays, the camera, and every sprite with the groups it is in. Positions
+kept for interpolated drawing are left out, every sim step starts by
+overwriting them.
+restore(game, state) puts it all back, so stepping on from a restored
+state gives the same result as the first time (see replay.state_digest):
+
+    state = snapshot.save(game)
+    game.update()
+    snapshot.restore(game, state)
+
+Sprites come back as the same objects: one created after the save is
+dropped and one killed since is revived. Images and other read-only data
+are shared rather than copied, so a save costs a small fraction of the sim
+step it allows to run again (python benchmark.py --snapshot).
+"""
+
+from pygame.math import Vector2
+from pygame.rect import Rect
+
+from asteroid_field import AsteroidField
+
+# Game attributes a sim step changes, saved as they are
+GAME_FIELDS = (
+    "ticks",
+    "score",
+    "playing",
+    "last_mothership_spawn",
+    "last_asteroid_spawn",
+    "asteroid_spawn_delay",
+    "next_entity_id",
+    "player1",
+    "player2",
+)
+# Sprite groups, in the order they are restored
+GROUPS = ("all_sprites", "players", "enemies", "motherships", "powerups")
+# prev_pos only feeds interpolated drawing and is refreshed before it is read
+ASTEROID_ARRAYS = tuple(name for name in AsteroidField.ARRAYS if name != "prev_pos")
+LASER_ARRAYS = ("pos", "vel", "spawn_time", "angle", "active", "ids")
+EXPLOSION_ARRAYS = ("pos", "bucket", "age", "active")
+
+# Sprite attributes of these types are changed in place, so they are copied.
+# Anything else is either immutable or shared read-only data (images,
+# the game) and kept by reference.
+MUTABLE_TYPES = frozenset((Vector2, Rect, dict))
+
+# pygame keeps a sprite's groups in this attribute, restored through the groups
+SPRITE_GROUPS_ATTR = "_Sprite__g"
+
+# (sprite class, attribute count) -> names of its mutable attributes. A
+# sprite's attributes keep their type, so each kind is only looked through once.
+mutable_names = {}
+
+
+class WorldState:
+    """Everything save() copied out of one Game, only valid for that Game"""
+
+    def __init__(self):
+        self.game_fields = ()
+        self.rng_state = None
+        self.last_mothership_pos = None  # Only set once a mothership was hit
+        self.camera = None  # (x, y, camera rect)
+        self.asteroid_count = 0
+        self.asteroids = {}  # Array name -> copy of the live rows
+        self.lasers = {}
+        self.laser_owner = []
+        self.laser_free = []
+        self.explosions = {}
+        # (sprite, attribute dict, names of its mutable attributes) in all_sprites order
+        self.sprites = []
+        self.groups = []  # Members of each group in GROUPS, in order
+
+
+def save(game):
+    """Copy the simulation state of game into a new WorldState"""
+    state = WorldState()
+    state.game_fields = tuple(getattr(game, name) for name in GAME_FIELDS)
+    state.rng_state = game.rng.getstate()
+    pos = getattr(game, "last_mothership_pos", None)
+    state.last_mothership_pos = None if pos is None else Vector2(pos)
+    camera = game.camera
+    state.camera = (camera.x, camera.y, camera.camera.copy())
+
+    field = game.asteroids
+    count = field.count
+    state.asteroid_count = count
+    state.asteroids = {name: getattr(field, name)[:count].copy() for name in ASTEROID_ARRAYS}
+    lasers = game.lasers
+    state.lasers = {name: getattr(lasers, name).copy() for name in LASER_ARRAYS}
+    state.laser_owner = lasers.owner.copy()
+    state.laser_free = lasers.free.copy()
+    explosions = game.explosions
+    state.explosions = {name: getattr(explosions, name).copy() for name in EXPLOSION_ARRAYS}
+
+    sprites = []
+    for sprite in game.all_sprites.sprites():
+        attrs = sprite.__dict__.copy()
+        del attrs[SPRITE_GROUPS_ATTR]
+        key = (type(sprite), len(attrs))
+        mutable = mutable_names.get(key)
+        if mutable is None:
+            mutable = [name for name, value in attrs.items() if type(value) in MUTABLE_TYPES]
+            mutable_names[key] = mutable
+        for name in mutable:
+            attrs[name] = attrs[name].copy()
+        sprites.append((sprite, attrs, mutable))
+    state.sprites = sprites
+    state.groups = [getattr(game, name).sprites() for name in GROUPS]
+    return state
+
+
+def restore(game, state):
+    """Put game back into the state save() returned, the state can be restored again"""
+    for name, value in zip(GAME_FIELDS, state.game_fields):
+        setattr(game, name, value)
+    game.rng.setstate(state.rng_state)
+    if state.last_mothership_pos is not None:
+        game.last_mothership_pos = Vector2(state.last_mothership_pos)
+    elif hasattr(game, "last_mothership_pos"):
+        del game.last_mothership_pos
+    camera = game.camera
+    camera.x, camera.y, rect = state.camera
+    camera.camera = rect.copy()
+
+    field = game.asteroids
+    count = state.asteroid_count
+    while len(field.pos) < count:
+        field.grow()
+    field.count = count
+    for name, array in state.asteroids.items():
+        getattr(field, name)[:count] = array
+    lasers = game.lasers
+    for name, array in state.lasers.items():
+        getattr(lasers, name)[:] = array
+    lasers.owner[:] = state.laser_owner
+    lasers.free[:] = state.laser_free
+    explosions = game.explosions
+    for name, array in state.explosions.items():
+        getattr(explosions, name)[:] = array
+
+    # Rebuilding a group is only needed when sprites came or went since
+    # the save. Adding them back in saved order keeps the update order,
+    # which the simulation depends on.
+    for name, members in zip(GROUPS, state.groups):
+        group = getattr(game, name)
+        if group.sprites() != members:
+            group.empty()
+            group.add(*members)
+
+    # Copied again, so the live sprites never share mutable values with
+    # the state and it can be restored any number of times
+    for sprite, attrs, mutable in state.sprites:
+        live = sprite.__dict__
+        live.update(attrs)
+        for name in mutable:
+            live[name] = attrs[name].copy()
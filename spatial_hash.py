@@ -0,0 +1,144 @@
+from collections import defaultdict
+
+import numpy as np
+
+from settings import SPATIAL_HASH_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase for sprite collision queries.
+
+    Sprites are bucketed by the grid cells their rect overlaps, one grid per
+    named group. A query only looks at the cells under the query rect, so the
+    cost depends on how crowded that area is rather than on the group size.
+
+    Entities stored in NumPy arrays are indexed with rebuild_points() instead,
+    which sorts them by the cell holding their centre so a query is a few
+    binary searches per rect.
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.grids = {}
+        self.point_grids = {}
+
+    def cell_range(self, rect):
+        """Return the (x0, y0, x1, y1) cell span covered by a rect"""
+        size = self.cell_size
+        return (
+            int(rect.left // size),
+            int(rect.top // size),
+            int(rect.right // size),
+            int(rect.bottom // size),
+        )
+
+    def rebuild(self, groups):
+        """Rebuild the grids from a mapping of name -> sprite group"""
+        self.grids = {}
+        size = self.cell_size
+        for name, group in groups.items():
+            grid = defaultdict(list)
+            for sprite in group:
+                # cell_range() inlined, rect coordinates are already ints
+                left, top, width, height = sprite.rect
+                x0 = left // size
+                y0 = top // size
+                x1 = (left + width) // size
+                y1 = (top + height) // size
+                if x0 == x1 and y0 == y1:
+                    # Most sprites are smaller than a cell and sit inside one
+                    grid[(x0, y0)].append(sprite)
+                    continue
+                for cx in range(x0, x1 + 1):
+                    for cy in range(y0, y1 + 1):
+                        grid[(cx, cy)].append(sprite)
+            self.grids[name] = grid
+
+    def query(self, name, rect):
+        """Return the live sprites of a group whose cells overlap rect"""
+        grid = self.grids.get(name)
+        if not grid:
+            return []
+
+        x0, y0, x1, y1 = self.cell_range(rect)
+        found = []
+        seen = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for sprite in grid.get((cx, cy), ()):
+                    if sprite not in seen:
+                        seen.add(sprite)
+                        # Sprites killed earlier in the frame are still in the grid
+                        if sprite.alive():
+                            found.append(sprite)
+        return found
+
+    def rectcollide(self, rect, name):
+        """Return the live sprites of a group whose rect overlaps rect"""
+        return [other for other in self.query(name, rect) if rect.colliderect(other.rect)]
+
+    def cell_keys(self, cx, cy):
+        """Pack cell coordinates into a single sortable int64 key"""
+        return cx.astype(np.int64) * (1 << 32) + cy.astype(np.int64)
+
+    def rebuild_points(self, name, positions, radii, alive):
+        """Index an array of circles by the cell containing their centre"""
+        cells = np.floor_divide(positions, self.cell_size).astype(np.int64)
+        keys = self.cell_keys(cells[:, 0], cells[:, 1])
+        order = np.argsort(keys, kind="stable")
+        self.point_grids[name] = (
+            keys[order],
+            order,
+            positions,
+            radii,
+            alive,
+            float(radii.max()) if len(radii) else 0.0,
+        )
+
+    def query_points(self, name, bounds):
+        """Find the indexed circles whose bounding box overlaps each of many rects.
+
+        bounds is an (n, 4) array of left, top, right, bottom. Returns
+        (rect index, circle index) arrays, by rect, then in grid order. Each
+        rect only looks at the cells under it, so the cost follows how
+        crowded those cells are rather than how many circles there are.
+        """
+        empty = np.empty(0, dtype=np.intp)
+        grid = self.point_grids.get(name)
+        if grid is None or len(grid[0]) == 0 or len(bounds) == 0:
+            return empty, empty
+        keys, order, positions, radii, alive, max_radius = grid
+
+        # A centre can be up to max_radius outside a rect and still overlap it
+        reach = np.array((-max_radius, -max_radius, max_radius, max_radius))
+        x0, y0, x1, y1 = np.floor_divide(bounds + reach, self.cell_size).astype(np.int64).T
+        # One entry per grid column under each rect
+        widths = x1 - x0 + 1
+        column_rect = np.repeat(np.arange(len(bounds)), widths)
+        column_first = np.repeat(np.cumsum(widths) - widths, widths)
+        columns = x0[column_rect] + np.arange(len(column_rect)) - column_first
+        # Keys sort by column, then row, so each column's cells under a rect
+        # are one run of keys: two binary searches per column, for all rects
+        starts = keys.searchsorted(self.cell_keys(columns, y0[column_rect]), "left")
+        ends = keys.searchsorted(self.cell_keys(columns, y1[column_rect]), "right")
+        counts = ends - starts
+        total = int(counts.sum())
+        if total == 0:
+            return empty, empty
+
+        # Every run expanded into its positions in the sorted keys
+        rows = np.repeat(column_rect, counts)
+        run_first = np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = order[np.repeat(starts, counts) + np.arange(total) - run_first]
+        pos = positions[candidates]
+        r = radii[candidates]
+        rects = bounds[rows]
+        hit = (
+            (pos[:, 0] - r < rects[:, 2])
+            & (pos[:, 0] + r > rects[:, 0])
+            & (pos[:, 1] - r < rects[:, 3])
+            & (pos[:, 1] + r > rects[:, 1])
+            # Entries killed earlier in the frame are still in the grid
+            & alive[candidates]
+        )
+        return rows[hit], candidates[hit]
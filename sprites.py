@@ -1,8 +1,10 @@
 import math
-import random
 
 import pygame as pg
 
+from assets import to_display_format
+from log import get_logger
+from rotation_cache import rotation_cache
 from settings import (
     ENEMY_COLOR,
     ENEMY_MAX_SPEED,
@@ -11,10 +13,6 @@ from settings import (
     ENEMY_SHIP_HEALTH,
     ENEMY_SHIP_SIZE,
     ENEMY_SWARM_DISTANCE,
-    EXPLOSION_DURATION,
-    GREEN,
-    HEIGHT,
-    LASER_SPEED,
     MOTHERSHIP_ACC,
     MOTHERSHIP_COLOR,
     MOTHERSHIP_FRICTION,
@@ -23,26 +21,53 @@ from settings import (
     PLAYER_ACC,
     PLAYER_DECELERATION,
     PLAYER_FRICTION,
+    PLAYER_GHOST_ALPHA,
     PLAYER_ROT_SPEED,
+    PLAYER_SHIELD_LEVELS,
     PLAYER_SHOOT_DELAY,
     PLAYER_SIZE,
     POWERUP_COLORS,
     POWERUP_LASER_STREAM_DELAY,
+    POWERUP_PULSE_FRAMES,
+    POWERUP_PULSE_PERIOD,
+    POWERUP_ROTATION_FRAMES,
+    POWERUP_ROTATION_SPEED,
     POWERUP_SHIELD_HEALTH,
     POWERUP_SHOTGUN_SPREAD,
     POWERUP_SIZE,
     POWERUP_TYPES,
-    RED,
     WHITE,
-    WIDTH,
-    WORLD_HEIGHT,
-    WORLD_WIDTH,
 )
 
+logger = get_logger(__name__)
+
 # Define constants
 vec = pg.math.Vector2
 SRCALPHA = 0x00010000  # Define SRCALPHA constant
 
+# Base ship images, shared by every ship with the same look so the rotation
+# cache only renders each of them once
+SHIP_IMAGES = {}
+
+
+def ship_image(color, size, outline=None):
+    """Return the shared upward-pointing triangle image for a ship"""
+    key = (color, size, outline)
+    if key not in SHIP_IMAGES:
+        image = pg.Surface((size, size), flags=SRCALPHA)
+
+        # Draw a triangle pointing upward
+        points = [
+            (size // 2, 0),  # Top vertex
+            (0, size),  # Bottom left
+            (size, size),  # Bottom right
+        ]
+        pg.draw.polygon(image, color, points)
+        if outline:
+            pg.draw.polygon(image, outline, points, 1)
+        SHIP_IMAGES[key] = image
+    return SHIP_IMAGES[key]
+
 
 class Player(pg.sprite.Sprite):
     def __init__(self, game, pos, player_controls, color, player_num=1):
@@ -58,21 +83,9 @@ class Player(pg.sprite.Sprite):
         game.all_sprites.add(self)
         game.players.add(self)
 
-        # Create a triangular ship
-        self.original_image = pg.Surface((self.size, self.size), flags=SRCALPHA)
-
-        # Draw a triangle pointing upward
-        points = [
-            (self.size // 2, 0),  # Top vertex
-            (0, self.size),  # Bottom left
-            (self.size, self.size),  # Bottom right
-        ]
-        pg.draw.polygon(self.original_image, self.color, points)
-
-        # Add a white outline to make the player more visible
-        pg.draw.polygon(self.original_image, WHITE, points, 1)
-
-        self.image = self.original_image.copy()
+        # Create a triangular ship with a white outline to make the player more visible
+        self.original_image = ship_image(self.color, self.size, WHITE)
+        self.image = rotation_cache.get(self.original_image, 0)
         self.rect = self.image.get_rect()
 
         # Set initial position and movement variables
@@ -83,6 +96,7 @@ class Player(pg.sprite.Sprite):
         self.rect.center = self.pos
         self.rot = 0
         self.health = 100
+        self.invulnerable = False  # Takes no damage, set by benchmark scenarios
         self.last_shot = 0
 
         # Ghost ship for boundary transitions
@@ -99,27 +113,27 @@ class Player(pg.sprite.Sprite):
         self.last_stream_shot = 0  # For laser stream powerup
 
         # Debug information
-        print(f"Player {player_num} initialized at position {self.pos}")
+        logger.debug("Player %d initialized at %.0f, %.0f", player_num, self.pos.x, self.pos.y)
 
     def update(self, dt):
         self.acc = vec(0, 0)
-        keys = pg.key.get_pressed()
+        actions = self.game.player_actions[self.player_num - 1]
 
         # Handle rotation
-        if keys[self.player_controls["left"]]:
+        if actions["left"]:
             self.rot = (self.rot + PLAYER_ROT_SPEED * dt) % 360
-        if keys[self.player_controls["right"]]:
+        if actions["right"]:
             self.rot = (self.rot - PLAYER_ROT_SPEED * dt) % 360
 
-        # Update image based on rotation
-        self.image = pg.transform.rotate(self.original_image, self.rot)
+        # Update image based on rotation, looked up from the shared cache
+        self.image = rotation_cache.get(self.original_image, self.rot)
         old_center = self.rect.center
         self.rect = self.image.get_rect()
         self.rect.center = old_center
 
         # Check if player is trying to move in the opposite direction
-        moving_forward = keys[self.player_controls["up"]]
-        moving_backward = keys[self.player_controls["down"]]
+        moving_forward = actions["up"]
+        moving_backward = actions["down"]
 
         # Handle forward/backward movement
         if moving_forward:
@@ -162,47 +176,25 @@ class Player(pg.sprite.Sprite):
 
         # Handle screen wrapping with a buffer zone for smooth transitions
         buffer = self.size * 1.5  # Buffer size based on player size
-        transition_zone = self.size * 3  # Zone where ghost ship appears
-
-        # Reset ghost status
-        self.ghost_active = False
-
-        # Check if player is near a boundary and set up ghost ship
-        if self.pos.x > WIDTH - transition_zone:
-            # Near right edge, show ghost on left
-            self.ghost_active = True
-            self.ghost_pos = vec(self.pos.x - WIDTH, self.pos.y)
-        elif self.pos.x < transition_zone:
-            # Near left edge, show ghost on right
-            self.ghost_active = True
-            self.ghost_pos = vec(self.pos.x + WIDTH, self.pos.y)
-
-        if self.pos.y > HEIGHT - transition_zone:
-            # Near bottom edge, show ghost on top
-            self.ghost_active = True
-            self.ghost_pos = vec(self.pos.x, self.pos.y - HEIGHT)
-        elif self.pos.y < transition_zone:
-            # Near top edge, show ghost on bottom
-            self.ghost_active = True
-            self.ghost_pos = vec(self.pos.x, self.pos.y + HEIGHT)
+        self.update_ghost()
 
         # Wrap around screen edges with buffer
-        if self.pos.x > WIDTH + buffer:
+        if self.pos.x > self.game.width + buffer:
             self.pos.x = -buffer
         elif self.pos.x < -buffer:
-            self.pos.x = WIDTH + buffer
+            self.pos.x = self.game.width + buffer
 
-        if self.pos.y > HEIGHT + buffer:
+        if self.pos.y > self.game.height + buffer:
             self.pos.y = -buffer
         elif self.pos.y < -buffer:
-            self.pos.y = HEIGHT + buffer
+            self.pos.y = self.game.height + buffer
 
         # Update rect position to match the new position
         self.rect.center = self.pos
 
         # Handle shooting based on powerups
-        now = pg.time.get_ticks()
-        if keys[self.player_controls["fire"]]:
+        now = self.game.ticks
+        if actions["fire"]:
             # Modified to allow multiple powerups to be active simultaneously
             if self.active_powerups["shotgun"] and self.active_powerups["laser_stream"]:
                 # If both powerups are active, fire both with a slight delay between them
@@ -216,129 +208,131 @@ class Player(pg.sprite.Sprite):
             else:
                 self.fire_normal_laser(now)
 
-        # Check for collisions with asteroids
-        asteroid_hits = pg.sprite.spritecollide(self, self.game.asteroids, False)
-        if asteroid_hits:
-            for asteroid in asteroid_hits:
-                self.take_damage(10)
-                # Bounce the asteroid away
-                bounce_dir = (self.pos - asteroid.pos).normalize() * -100
-                asteroid.vel = bounce_dir
-                print(f"Player {self.player_num} collided with asteroid")
-
-        # Check for powerup collisions
-        self.check_powerup_collisions()
-
-        # Debug info occasionally
-        if pg.time.get_ticks() % 1000 < 10:  # Print only occasionally
-            print(f"Player {self.player_num} at {self.pos}, vel: {self.vel}")
-
-    def draw(self, screen):
-        """Draw the player and ghost ship if active"""
+        # Rate limited, so this shows up about once a second
+        logger.debug(
+            "Player %d at %.0f, %.0f, vel: %.0f, %.0f",
+            self.player_num, self.pos.x, self.pos.y, self.vel.x, self.vel.y,
+        )
+
+    def update_ghost(self):
+        """Show a ghost ship on the far side while the ship is near a screen edge"""
+        transition_zone = self.size * 3  # Zone where ghost ship appears
+
+        # Reset ghost status
+        self.ghost_active = False
+
+        # Check if player is near a boundary and set up ghost ship
+        if self.pos.x > self.game.width - transition_zone:
+            # Near right edge, show ghost on left
+            self.ghost_active = True
+            self.ghost_pos = vec(self.pos.x - self.game.width, self.pos.y)
+        elif self.pos.x < transition_zone:
+            # Near left edge, show ghost on right
+            self.ghost_active = True
+            self.ghost_pos = vec(self.pos.x + self.game.width, self.pos.y)
+
+        if self.pos.y > self.game.height - transition_zone:
+            # Near bottom edge, show ghost on top
+            self.ghost_active = True
+            self.ghost_pos = vec(self.pos.x, self.pos.y - self.game.height)
+        elif self.pos.y < transition_zone:
+            # Near top edge, show ghost on bottom
+            self.ghost_active = True
+            self.ghost_pos = vec(self.pos.x, self.pos.y + self.game.height)
+
+    def blits(self, camera, offset=(0, 0)):
+        """Return (image, screen rect) pairs for the player, ghost ship and shield.
+
+        Everything is shifted by offset, used to draw between two sim steps.
+        """
+        rect = self.rect.move(offset)
         # Draw the main ship
-        screen.blit(self.image, self.rect)
+        blits = [(self.image, camera.apply_rect(rect))]
 
         # Draw ghost ship if active
         if self.ghost_active:
             ghost_rect = self.rect.copy()
             ghost_rect.center = self.ghost_pos
+            ghost_rect.move_ip(offset)
 
             # Draw with reduced alpha to indicate it's a ghost
-            ghost_img = self.image.copy()
-            ghost_img.set_alpha(150)  # Semi-transparent
-            screen.blit(ghost_img, ghost_rect)
+            ghost_img = rotation_cache.get_faded(self.original_image, self.rot, PLAYER_GHOST_ALPHA)
+            blits.append((ghost_img, camera.apply_rect(ghost_rect)))
 
         # Draw shield if active
         if self.active_powerups["shield"]:
-            shield_radius = self.size * 1.5
-            shield_surface = pg.Surface(
-                (shield_radius * 2, shield_radius * 2), pg.SRCALPHA
-            )
-
-            # Draw shield with transparency based on remaining health
-            alpha = min(150, int(150 * (self.shield_health / POWERUP_SHIELD_HEALTH)))
-            shield_color = (*POWERUP_COLORS["shield"][:3], alpha)
-
-            pg.draw.circle(
-                shield_surface,
-                shield_color,
-                (shield_radius, shield_radius),
-                shield_radius,
+            shield_surface = shield_image(
+                int(self.size * 1.5), self.shield_health / POWERUP_SHIELD_HEALTH
             )
-            shield_rect = shield_surface.get_rect(center=self.rect.center)
-            screen.blit(shield_surface, shield_rect)
+            shield_rect = shield_surface.get_rect(center=rect.center)
+            blits.append((shield_surface, camera.apply_rect(shield_rect)))
+        return blits
 
     def take_damage(self, amount):
         """Reduce player health and handle destruction if health <= 0"""
+        if self.invulnerable:
+            return
         # If shield is active, damage shield first
         if self.active_powerups["shield"] and self.shield_health > 0:
             self.shield_health -= amount
-            print(
-                f"Player {self.player_num} shield took damage. Shield health: {self.shield_health}"
+            logger.debug(
+                "Player %d shield took damage. Shield health: %d", self.player_num, self.shield_health
             )
 
             # If shield is depleted, remove it
             if self.shield_health <= 0:
                 self.active_powerups["shield"] = False
-                print(f"Player {self.player_num} shield depleted")
+                logger.debug("Player %d shield depleted", self.player_num)
         else:
             # No shield or shield depleted, damage player directly
             self.health -= amount
-            print(
-                f"Player {self.player_num} took {amount} damage, health: {self.health}"
-            )
+            logger.debug("Player %d took %d damage, health: %d", self.player_num, amount, self.health)
 
             # Check if player is destroyed
             if self.health <= 0:
                 self.kill()
-                print(f"Player {self.player_num} destroyed")
+                logger.info("Player %d destroyed", self.player_num)
                 # Create explosion effect
-                Explosion(self.game, self.pos, self.size * 2)
+                self.game.explosions.spawn(self.pos, self.size * 2)
 
     def fire_normal_laser(self, now):
         """Fire a single laser with normal cooldown"""
         if now - self.last_shot > PLAYER_SHOOT_DELAY:
             self.last_shot = now
-            Laser(self.game, self.pos, self.rot, self.color, self)
+            self.game.lasers.fire(self, self.rot)
 
     def fire_shotgun(self, now):
         """Fire three lasers in a spread pattern"""
         if now - self.last_shot > PLAYER_SHOOT_DELAY:
             self.last_shot = now
             # Center laser
-            Laser(self.game, self.pos, self.rot, self.color, self)
+            self.game.lasers.fire(self, self.rot)
             # Left laser
-            Laser(
-                self.game, self.pos, self.rot + POWERUP_SHOTGUN_SPREAD, self.color, self
-            )
+            self.game.lasers.fire(self, self.rot + POWERUP_SHOTGUN_SPREAD)
             # Right laser
-            Laser(
-                self.game, self.pos, self.rot - POWERUP_SHOTGUN_SPREAD, self.color, self
-            )
+            self.game.lasers.fire(self, self.rot - POWERUP_SHOTGUN_SPREAD)
 
     def fire_laser_stream(self, now):
         """Fire a continuous stream of lasers with reduced cooldown"""
         if now - self.last_stream_shot > POWERUP_LASER_STREAM_DELAY:
             self.last_stream_shot = now
-            Laser(self.game, self.pos, self.rot, self.color, self)
-
-    def check_powerup_collisions(self):
-        """Check if player has collected any powerups"""
-        hits = pg.sprite.spritecollide(self, self.game.powerups, True)
-        for powerup in hits:
-            # Apply to self
-            self.apply_powerup(powerup.type)
-            
-            # Share with other player
-            other_player = None
-            if self.player_num == 1 and self.game.player2.alive():
-                other_player = self.game.player2
-            elif self.player_num == 2 and self.game.player1.alive():
-                other_player = self.game.player1
-                
-            if other_player:
-                other_player.apply_powerup(powerup.type)
-                print(f"Powerup {powerup.type} shared with Player {other_player.player_num}")
+            self.game.lasers.fire(self, self.rot)
+
+    def collect_powerup(self, powerup_type):
+        """Apply a collected powerup and share it with the other player"""
+        # Apply to self
+        self.apply_powerup(powerup_type)
+
+        # Share with other player
+        other_player = None
+        if self.player_num == 1 and self.game.player2.alive():
+            other_player = self.game.player2
+        elif self.player_num == 2 and self.game.player1.alive():
+            other_player = self.game.player1
+
+        if other_player:
+            other_player.apply_powerup(powerup_type)
+            logger.debug("Powerup %s shared with Player %d", powerup_type, other_player.player_num)
 
     def apply_powerup(self, powerup_type):
         """Apply the effect of a collected powerup"""
@@ -346,26 +340,27 @@ class Player(pg.sprite.Sprite):
             # Restore health to full
             old_health = self.health
             self.health = 100
-            print(
-                f"Player {self.player_num} health restored from {old_health} to {self.health}"
+            logger.debug(
+                "Player %d health restored from %d to %d", self.player_num, old_health, self.health
             )
 
         elif powerup_type == "shotgun":
             # Enable shotgun mode - no longer disables other weapon powerups
             self.active_powerups["shotgun"] = True
-            print(f"Player {self.player_num} activated shotgun powerup")
+            logger.debug("Player %d activated shotgun powerup", self.player_num)
 
         elif powerup_type == "laser_stream":
             # Enable laser stream mode - no longer disables other weapon powerups
             self.active_powerups["laser_stream"] = True
-            print(f"Player {self.player_num} activated laser stream powerup")
+            logger.debug("Player %d activated laser stream powerup", self.player_num)
 
         elif powerup_type == "shield":
             # Add shield or restore shield health
             self.active_powerups["shield"] = True
             self.shield_health = POWERUP_SHIELD_HEALTH
-            print(
-                f"Player {self.player_num} activated shield powerup. Shield health: {self.shield_health}"
+            logger.debug(
+                "Player %d activated shield powerup. Shield health: %d",
+                self.player_num, self.shield_health,
             )
 
     def copy_powerups_from(self, other_player):
@@ -375,275 +370,16 @@ class Player(pg.sprite.Sprite):
             for powerup_type, active in other_player.active_powerups.items():
                 if active:
                     self.active_powerups[powerup_type] = True
-                    print(f"Player {self.player_num} received {powerup_type} "
-                          f"powerup from Player {other_player.player_num}")
+                    logger.debug(
+                        "Player %d received %s powerup from Player %d",
+                        self.player_num, powerup_type, other_player.player_num,
+                    )
             
             # Copy shield health if shield is active
             if other_player.active_powerups["shield"]:
                 self.shield_health = other_player.shield_health
 
 
-class Laser(pg.sprite.Sprite):
-    def __init__(self, game, pos, direction, color, player):
-        pg.sprite.Sprite.__init__(self)
-        self.game = game
-        self.player = player
-
-        # Add to sprite groups
-        game.all_sprites.add(self)
-        game.lasers.add(self)
-
-        # Add to the appropriate player's laser group
-        if player.player_num == 1:
-            self.game.lasers_p1.add(self)
-        else:
-            self.game.lasers_p2.add(self)
-
-        # Determine laser color based on player color
-        self.color = color
-
-        # Create a line for the laser
-        self.width, self.height = 10, 4  # Laser dimensions
-        self.original_image = pg.Surface((self.width, self.height), flags=SRCALPHA)
-        pg.draw.rect(self.original_image, self.color, (0, 0, self.width, self.height))
-
-        # Add a white outline to make the laser more visible
-        pg.draw.rect(self.original_image, WHITE, (0, 0, self.width, self.height), 1)
-
-        # Store the direction for movement calculations
-        self.direction = direction
-
-        # Rotate the laser to match the ship's direction
-        # Need to adjust by 90 degrees because our rectangle is horizontal by default
-        self.image = pg.transform.rotate(self.original_image, direction - 90)
-        self.rect = self.image.get_rect()
-
-        # Calculate the position at the front of the ship (top vertex of triangle)
-        # The ship is a triangle with the top point being the front
-        # We need to offset from the center based on rotation
-        offset = vec(0, -player.size / 2).rotate(
-            -direction
-        )  # Offset to the front of the ship
-        self.pos = vec(pos) + offset
-        self.rect.center = self.pos
-
-        # Set velocity in the same direction as the ship is pointing
-        self.vel = vec(0, -LASER_SPEED).rotate(-direction)
-        self.spawn_time = pg.time.get_ticks()
-
-        # Debug info
-        print(
-            f"Laser fired from player {player.player_num} at {self.pos} with direction {direction}"
-        )
-
-    def update(self, dt):
-        # Update position
-        self.pos += self.vel * dt
-        self.rect.center = self.pos
-
-        # Check if laser is off screen or has existed for too long
-        if (
-            self.pos.x < 0
-            or self.pos.x > WIDTH
-            or self.pos.y < 0
-            or self.pos.y > HEIGHT
-            or pg.time.get_ticks() - self.spawn_time > 2000
-        ):
-            self.kill()
-            return
-
-        # Check for collisions with asteroids
-        asteroid_hits = pg.sprite.spritecollide(self, self.game.asteroids, True)
-        if asteroid_hits:
-            self.kill()
-            for hit in asteroid_hits:
-                print(f"Laser hit asteroid at {hit.pos}")
-                # Spawn new asteroid to replace the destroyed one
-                hit.split()
-
-        # Check for collisions with players (only if not the player who fired)
-        # Players are now immune to each other's weapons
-        for player in self.game.players:
-            if player != self.player:  # Don't hit the player who fired
-                if self.rect.colliderect(player.rect):
-                    # No damage applied - players are immune to each other
-                    print(f"Laser from Player {self.player.player_num} passed through Player {player.player_num}")
-                    # Don't kill the laser or break - allow it to continue
-
-
-class Explosion(pg.sprite.Sprite):
-    def __init__(self, game, center, size=30):
-        pg.sprite.Sprite.__init__(self)
-        self.game = game
-        self.game.all_sprites.add(self)
-        self.pos = vec(center)  # Add position vector for camera tracking
-
-        # Create a circular explosion
-        self.image = pg.Surface(
-            (size, size), flags=SRCALPHA
-        )  # Using SRCALPHA for transparency
-        # Draw expanding circles
-        pg.draw.circle(self.image, RED, (size // 2, size // 2), size // 2)
-        pg.draw.circle(self.image, GREEN, (size // 2, size // 2), size // 3)
-
-        self.rect = self.image.get_rect()
-        self.rect.center = center
-        self.lifetime = 0
-        self.max_lifetime = EXPLOSION_DURATION  # Duration in milliseconds
-
-    def update(self, dt):
-        self.lifetime += dt * 1000  # Convert to milliseconds
-        if self.lifetime >= self.max_lifetime:
-            self.kill()
-        else:
-            # Fade out the explosion over time
-            alpha = 255 * (1 - self.lifetime / self.max_lifetime)
-            self.image.set_alpha(alpha)
-
-
-class Asteroid(pg.sprite.Sprite):
-    def __init__(self, game, pos=None, size=None):
-        pg.sprite.Sprite.__init__(self)
-        self.game = game
-
-        # Set size - either provided or random
-        if size is None:
-            self.size = random.randint(20, 50)
-        else:
-            self.size = size
-            
-        # Determine if this is a powerup asteroid (30% chance for new asteroids)
-        self.has_powerup = False
-        self.powerup_type = None
-        if pos is None:  # Only for newly spawned asteroids, not splits
-            self.has_powerup = random.random() < 0.3  # 30% chance
-            if self.has_powerup:
-                self.powerup_type = random.choice(POWERUP_TYPES)
-
-        # Create a circular asteroid
-        self.original_image = pg.Surface((self.size, self.size), flags=SRCALPHA)
-        pg.draw.circle(
-            self.original_image,
-            (150, 150, 150),
-            (self.size // 2, self.size // 2),
-            self.size // 2,
-        )
-
-        # Add some details to make it look more like an asteroid
-        # Only add details if the asteroid is large enough
-        if self.size >= 15:
-            detail_count = min(4, max(1, self.size // 10))  # Scale details with size
-            for _ in range(detail_count):
-                # Ensure we don't get a division by zero or empty range
-                max_offset = max(3, self.size // 4)
-                offset = random.randint(2, max_offset)
-                angle = random.randint(0, 360)
-                x = self.size // 2 + offset * math.cos(math.radians(angle))
-                y = self.size // 2 + offset * math.sin(math.radians(angle))
-                radius = max(1, random.randint(1, self.size // 5))
-                pg.draw.circle(
-                    self.original_image, (100, 100, 100), (int(x), int(y)), radius
-                )
-                
-        # If it's a powerup asteroid, add a pink center
-        if self.has_powerup:
-            # Draw a pink center to indicate it contains a powerup
-            pg.draw.circle(
-                self.original_image,
-                (255, 105, 180),  # Hot pink
-                (self.size // 2, self.size // 2),
-                self.size // 4,  # Center is 1/4 the size of the asteroid
-            )
-
-        # Add a white outline to make the asteroid more visible
-        pg.draw.circle(
-            self.original_image,
-            WHITE,
-            (self.size // 2, self.size // 2),
-            self.size // 2,
-            1,
-        )
-
-        self.image = self.original_image
-        self.rect = self.image.get_rect()
-
-        # Set position and velocity
-        if pos:
-            self.pos = vec(pos)
-        else:
-            # Spawn within the visible area instead of the whole world
-            self.pos = vec(
-                random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 50)
-            )
-
-        self.rect.center = self.pos
-
-        # Set random velocity
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(30, 100)
-        self.vel = vec(speed * math.cos(angle), speed * math.sin(angle))
-
-        # Add to sprite groups
-        self.game.all_sprites.add(self)
-        self.game.asteroids.add(self)
-
-        # Debug info
-        if not pos:  # Only print for newly spawned asteroids, not splits
-            print(
-                f"Asteroid created at position {[int(self.pos.x), int(self.pos.y)]} with velocity {[round(self.vel.x, 4), round(self.vel.y, 4)]}"
-            )
-
-    def update(self, dt):
-        # Update position
-        self.pos += self.vel * dt
-        self.rect.center = self.pos
-
-        # Wrap around screen edges
-        if self.pos.x < -self.size:
-            self.pos.x = WIDTH + self.size
-        elif self.pos.x > WIDTH + self.size:
-            self.pos.x = -self.size
-        if self.pos.y < -self.size:
-            self.pos.y = HEIGHT + self.size
-        elif self.pos.y > HEIGHT + self.size:
-            self.pos.y = -self.size
-
-    def split(self):
-        """Split the asteroid into two smaller ones if it's large enough"""
-        # If this asteroid has a powerup, spawn it instead of splitting
-        if self.has_powerup:
-            # Create a powerup at the asteroid's position
-            PowerUp(self.game, self.pos, self.powerup_type)
-            print(f"PowerUp {self.powerup_type} released from asteroid at {self.pos}")
-            
-            # Create a small explosion
-            Explosion(self.game, self.pos, self.size // 2)
-            
-            # Remove this asteroid
-            self.kill()
-            return
-            
-        # Normal asteroid splitting behavior
-        if self.size > 15:  # Only split if the asteroid is big enough
-            # Create two smaller asteroids
-            for _ in range(2):
-                # Create a new asteroid at the same position but with a smaller size
-                offset = vec(random.randint(-10, 10), random.randint(-10, 10))
-                new_pos = self.pos + offset
-                new_size = max(10, self.size // 2)  # Ensure minimum size
-                Asteroid(self.game, new_pos, new_size)
-
-            # Create a small explosion
-            Explosion(self.game, self.pos, self.size // 2)
-
-            # Remove this asteroid
-            self.kill()
-        else:
-            # Too small to split, just remove it
-            Explosion(self.game, self.pos, self.size // 2)
-            self.kill()
-
-
 class MotherShip(pg.sprite.Sprite):
     """Large enemy ship that spawns smaller enemy ships"""
 
@@ -652,6 +388,7 @@ class MotherShip(pg.sprite.Sprite):
         pg.sprite.Sprite.__init__(self)
         self.game = game
         self.size = MOTHERSHIP_SIZE
+        self.id = game.new_entity_id()
 
         # Add to sprite groups
         game.all_sprites.add(self)
@@ -693,57 +430,57 @@ class MotherShip(pg.sprite.Sprite):
                 midpoint_y = game.player2.pos.y
             else:
                 # Default to center of the world if no players alive
-                midpoint_x = WORLD_WIDTH / 2
-                midpoint_y = WORLD_HEIGHT / 2
+                midpoint_x = self.game.world_width / 2
+                midpoint_y = self.game.world_height / 2
             
             # Calculate the current viewable area boundaries
-            view_left = max(0, midpoint_x - WIDTH / 2)
-            view_right = min(WORLD_WIDTH, midpoint_x + WIDTH / 2)
-            view_top = max(0, midpoint_y - HEIGHT / 2)
-            view_bottom = min(WORLD_HEIGHT, midpoint_y + HEIGHT / 2)
+            view_left = max(0, midpoint_x - self.game.width / 2)
+            view_right = min(self.game.world_width, midpoint_x + self.game.width / 2)
+            view_top = max(0, midpoint_y - self.game.height / 2)
+            view_bottom = min(self.game.world_height, midpoint_y + self.game.height / 2)
             
             # Use the entire viewable area width/height as the minimum spawn distance
             # This ensures motherships spawn at least a full screen away from players
-            buffer_x = WIDTH  # Full screen width as buffer
-            buffer_y = HEIGHT  # Full screen height as buffer
+            buffer_x = self.game.width  # Full screen width as buffer
+            buffer_y = self.game.height  # Full screen height as buffer
             
             # Choose a spawn position outside the viewable area but within the world
-            side = random.randint(0, 3)
+            side = self.game.rng.randint(0, 3)
             
             if side == 0:  # Top
                 self.pos = vec(
-                    random.randint(int(view_left), int(view_right)),
+                    self.game.rng.randint(int(view_left), int(view_right)),
                     max(0, view_top - buffer_y)
                 )
                 # If too close to top of world, spawn at bottom instead
                 if self.pos.y < 0:
-                    self.pos.y = min(WORLD_HEIGHT, view_bottom + buffer_y)
+                    self.pos.y = min(self.game.world_height, view_bottom + buffer_y)
             elif side == 1:  # Right
                 self.pos = vec(
-                    min(WORLD_WIDTH, view_right + buffer_x),
-                    random.randint(int(view_top), int(view_bottom))
+                    min(self.game.world_width, view_right + buffer_x),
+                    self.game.rng.randint(int(view_top), int(view_bottom))
                 )
                 # If too close to right edge of world, spawn at left instead
-                if self.pos.x > WORLD_WIDTH:
+                if self.pos.x > self.game.world_width:
                     self.pos.x = max(0, view_left - buffer_x)
             elif side == 2:  # Bottom
                 self.pos = vec(
-                    random.randint(int(view_left), int(view_right)),
-                    min(WORLD_HEIGHT, view_bottom + buffer_y)
+                    self.game.rng.randint(int(view_left), int(view_right)),
+                    min(self.game.world_height, view_bottom + buffer_y)
                 )
                 # If too close to bottom of world, spawn at top instead
-                if self.pos.y > WORLD_HEIGHT:
+                if self.pos.y > self.game.world_height:
                     self.pos.y = max(0, view_top - buffer_y)
             else:  # Left
                 self.pos = vec(
                     max(0, view_left - buffer_x),
-                    random.randint(int(view_top), int(view_bottom))
+                    self.game.rng.randint(int(view_top), int(view_bottom))
                 )
                 # If too close to left edge of world, spawn at right instead
                 if self.pos.x < 0:
-                    self.pos.x = min(WORLD_WIDTH, view_right + buffer_x)
+                    self.pos.x = min(self.game.world_width, view_right + buffer_x)
             
-            print(f"Mothership spawned at [{int(self.pos.x)}, {int(self.pos.y)}]")
+            logger.debug("Mothership placed at [%d, %d]", self.pos.x, self.pos.y)
             
         self.vel = vec(0, 0)
         self.acc = vec(0, 0)
@@ -753,10 +490,10 @@ class MotherShip(pg.sprite.Sprite):
         self.health = MOTHERSHIP_HEALTH
 
         # Enemy ship spawn timer
-        self.last_spawn = pg.time.get_ticks()
+        self.last_spawn = game.ticks
         self.spawn_delay = 5000  # 5 seconds between enemy ship spawns
 
-        print(f"Mothership spawned at {self.pos}")
+        logger.info("Mothership spawned at %.0f, %.0f", self.pos.x, self.pos.y)
 
     def update(self, dt):
         # Find the closest player
@@ -780,10 +517,12 @@ class MotherShip(pg.sprite.Sprite):
             self.acc = direction * MOTHERSHIP_ACC
 
             # Apply some small randomness to movement
-            self.acc += vec(random.uniform(-0.2, 0.2), random.uniform(-0.2, 0.2))
+            rng = self.game.rng
+            self.acc += vec(rng.uniform(-0.2, 0.2), rng.uniform(-0.2, 0.2))
         else:
             # Random movement if no target in range
-            self.acc = vec(random.uniform(-1, 1), random.uniform(-1, 1))
+            rng = self.game.rng
+            self.acc = vec(rng.uniform(-1, 1), rng.uniform(-1, 1))
             if self.acc.length() > 0:
                 self.acc = self.acc.normalize() * MOTHERSHIP_ACC
 
@@ -795,38 +534,38 @@ class MotherShip(pg.sprite.Sprite):
         self.pos += self.vel * dt
 
         # Wrap around screen edges
-        if self.pos.x > WIDTH + self.size:
+        if self.pos.x > self.game.width + self.size:
             self.pos.x = -self.size
         if self.pos.x < -self.size:
-            self.pos.x = WIDTH + self.size
-        if self.pos.y > HEIGHT + self.size:
+            self.pos.x = self.game.width + self.size
+        if self.pos.y > self.game.height + self.size:
             self.pos.y = -self.size
         if self.pos.y < -self.size:
-            self.pos.y = HEIGHT + self.size
+            self.pos.y = self.game.height + self.size
 
         self.rect.center = self.pos
 
         # Spawn enemy ships
-        now = pg.time.get_ticks()
+        now = self.game.ticks
         if now - self.last_spawn > self.spawn_delay:
             self.last_spawn = now
             EnemyShip(self.game, self.pos)
-            print(f"Enemy ship spawned from mothership at {self.pos}")
+            logger.debug("Enemy ship spawned from mothership at %.0f, %.0f", self.pos.x, self.pos.y)
 
     def take_damage(self, amount):
         """Reduce mothership health and handle destruction if health <= 0"""
         self.health -= amount
-        print(f"Mothership took {amount} damage, health: {self.health}")
+        logger.debug("Mothership took %d damage, health: %d", amount, self.health)
 
         if self.health <= 0:
             # Store position before destroying for powerup spawning
             self.game.last_mothership_pos = vec(self.pos)
 
             self.kill()
-            print("Mothership destroyed!")
+            logger.info("Mothership destroyed!")
 
             # Create a large explosion
-            Explosion(self.game, self.pos, self.size * 2)
+            self.game.explosions.spawn(self.pos, self.size * 2)
 
             # Notify game that mothership was destroyed
             self.game.mothership_destroyed()
@@ -838,12 +577,12 @@ class MotherShip(pg.sprite.Sprite):
             ):  # Including this one that's about to be removed
                 # Spawn in different positions
                 pos1 = vec(
-                    self.pos.x + random.randint(-200, 200),
-                    self.pos.y + random.randint(-200, 200),
+                    self.pos.x + self.game.rng.randint(-200, 200),
+                    self.pos.y + self.game.rng.randint(-200, 200),
                 )
                 pos2 = vec(
-                    self.pos.x + random.randint(-200, 200),
-                    self.pos.y + random.randint(-200, 200),
+                    self.pos.x + self.game.rng.randint(-200, 200),
+                    self.pos.y + self.game.rng.randint(-200, 200),
                 )
 
                 # Remove this mothership before spawning new ones
@@ -862,24 +601,17 @@ class EnemyShip(pg.sprite.Sprite):
         pg.sprite.Sprite.__init__(self)
         self.game = game
         self.size = ENEMY_SHIP_SIZE
+        self.id = game.new_entity_id()
         self.health = ENEMY_SHIP_HEALTH
 
         # Create a triangular enemy ship
-        self.original_image = pg.Surface((self.size, self.size), flags=SRCALPHA)
-        # Draw a triangle pointing upward
-        points = [
-            (self.size // 2, 0),  # Top vertex
-            (0, self.size),  # Bottom left
-            (self.size, self.size),  # Bottom right
-        ]
-        pg.draw.polygon(self.original_image, ENEMY_COLOR, points)
-
-        self.image = self.original_image.copy()
+        self.original_image = ship_image(ENEMY_COLOR, self.size)
+        self.image = rotation_cache.get(self.original_image, 0)
         self.rect = self.image.get_rect()
         self.pos = vec(pos)
         self.rect.center = self.pos
-        self.vel = vec(random.uniform(-1, 1), random.uniform(-1, 1))
-        self.vel = self.vel.normalize() * random.randint(50, 100)
+        self.vel = vec(self.game.rng.uniform(-1, 1), self.game.rng.uniform(-1, 1))
+        self.vel = self.vel.normalize() * self.game.rng.randint(50, 100)
         self.acc = vec(0, 0)
         self.rot = 0
 
@@ -888,67 +620,198 @@ class EnemyShip(pg.sprite.Sprite):
         self.game.enemies.add(self)
 
     def update(self, dt):
+        # Every enemy runs this each step, so attributes are looked up once
+        game = self.game
+        pos = self.pos
+
         # Find the closest player
         target = None
         closest_dist = float("inf")
 
-        for player in self.game.players:
-            if player.alive():
-                dist = self.pos.distance_to(player.pos)
-                if dist < closest_dist:
-                    closest_dist = dist
-                    target = player
+        for player in game.players.sprites():
+            dist = pos.distance_to(player.pos)
+            if dist < closest_dist:
+                closest_dist = dist
+                target = player
 
         # If a player is within swarm distance, move towards them
         if target and closest_dist < ENEMY_SWARM_DISTANCE:
             # Calculate direction to target
-            direction = (target.pos - self.pos).normalize()
-            self.acc = direction * ENEMY_SHIP_ACC
+            direction = (target.pos - pos).normalize()
+            acc = direction * ENEMY_SHIP_ACC
 
             # Update rotation to face the target
             self.rot = math.degrees(math.atan2(-direction.y, direction.x)) - 90
-            self.image = pg.transform.rotate(self.original_image, self.rot)
+            self.image = rotation_cache.get(self.original_image, self.rot)
             self.rect = self.image.get_rect()
         else:
             # Random movement if no target in range
-            self.acc = vec(random.uniform(-0.5, 0.5), random.uniform(-0.5, 0.5))
-            self.acc = self.acc.normalize() * (ENEMY_SHIP_ACC / 2)
+            rng = game.rng
+            acc = vec(rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5))
+            acc = acc.normalize() * (ENEMY_SHIP_ACC / 2)
 
         # Apply friction
-        self.acc += self.vel * ENEMY_SHIP_FRICTION
+        vel = self.vel
+        acc += vel * ENEMY_SHIP_FRICTION
+        self.acc = acc
 
         # Update velocity and position
-        self.vel += self.acc * dt
+        vel += acc * dt
 
         # Limit maximum velocity
-        if self.vel.length() > ENEMY_MAX_SPEED:
-            self.vel.scale_to_length(ENEMY_MAX_SPEED)
+        if vel.length() > ENEMY_MAX_SPEED:
+            vel.scale_to_length(ENEMY_MAX_SPEED)
 
-        self.pos += self.vel * dt
+        pos += vel * dt
 
         # Wrap around screen edges
-        if self.pos.x > WIDTH:
-            self.pos.x = 0
-        if self.pos.x < 0:
-            self.pos.x = WIDTH
-        if self.pos.y > HEIGHT:
-            self.pos.y = 0
-        if self.pos.y < 0:
-            self.pos.y = HEIGHT
-
-        self.rect.center = self.pos
+        x, y = pos
+        if x > game.width:
+            pos.x = x = 0
+        if x < 0:
+            pos.x = game.width
+        if y > game.height:
+            pos.y = y = 0
+        if y < 0:
+            pos.y = game.height
+
+        self.rect.center = pos
 
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
             # Create an explosion
-            Explosion(self.game, self.pos, self.size)
+            self.game.explosions.spawn(self.pos, self.size)
             self.kill()
 
             # Add score
             self.game.score += 10
 
 
+def make_powerup_image(powerup_type, size):
+    """Draw a circular powerup with an icon for its type"""
+    color = POWERUP_COLORS[powerup_type]
+    image = pg.Surface((size * 2, size * 2), flags=SRCALPHA)
+    pg.draw.circle(image, color, (size, size), size)
+
+    # Add a white outline
+    pg.draw.circle(image, WHITE, (size, size), size, 3)  # Thicker outline
+
+    # Add an icon based on powerup type
+    if powerup_type == "health":
+        # Draw a plus sign
+        pg.draw.line(
+            image,
+            WHITE,
+            (size, size - size // 2),
+            (size, size + size // 2),
+            4,
+        )  # Thicker lines
+        pg.draw.line(
+            image,
+            WHITE,
+            (size - size // 2, size),
+            (size + size // 2, size),
+            4,
+        )  # Thicker lines
+    elif powerup_type == "shotgun":
+        # Draw three lines representing spread shots
+        pg.draw.line(
+            image,
+            WHITE,
+            (size - size // 2, size),
+            (size + size // 2, size),
+            3,
+        )  # Thicker lines
+        pg.draw.line(
+            image,
+            WHITE,
+            (size - size // 2, size + size // 3),
+            (size + size // 2, size - size // 3),
+            3,
+        )  # Thicker lines
+        pg.draw.line(
+            image,
+            WHITE,
+            (size - size // 2, size - size // 3),
+            (size + size // 2, size + size // 3),
+            3,
+        )  # Thicker lines
+    elif powerup_type == "laser_stream":
+        # Draw multiple short lines representing stream
+        for i in range(-size // 2, size // 2, 4):
+            pg.draw.line(
+                image,
+                WHITE,
+                (size - size // 2, size + i),
+                (size + size // 2, size + i),
+                3,
+            )  # Thicker lines
+    elif powerup_type == "shield":
+        # Draw a circle representing shield
+        pg.draw.circle(image, WHITE, (size, size), size // 2, 3)  # Thicker lines
+    return image
+
+
+# Shield bubbles at each of PLAYER_SHIELD_LEVELS strengths, keyed by (radius, level)
+SHIELD_IMAGES = {}
+
+
+def shield_image(radius, strength):
+    """Return the shared shield bubble for a shield at strength (0 to 1)"""
+    # Round up so a nearly depleted shield is still faintly visible
+    level = min(PLAYER_SHIELD_LEVELS, max(1, math.ceil(strength * PLAYER_SHIELD_LEVELS)))
+    key = (radius, level)
+    image = SHIELD_IMAGES.get(key)
+    if image is None:
+        image = pg.Surface((radius * 2, radius * 2), pg.SRCALPHA)
+
+        # Draw shield with transparency based on remaining health
+        alpha = int(150 * level / PLAYER_SHIELD_LEVELS)
+        shield_color = (*POWERUP_COLORS["shield"][:3], alpha)
+        pg.draw.circle(image, shield_color, (radius, radius), radius)
+        image = SHIELD_IMAGES[key] = to_display_format(image)
+    return image
+
+
+# Drawn radius of a powerup, increased from POWERUP_SIZE for better visibility
+POWERUP_RADIUS = int(POWERUP_SIZE * 1.5)
+
+# Animation strips per powerup type, indexed [rotation frame * pulse frames + pulse frame]
+POWERUP_FRAMES = {}
+
+
+def render_powerup_frames(powerup_type, size):
+    """Draw the rotate/pulse animation strip for a powerup type"""
+    base = make_powerup_image(powerup_type, size)
+    frames = []
+    for r in range(POWERUP_ROTATION_FRAMES):
+        angle = r * 360 / POWERUP_ROTATION_FRAMES
+        for p in range(POWERUP_PULSE_FRAMES):
+            # Same pulse curve as before: scale swings between 0.7 and 1.3
+            phase = p / POWERUP_PULSE_FRAMES
+            scale = 0.3 * math.sin(2 * math.pi * phase) + 1.0
+            frames.append(pg.transform.rotozoom(base, angle, scale))
+    return frames
+
+
+def powerup_frames(powerup_type, size=POWERUP_RADIUS, assets=None):
+    """Return the shared animation strip for a powerup type, rendering it on first use"""
+    key = (powerup_type, size)
+    if key not in POWERUP_FRAMES:
+        if assets is not None:
+            POWERUP_FRAMES[key] = assets.sprite_set(
+                f"powerup_{powerup_type}_{size}",
+                lambda: render_powerup_frames(powerup_type, size),
+            )
+        else:
+            POWERUP_FRAMES[key] = [
+                to_display_format(frame)
+                for frame in render_powerup_frames(powerup_type, size)
+            ]
+    return POWERUP_FRAMES[key]
+
+
 class PowerUp(pg.sprite.Sprite):
     """PowerUp class for various player enhancements"""
 
@@ -956,92 +819,29 @@ class PowerUp(pg.sprite.Sprite):
         self._layer = 3  # Increased layer to appear above most objects
         pg.sprite.Sprite.__init__(self)
         self.game = game
-        self.type = powerup_type or random.choice(POWERUP_TYPES)
+        self.id = game.new_entity_id()
+        self.type = powerup_type or self.game.rng.choice(POWERUP_TYPES)
         self.pos = vec(pos)
         self.vel = vec(
-            random.uniform(-20, 20), random.uniform(-20, 20)
+            self.game.rng.uniform(-20, 20), self.game.rng.uniform(-20, 20)
         )  # Small random movement
-        self.size = int(
-            POWERUP_SIZE * 1.5
-        )  # Increased size for better visibility, convert to int
+        self.size = POWERUP_RADIUS
         self.color = POWERUP_COLORS[self.type]
 
         # Create sprite groups
         game.all_sprites.add(self)
         game.powerups.add(self)
 
-        # Create a circular powerup with an icon
-        self.image = pg.Surface((self.size * 2, self.size * 2), flags=SRCALPHA)
-        pg.draw.circle(self.image, self.color, (self.size, self.size), self.size)
-
-        # Add a white outline
-        pg.draw.circle(
-            self.image, WHITE, (self.size, self.size), self.size, 3
-        )  # Thicker outline
-
-        # Add an icon based on powerup type
-        if self.type == "health":
-            # Draw a plus sign
-            pg.draw.line(
-                self.image,
-                WHITE,
-                (self.size, self.size - self.size // 2),
-                (self.size, self.size + self.size // 2),
-                4,
-            )  # Thicker lines
-            pg.draw.line(
-                self.image,
-                WHITE,
-                (self.size - self.size // 2, self.size),
-                (self.size + self.size // 2, self.size),
-                4,
-            )  # Thicker lines
-        elif self.type == "shotgun":
-            # Draw three lines representing spread shots
-            pg.draw.line(
-                self.image,
-                WHITE,
-                (self.size - self.size // 2, self.size),
-                (self.size + self.size // 2, self.size),
-                3,
-            )  # Thicker lines
-            pg.draw.line(
-                self.image,
-                WHITE,
-                (self.size - self.size // 2, self.size + self.size // 3),
-                (self.size + self.size // 2, self.size - self.size // 3),
-                3,
-            )  # Thicker lines
-            pg.draw.line(
-                self.image,
-                WHITE,
-                (self.size - self.size // 2, self.size - self.size // 3),
-                (self.size + self.size // 2, self.size + self.size // 3),
-                3,
-            )  # Thicker lines
-        elif self.type == "laser_stream":
-            # Draw multiple short lines representing stream
-            for i in range(-self.size // 2, self.size // 2, 4):
-                pg.draw.line(
-                    self.image,
-                    WHITE,
-                    (self.size - self.size // 2, self.size + i),
-                    (self.size + self.size // 2, self.size + i),
-                    3,
-                )  # Thicker lines
-        elif self.type == "shield":
-            # Draw a circle representing shield
-            pg.draw.circle(
-                self.image, WHITE, (self.size, self.size), self.size // 2, 3
-            )  # Thicker lines
-
+        # Animation frames are shared by every powerup of this type
+        self.frames = powerup_frames(self.type, self.size)
+        self.image = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.center = self.pos
 
         # Set spawn time for animation effects
-        self.spawn_time = pg.time.get_ticks()
+        self.spawn_time = game.ticks
 
-        print(f"PowerUp {self.type} created at {self.pos}")
+        logger.debug("PowerUp %s created at %.0f, %.0f", self.type, self.pos.x, self.pos.y)
 
     def update(self, dt):
         # Move with slight drift
@@ -1051,22 +851,23 @@ class PowerUp(pg.sprite.Sprite):
         self.vel *= 0.98
 
         # Wrap around screen edges
-        if self.pos.x > WORLD_WIDTH:
+        if self.pos.x > self.game.world_width:
             self.pos.x = 0
         if self.pos.x < 0:
-            self.pos.x = WORLD_WIDTH
-        if self.pos.y > WORLD_HEIGHT:
+            self.pos.x = self.game.world_width
+        if self.pos.y > self.game.world_height:
             self.pos.y = 0
         if self.pos.y < 0:
-            self.pos.y = WORLD_HEIGHT
+            self.pos.y = self.game.world_height
 
-        # Update rect position
-        self.rect.center = self.pos
+        self.animate()
 
-        # Make the powerup pulse/rotate for visibility
-        # More pronounced pulsing effect
-        scale = 0.3 * math.sin(pg.time.get_ticks() * 0.01) + 1.0
-        center = self.rect.center
-        self.image = pg.transform.rotozoom(self.image, 2, scale)  # Faster rotation
+    def animate(self):
+        """Make the powerup pulse/rotate for visibility by picking a precomputed frame"""
+        age = self.game.ticks - self.spawn_time
+        rotation = int(age * POWERUP_ROTATION_SPEED / 1000 * POWERUP_ROTATION_FRAMES / 360)
+        pulse = int(age % POWERUP_PULSE_PERIOD * POWERUP_PULSE_FRAMES / POWERUP_PULSE_PERIOD)
+        index = (rotation % POWERUP_ROTATION_FRAMES) * POWERUP_PULSE_FRAMES + pulse
+        self.image = self.frames[index]
         self.rect = self.image.get_rect()
-        self.rect.center = center
+        self.rect.center = self.pos
@@ -0,0 +1,35 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+from assets import to_display_format
+from settings import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Fonts by size and rendered text surfaces with least-recently-used eviction"""
+
+    def __init__(self, font_name, capacity=TEXT_CACHE_SIZE):
+        self.font_name = font_name
+        self.capacity = capacity
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pg.font.Font(self.font_name, size)
+        return font
+
+    def render(self, text, size, color):
+        """Return the rendered surface for text, rendering it only on a miss"""
+        key = (text, size, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = to_display_format(self.font(size).render(text, True, color))
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface